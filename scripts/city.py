@@ -0,0 +1,39 @@
+import time
+
+from compas.geometry import Box
+from compas.geometry import Frame
+from compas_viewer import Viewer
+
+viewer = Viewer()
+
+N = 60
+
+for i in range(N):
+    for j in range(N):
+        viewer.scene.add(Box(0.6, 0.6, 1 + (i * j) % 5, frame=Frame([i, j, 0])), name=f"Building_{i}_{j}")
+
+# Look at a corner of the city, so that only a small part of it is in view
+viewer.renderer.camera.target = [5, 5, 0]
+viewer.renderer.camera.position = [5, -3, 8]
+
+last = time.perf_counter()
+
+
+@viewer.on(interval=1)
+def orbit(frame):
+    global last
+    viewer.renderer.camera.rotation.z += 0.002
+
+    # Toggle the frustum culling every 200 frames, and compare the frame times
+    if frame % 200 == 0:
+        now = time.perf_counter()
+        if frame:
+            state = "on" if viewer.config.renderer.frustumculling else "off"
+            visible = viewer.renderer.buffer_manager.visible
+            drawn = int(visible.sum()) if visible is not None else N * N
+            print(f"culling {state}: {(now - last) / 200 * 1000:.1f} ms per frame, {drawn} of {N * N} objects drawn")
+            viewer.config.renderer.frustumculling = not viewer.config.renderer.frustumculling
+        last = now
+
+
+viewer.show()
@@ -0,0 +1,29 @@
+import time
+
+import numpy as np
+
+from compas.geometry import Point
+from compas_viewer.scene.arrays import as_point_array
+
+N = 1_000_000
+REPEAT = 3
+
+points = [Point(*xyz) for xyz in np.random.rand(N, 3).tolist()]
+
+
+def best(convert):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        array = convert(points)
+        times.append(time.perf_counter() - start)
+    return min(times), array
+
+
+# The conversion that numpy does by itself, reading each point as a sequence, and the one of the scene objects
+old, expected = best(lambda points: np.asarray(points, dtype=np.float32))
+new, array = best(as_point_array)
+assert np.array_equal(array, expected)
+
+print(f"np.asarray:     {old:.3f} s for {N} points")
+print(f"as_point_array: {new:.3f} s for {N} points, {old / new:.1f} times faster")
@@ -5,10 +5,7 @@ from typing import Callable
 from typing import Literal
 from typing import Optional
 
-from numpy import all
-from numpy import any
 from numpy import array
-from numpy import unique
 from numpy.linalg import norm
 from PySide6.QtCore import QEvent
 from PySide6.QtCore import Qt
@@ -256,6 +253,7 @@ select_all_cmd = Command(title="Select All", callback=select_all)
 def deselect_all(viewer: "Viewer"):
     for obj in viewer.scene.objects:
         obj.is_selected = False
+        obj.selected_subobjects = []
 
     viewer.ui.sidebar.update()
     viewer.renderer.update()
@@ -269,19 +267,37 @@ deselect_all_cmd = Command(title="DeSelect All", callback=deselect_all)
 # -----------------------------------------------------------------------------
 
 
+def select_subobjects(viewer: "Viewer", selection: dict, add: bool = True):
+    """Add or remove the picked vertices, edges or faces to or from the selected ones of their objects."""
+    for obj, keys in selection.items():
+        if add:
+            obj.selected_subobjects = list(dict.fromkeys(obj.selected_subobjects + keys))
+        else:
+            removed = set(keys)
+            obj.selected_subobjects = [key for key in obj.selected_subobjects if key not in removed]
+
+
 def select_object(viewer: "Viewer", event: QMouseEvent):
     etype = event.type()
+    mode = viewer.config.renderer.pickmode
 
-    if etype == QEvent.Type.MouseButtonPress:
-        for _, obj in viewer.scene.instance_colors.items():
-            obj.is_selected = False
+    if etype == QEvent.Type.MouseButtonPress and mode != "object":
+        for obj in viewer.scene.instances:
+            obj.selected_subobjects = []
 
         x = viewer.mouse.last_pos.x()
         y = viewer.mouse.last_pos.y()
-        instance_color = viewer.renderer.read_instance_color((x, y, x, y))
-        unique_color = unique(instance_color, axis=0, return_counts=False)
+        obj, key = viewer.renderer.pick_subobject(x, y, mode)
+        if obj:
+            select_subobjects(viewer, {obj: [key]})
+
+    elif etype == QEvent.Type.MouseButtonPress:
+        for obj in viewer.scene.instances:
+            obj.is_selected = False
 
-        selected_obj = viewer.scene.instance_colors.get(tuple(unique_color[0]))  # type: ignore
+        x = viewer.mouse.last_pos.x()
+        y = viewer.mouse.last_pos.y()
+        selected_obj = viewer.renderer.pick(x, y)
         if selected_obj:
             selected_obj.is_selected = True
 
@@ -295,14 +311,19 @@ select_object_cmd = Command(title="Select Object", callback=select_object, mouse
 
 def select_multiple(viewer: "Viewer", event: QMouseEvent):
     etype = event.type()
+    mode = viewer.config.renderer.pickmode
 
-    if etype == QEvent.Type.MouseButtonPress:
+    if etype == QEvent.Type.MouseButtonPress and mode != "object":
         x = viewer.mouse.last_pos.x()
         y = viewer.mouse.last_pos.y()
-        instance_color = viewer.renderer.read_instance_color((x, y, x, y))
-        unique_color = unique(instance_color, axis=0, return_counts=False)
+        obj, key = viewer.renderer.pick_subobject(x, y, mode)
+        if obj:
+            select_subobjects(viewer, {obj: [key]})
 
-        selected_obj = viewer.scene.instance_colors.get(tuple(unique_color[0]))  # type: ignore
+    elif etype == QEvent.Type.MouseButtonPress:
+        x = viewer.mouse.last_pos.x()
+        y = viewer.mouse.last_pos.y()
+        selected_obj = viewer.renderer.pick(x, y)
         if selected_obj:
             selected_obj.is_selected = True
             viewer.ui.sidebar.update()
@@ -335,25 +356,32 @@ def select_window(viewer: "Viewer", event: QMouseEvent):
         if abs(start.x() - end.x()) * abs(start.y() - end.y()) <= 4:
             return
 
-        # Deselect all objects first
-        for _, obj in viewer.scene.instance_colors.items():
-            obj.is_selected = False
+        mode = viewer.config.renderer.pickmode
+        if mode != "object":
+            for obj in viewer.scene.instances:
+                obj.selected_subobjects = []
+            select_subobjects(viewer, viewer.renderer.read_subobjects((start.x(), start.y(), end.x(), end.y()), mode))
+            viewer.renderer.update()
+            return
 
-        # Identify unique instance colors
-        instance_color = viewer.renderer.read_instance_color((start.x(), start.y(), end.x(), end.y()))
-        unique_colors_set = set(map(tuple, instance_color))
-        unique_colors = array(list(unique_colors_set))
+        # Identify the objects in the box, once their IDs have been read back from the GPU
+        def apply_selection(ids):
+            # Deselect all objects first
+            for obj in viewer.scene.instances:
+                obj.is_selected = False
 
-        if len(unique_colors) == 0:
-            return
+            selected_objs = viewer.scene.instances.lookup(ids)
+
+            if len(selected_objs) == 0:
+                return
 
-        # Select based on instance colors
-        for color, obj in viewer.scene.instance_colors.items():
-            if any(all(color == unique_colors, axis=1)):
+            for obj in selected_objs:
                 obj.is_selected = True
-                continue
 
-        viewer.ui.sidebar.update()
+            viewer.ui.sidebar.update()
+            viewer.renderer.update()
+
+        viewer.renderer.request_instance_ids((start.x(), start.y(), end.x(), end.y()), apply_selection)
 
     viewer.renderer.update()
 
@@ -363,14 +391,19 @@ select_window_cmd = Command(title="Select Box", callback=select_window, mousebin
 
 def deselect_object(viewer: "Viewer", event: QMouseEvent):
     etype = event.type()
+    mode = viewer.config.renderer.pickmode
 
-    if etype == QEvent.Type.MouseButtonPress:
+    if etype == QEvent.Type.MouseButtonPress and mode != "object":
         x = viewer.mouse.last_pos.x()
         y = viewer.mouse.last_pos.y()
-        instance_color = viewer.renderer.read_instance_color((x, y, x, y))
-        unique_color = unique(instance_color, axis=0, return_counts=False)
+        obj, key = viewer.renderer.pick_subobject(x, y, mode)
+        if obj:
+            select_subobjects(viewer, {obj: [key]}, add=False)
 
-        selected_obj = viewer.scene.instance_colors.get(tuple(unique_color[0]))  # type: ignore
+    elif etype == QEvent.Type.MouseButtonPress:
+        x = viewer.mouse.last_pos.x()
+        y = viewer.mouse.last_pos.y()
+        selected_obj = viewer.renderer.pick(x, y)
         if selected_obj:
             selected_obj.is_selected = False
 
@@ -41,6 +41,11 @@ class ObjectSetting(Container):
             obj.update(update_data=True)
             self.viewer.renderer.update()
 
+        def _update_obj_colors(*arg):
+            if not obj.buffer_manager.update_object_colors(obj):
+                self.viewer.renderer.rebuild_buffers()
+            self.viewer.renderer.update()
+
         def _update_sceneform(*arg):
             self.viewer.ui.sidebar.sceneform.update(refresh=True)
 
@@ -58,13 +63,13 @@ class ObjectSetting(Container):
             self.add(BooleanToggle(obj=obj, attr="show_faces", action=_update_obj_settings))
 
         if hasattr(obj, "pointcolor") and obj.pointcolor is not None:
-            self.add(ColorPicker(obj=obj, attr="pointcolor", action=_update_obj_settings))
+            self.add(ColorPicker(obj=obj, attr="pointcolor", action=_update_obj_colors))
 
         if hasattr(obj, "linecolor") and obj.linecolor is not None:
-            self.add(ColorPicker(obj=obj, attr="linecolor", action=_update_obj_settings))
+            self.add(ColorPicker(obj=obj, attr="linecolor", action=_update_obj_colors))
 
         if hasattr(obj, "facecolor") and obj.facecolor is not None:
-            self.add(ColorPicker(obj=obj, attr="facecolor", action=_update_obj_settings))
+            self.add(ColorPicker(obj=obj, attr="facecolor", action=_update_obj_colors))
 
         if hasattr(obj, "linewidth"):
             linewidth_edit = NumberEdit(obj, "linewidth", title="line width", min_val=0.0, max_val=10.0, action=_update_obj_settings)
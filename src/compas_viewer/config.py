@@ -308,6 +308,17 @@ class RendererConfig(ConfigBase):
     view: Literal["perspective", "front", "right", "top"] = "perspective"
     backgroundcolor: Color = field(default_factory=Color.white)
     selectioncolor: Color = field(default_factory=lambda: Color(1.0, 1.0, 0.0, 1.0))
+    hoverhighlight: bool = False
+    pickbackend: Literal["gpu", "cpu"] = "gpu"
+    pickmode: Literal["object", "vertex", "edge", "face"] = "object"
+    frustumculling: bool = True
+    occlusionculling: bool = False
+    smallfeatureculling: Literal["off", "motion", "always"] = "off"
+    smallfeaturepixels: float = 2.0
+    smallfeatureselected: bool = True
+    lodpixels: float = 1.0
+    lodhysteresis: float = 0.2
+    pointbudget: int = 10_000_000
     debug_instance: bool = False
 
 
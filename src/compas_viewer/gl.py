@@ -1,5 +1,6 @@
 import ctypes as ct
 
+import numpy as np
 from OpenGL import GL
 
 
@@ -43,8 +44,9 @@ def make_vertex_buffer(data, dynamic=False):
 
     Parameters
     ----------
-    data : list[float]
-        A flat list of floats.
+    data : list[float] | numpy.ndarray
+        A flat list of floats, or an array of floats.
+        Contiguous float32 arrays are uploaded directly from their memory.
     dynamic : bool, optional
         If True, the buffer is optimized for dynamic access.
 
@@ -54,12 +56,10 @@ def make_vertex_buffer(data, dynamic=False):
         Vertex buffer ID.
     """
     access = GL.GL_DYNAMIC_DRAW if dynamic else GL.GL_STATIC_DRAW
-    n = len(data)
-    size = n * ct.sizeof(ct.c_float)
+    data = np.ascontiguousarray(data, dtype=np.float32)
     vbo = GL.glGenBuffers(1)
-    data = (ct.c_float * n)(*data)
     GL.glBindBuffer(GL.GL_ARRAY_BUFFER, vbo)
-    GL.glBufferData(GL.GL_ARRAY_BUFFER, size, data, access)
+    GL.glBufferData(GL.GL_ARRAY_BUFFER, data.nbytes, data, access)
     GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
     return vbo
 
@@ -69,8 +69,9 @@ def make_index_buffer(data, dynamic=False):
 
     Parameters
     ----------
-    data : list[int]
-        A flat list of ints.
+    data : list[int] | numpy.ndarray
+        A flat list of ints, or an array of ints.
+        Contiguous int32 arrays are uploaded directly from their memory.
     dynamic : bool, optional
         If True, the buffer is optimized for dynamic access.
 
@@ -80,12 +81,10 @@ def make_index_buffer(data, dynamic=False):
         Element buffer ID.
     """
     access = GL.GL_DYNAMIC_DRAW if dynamic else GL.GL_STATIC_DRAW
-    n = len(data)
-    size = n * ct.sizeof(ct.c_uint)
+    data = np.ascontiguousarray(data, dtype=np.int32)
     vbo = GL.glGenBuffers(1)
-    data = (ct.c_int * n)(*data)
     GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, vbo)
-    GL.glBufferData(GL.GL_ELEMENT_ARRAY_BUFFER, size, data, access)
+    GL.glBufferData(GL.GL_ELEMENT_ARRAY_BUFFER, data.nbytes, data, access)
     GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
     return vbo
 
@@ -95,18 +94,16 @@ def update_vertex_buffer(data, buffer, offset=0):
 
     Parameters
     ----------
-    data : list[float]
-        A flat list of floats.
+    data : list[float] | numpy.ndarray
+        A flat list of floats, or an array of floats.
     buffer : int
         The ID of the buffer.
     offset : int
         Byte offset into the buffer where the update should start.
     """
-    n = len(data)
-    size = n * ct.sizeof(ct.c_float)
-    data = (ct.c_float * n)(*data)
+    data = np.ascontiguousarray(data, dtype=np.float32)
     GL.glBindBuffer(GL.GL_ARRAY_BUFFER, buffer)
-    GL.glBufferSubData(GL.GL_ARRAY_BUFFER, offset, size, data)
+    GL.glBufferSubData(GL.GL_ARRAY_BUFFER, offset, data.nbytes, data)
     GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
 
 
@@ -115,16 +112,14 @@ def update_index_buffer(data, buffer):
 
     Parameters
     ----------
-    data : list[int]
-        A flat list of ints.
+    data : list[int] | numpy.ndarray
+        A flat list of ints, or an array of ints.
     buffer : int
         The ID of the buffer.
     """
-    n = len(data)
-    size = n * ct.sizeof(ct.c_uint)
-    data = (ct.c_int * n)(*data)
+    data = np.ascontiguousarray(data, dtype=np.int32)
     GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, buffer)
-    GL.glBufferSubData(GL.GL_ELEMENT_ARRAY_BUFFER, 0, size, data)
+    GL.glBufferSubData(GL.GL_ELEMENT_ARRAY_BUFFER, 0, data.nbytes, data)
     GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
 
 
@@ -176,91 +171,250 @@ def update_texture_buffer(data, texture, offset=0):
     GL.glBindBuffer(GL.GL_TEXTURE_BUFFER, 0)
 
 
-class OffscreenBufferContext:
-    """Context manager for offscreen rendering with automatic cleanup.
+class FrameBuffer:
+    """A persistent framebuffer object with a color texture and a depth renderbuffer.
 
-    This class provides a safe way to render to an offscreen framebuffer object (FBO)
-    with automatic setup and cleanup of OpenGL resources.
+    The OpenGL resources are created once and only reallocated when the size of the buffer changes.
 
     Parameters
     ----------
     width : int
-        Width of the offscreen buffer in pixels.
+        Width of the buffer in pixels.
     height : int
-        Height of the offscreen buffer in pixels.
+        Height of the buffer in pixels.
+    internal_format : GLenum, optional
+        The internal format of the color texture. Default is GL.GL_RGBA8.
+    pixel_format : GLenum, optional
+        The format of the pixel data of the color texture. Default is GL.GL_RGBA.
+    pixel_type : GLenum, optional
+        The data type of the pixel data of the color texture. Default is GL.GL_UNSIGNED_BYTE.
+
+    Attributes
+    ----------
+    width : int
+        Width of the buffer in pixels.
+    height : int
+        Height of the buffer in pixels.
+    fbo : int
+        The framebuffer ID.
+    texture : int
+        The color texture ID.
+    depth_buffer : int
+        The depth renderbuffer ID.
 
     Examples
     --------
-    >>> with OffscreenBufferContext(800, 600) as fbo:
-    ...     # Render to offscreen buffer
+    >>> framebuffer = FrameBuffer(800, 600)
+    >>> with framebuffer:
+    ...     # Render to the framebuffer and read pixels
     ...     GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
-    ...     # ... render scene ...
-    ...     # Read pixels if needed
-    ...     pixels = GL.glReadPixels(0, 0, 800, 600, GL.GL_RGB, GL.GL_UNSIGNED_BYTE)
+    ...     pixels = GL.glReadPixels(0, 0, 800, 600, GL.GL_RGBA, GL.GL_UNSIGNED_BYTE)
+    >>> framebuffer.resize(1600, 1200)
+    True
     """
 
-    def __init__(self, width: int, height: int):
-        self.width = width
-        self.height = height
-        self.fbo = None
-        self.texture = None
-        self.depth_buffer = None
+    def __init__(self, width: int, height: int, internal_format=GL.GL_RGBA8, pixel_format=GL.GL_RGBA, pixel_type=GL.GL_UNSIGNED_BYTE):
+        self.internal_format = internal_format
+        self.pixel_format = pixel_format
+        self.pixel_type = pixel_type
+        self.width = 0
+        self.height = 0
         self.previous_fbo = None
         self.viewport = None
 
-    def __enter__(self):
-        """Set up offscreen rendering context."""
-        # Store current state
-        self.viewport = GL.glGetIntegerv(GL.GL_VIEWPORT)
-        self.previous_fbo = GL.glGetIntegerv(GL.GL_FRAMEBUFFER_BINDING)
-
-        # Create framebuffer
         self.fbo = GL.glGenFramebuffers(1)
-        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.fbo)
-
-        # Create and configure color texture
         self.texture = GL.glGenTextures(1)
-        GL.glBindTexture(GL.GL_TEXTURE_2D, self.texture)
-        GL.glTexImage2D(GL.GL_TEXTURE_2D, 0, GL.GL_RGBA8, self.width, self.height, 0, GL.GL_RGBA, GL.GL_UNSIGNED_BYTE, None)
+        self.depth_buffer = GL.glGenRenderbuffers(1)
 
-        # Set texture parameters for nearest neighbor sampling
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self.texture)
         for param in [GL.GL_TEXTURE_MIN_FILTER, GL.GL_TEXTURE_MAG_FILTER]:
             GL.glTexParameteri(GL.GL_TEXTURE_2D, param, GL.GL_NEAREST)
         for param in [GL.GL_TEXTURE_WRAP_S, GL.GL_TEXTURE_WRAP_T]:
             GL.glTexParameteri(GL.GL_TEXTURE_2D, param, GL.GL_CLAMP_TO_EDGE)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, 0)
+
+        self.resize(width, height)
+
+    def resize(self, width: int, height: int) -> bool:
+        """Reallocate the storage of the buffer if its size changed.
+
+        Parameters
+        ----------
+        width : int
+            The new width in pixels.
+        height : int
+            The new height in pixels.
+
+        Returns
+        -------
+        bool
+            True if the storage was reallocated.
+        """
+        width = max(1, int(width))
+        height = max(1, int(height))
+        if width == self.width and height == self.height:
+            return False
+        self.width = width
+        self.height = height
+
+        previous_fbo = GL.glGetIntegerv(GL.GL_FRAMEBUFFER_BINDING)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.fbo)
 
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self.texture)
+        GL.glTexImage2D(GL.GL_TEXTURE_2D, 0, self.internal_format, width, height, 0, self.pixel_format, self.pixel_type, None)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, 0)
         GL.glFramebufferTexture2D(GL.GL_FRAMEBUFFER, GL.GL_COLOR_ATTACHMENT0, GL.GL_TEXTURE_2D, self.texture, 0)
 
-        # Create depth buffer
-        self.depth_buffer = GL.glGenRenderbuffers(1)
         GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, self.depth_buffer)
-        GL.glRenderbufferStorage(GL.GL_RENDERBUFFER, GL.GL_DEPTH_COMPONENT24, self.width, self.height)
+        GL.glRenderbufferStorage(GL.GL_RENDERBUFFER, GL.GL_DEPTH_COMPONENT24, width, height)
+        GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, 0)
         GL.glFramebufferRenderbuffer(GL.GL_FRAMEBUFFER, GL.GL_DEPTH_ATTACHMENT, GL.GL_RENDERBUFFER, self.depth_buffer)
 
-        # Verify framebuffer completeness
         status = GL.glCheckFramebufferStatus(GL.GL_FRAMEBUFFER)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, previous_fbo)
         if status != GL.GL_FRAMEBUFFER_COMPLETE:
-            self._cleanup()
             raise RuntimeError(f"Framebuffer is not complete! Status: {status}")
+        return True
 
-        # Set viewport for offscreen rendering
+    def bind(self):
+        """Bind the buffer and set the viewport to its size, remembering the previous binding."""
+        self.viewport = GL.glGetIntegerv(GL.GL_VIEWPORT)
+        self.previous_fbo = GL.glGetIntegerv(GL.GL_FRAMEBUFFER_BINDING)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.fbo)
         GL.glViewport(0, 0, self.width, self.height)
 
+    def release(self):
+        """Restore the framebuffer and viewport that were active before :meth:`bind`."""
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.previous_fbo)
+        GL.glViewport(*self.viewport)
+
+    def delete(self):
+        """Delete the OpenGL resources of the buffer."""
+        GL.glDeleteRenderbuffers(1, [self.depth_buffer])
+        GL.glDeleteTextures(1, [self.texture])
+        GL.glDeleteFramebuffers(1, [self.fbo])
+        self.fbo = self.texture = self.depth_buffer = None
+
+    def __enter__(self):
+        self.bind()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Clean up offscreen rendering context."""
-        self._cleanup()
+        self.release()
 
-        # Restore previous state
-        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.previous_fbo)
-        GL.glViewport(*self.viewport)
 
-    def _cleanup(self):
-        """Clean up OpenGL resources."""
-        if self.depth_buffer:
-            GL.glDeleteRenderbuffers(1, [self.depth_buffer])
-        if self.texture:
-            GL.glDeleteTextures(1, [self.texture])
-        if self.fbo:
-            GL.glDeleteFramebuffers(1, [self.fbo])
+class PixelBuffer:
+    """A pixel buffer object, to read pixels from a framebuffer without waiting for the GPU.
+
+    :meth:`read` only queues the copy of the pixels into the buffer and returns immediately.
+    The pixels can be mapped with :meth:`resolve` once :meth:`ready` is True, typically a frame later,
+    without stalling the pipeline.
+
+    Parameters
+    ----------
+    dtype : numpy.dtype, optional
+        The data type of the pixels. Default is ``numpy.uint32``.
+
+    Attributes
+    ----------
+    pbo : int
+        The buffer ID.
+    size : int
+        The allocated size of the buffer in bytes.
+    shape : tuple[int, int]
+        The height and width of the pixels of the last read.
+    fence : Any
+        The sync object signaled when the last read is complete, or None if there is no pending read.
+
+    Examples
+    --------
+    >>> buffer = PixelBuffer()
+    >>> buffer.read(0, 0, 800, 600, GL.GL_RED_INTEGER, GL.GL_UNSIGNED_INT)
+    >>> # One frame later
+    >>> if buffer.ready():
+    ...     ids = buffer.resolve(np.unique)
+    """
+
+    def __init__(self, dtype=np.uint32):
+        self.dtype = np.dtype(dtype)
+        self.pbo = GL.glGenBuffers(1)
+        self.size = 0
+        self.shape = (0, 0)
+        self.fence = None
+
+    def read(self, x: int, y: int, width: int, height: int, pixel_format, pixel_type):
+        """Queue the copy of a region of the current framebuffer into the buffer.
+
+        Parameters
+        ----------
+        x : int
+            The left edge of the region.
+        y : int
+            The bottom edge of the region.
+        width : int
+            The width of the region.
+        height : int
+            The height of the region.
+        pixel_format : GLenum
+            The format of the pixels, with a single channel, e.g. GL.GL_RED_INTEGER.
+        pixel_type : GLenum
+            The type of the pixels, matching :attr:`dtype`, e.g. GL.GL_UNSIGNED_INT.
+        """
+        nbytes = width * height * self.dtype.itemsize
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, self.pbo)
+        if nbytes > self.size:
+            GL.glBufferData(GL.GL_PIXEL_PACK_BUFFER, nbytes, None, GL.GL_STREAM_READ)
+            self.size = nbytes
+        GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, 4)
+        GL.glReadPixels(x, y, width, height, pixel_format, pixel_type, ct.c_void_p(0))
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+        if self.fence is not None:
+            GL.glDeleteSync(self.fence)
+        self.fence = GL.glFenceSync(GL.GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+        self.shape = (height, width)
+
+    def ready(self) -> bool:
+        """Whether the last read is complete, without waiting for it."""
+        if self.fence is None:
+            return False
+        status = GL.glClientWaitSync(self.fence, 0, 0)
+        return status in (GL.GL_ALREADY_SIGNALED, GL.GL_CONDITION_SATISFIED)
+
+    def resolve(self, function):
+        """Map the pixels of the last read and pass them to a function.
+
+        The array passed to the function is only valid during the call,
+        so the function should not keep a reference to it.
+
+        Parameters
+        ----------
+        function : callable
+            A function taking the pixels as an array of shape (height, width).
+
+        Returns
+        -------
+        Any
+            The result of the function.
+        """
+        height, width = self.shape
+        nbytes = width * height * self.dtype.itemsize
+        GL.glDeleteSync(self.fence)
+        self.fence = None
+        if not nbytes:
+            return function(np.zeros(self.shape, dtype=self.dtype))
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, self.pbo)
+        address = GL.glMapBufferRange(GL.GL_PIXEL_PACK_BUFFER, 0, nbytes, GL.GL_MAP_READ_BIT)
+        try:
+            pixels = np.frombuffer((ct.c_ubyte * nbytes).from_address(address), dtype=self.dtype).reshape(self.shape)
+            return function(pixels)
+        finally:
+            GL.glUnmapBuffer(GL.GL_PIXEL_PACK_BUFFER)
+            GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+
+    def delete(self):
+        """Delete the OpenGL resources of the buffer."""
+        if self.fence is not None:
+            GL.glDeleteSync(self.fence)
+            self.fence = None
+        GL.glDeleteBuffers(1, [self.pbo])
+        self.pbo = None
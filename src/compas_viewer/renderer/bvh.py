@@ -0,0 +1,389 @@
+import numpy as np
+
+
+class BVH:
+    """Bounding volume hierarchy of axis-aligned boxes, stored in flat numpy arrays.
+
+    The tree is built top-down by splitting the boxes at the median of their centers
+    along the longest axis. Queries traverse it breadth-first, testing all nodes
+    of a level at once, so the number of Python iterations is the depth of the tree.
+
+    Parameters
+    ----------
+    boxes : numpy.ndarray
+        The min and max corners of the boxes, as an array of shape (n, 2, 3).
+    leafsize : int, optional
+        The maximum number of boxes in a leaf. Default is 4.
+
+    Attributes
+    ----------
+    boxes : numpy.ndarray
+        The boxes, as an array of shape (n, 2, 3).
+    lower : numpy.ndarray
+        The min corners of the nodes, as an array of shape (m, 3).
+    upper : numpy.ndarray
+        The max corners of the nodes, as an array of shape (m, 3).
+    children : numpy.ndarray
+        The indices of the two children of the nodes, -1 for leaves, as an array of shape (m, 2).
+    start : numpy.ndarray
+        The index of the first box of each node in :attr:`items`.
+    count : numpy.ndarray
+        The number of boxes of each node.
+    items : numpy.ndarray
+        The indices of the boxes, ordered by leaf, so that the boxes of every node are consecutive.
+
+    Examples
+    --------
+    >>> boxes = np.array([[[0, 0, 0], [1, 1, 1]], [[2, 0, 0], [3, 1, 1]]], dtype=float)
+    >>> bvh = BVH(boxes, leafsize=1)
+    >>> items, t = bvh.intersect_ray([-1, 0.5, 0.5], [1, 0, 0])
+    >>> items.tolist(), t.tolist()
+    ([0, 1], [1.0, 3.0])
+
+    """
+
+    def __init__(self, boxes: np.ndarray, leafsize: int = 4):
+        self.boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 2, 3)
+        self.leafsize = max(1, leafsize)
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def _build(self):
+        n = len(self.boxes)
+        # Empty boxes, with infinite corners, are sorted as if they were at the origin
+        with np.errstate(invalid="ignore"):
+            centers = np.nan_to_num(self.boxes.mean(axis=1))
+        items = np.arange(n)
+
+        lower, upper, children, start, count = [], [], [], [], []
+        # Each entry is (node index, first item, number of items)
+        stack = [(0, 0, n)]
+        lower.append(None)
+        upper.append(None)
+        children.append([-1, -1])
+        start.append(0)
+        count.append(0)
+
+        while stack:
+            node, first, size = stack.pop()
+            node_items = items[first : first + size]
+            node_boxes = self.boxes[node_items]
+            if size:
+                lower[node] = node_boxes[:, 0].min(axis=0)
+                upper[node] = node_boxes[:, 1].max(axis=0)
+            else:
+                lower[node] = np.full(3, np.inf)
+                upper[node] = np.full(3, -np.inf)
+
+            start[node] = first
+            count[node] = size
+            if size <= self.leafsize:
+                continue
+
+            node_centers = centers[node_items]
+            axis = int(np.argmax(node_centers.max(axis=0) - node_centers.min(axis=0)))
+            half = size // 2
+            order = np.argpartition(node_centers[:, axis], half)
+            items[first : first + size] = node_items[order]
+
+            for child_first, child_size in [(first, half), (first + half, size - half)]:
+                child = len(lower)
+                lower.append(None)
+                upper.append(None)
+                children.append([-1, -1])
+                start.append(0)
+                count.append(0)
+                children[node][0 if child_first == first else 1] = child
+                stack.append((child, child_first, child_size))
+
+        self.lower = np.array(lower, dtype=np.float64).reshape(-1, 3)
+        self.upper = np.array(upper, dtype=np.float64).reshape(-1, 3)
+        self.children = np.array(children, dtype=np.int64).reshape(-1, 2)
+        self.start = np.array(start, dtype=np.int64)
+        self.count = np.array(count, dtype=np.int64)
+        self.items = items
+
+    def node_items(self, nodes: np.ndarray) -> np.ndarray:
+        """Find the boxes in a set of nodes.
+
+        Parameters
+        ----------
+        nodes : numpy.ndarray
+            The indices of the nodes, none of which is an ancestor of another.
+
+        Returns
+        -------
+        numpy.ndarray
+            The indices of the boxes, node by node.
+        """
+        counts = self.count[nodes]
+        offsets = np.repeat(self.start[nodes] - (np.cumsum(counts) - counts), counts)
+        return self.items[np.arange(counts.sum()) + offsets]
+
+    def intersect_ray(self, origin, direction, margin: float = 0.0, slope: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+        """Find the boxes hit by a ray.
+
+        Parameters
+        ----------
+        origin : array_like
+            The origin of the ray.
+        direction : array_like
+            The direction of the ray.
+        margin : float, optional
+            Grow the boxes by this distance, e.g. to find objects near the ray.
+        slope : float, optional
+            Grow the boxes by an additional distance per unit of distance from the origin,
+            e.g. to account for the size of a pixel in a perspective view.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+            The indices of the boxes that are hit, and the ray parameters where they are entered,
+            sorted by the ray parameter.
+        """
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        empty = np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+        if not len(self.boxes):
+            return empty
+
+        nodes = np.array([0])
+        leaves = []
+        while len(nodes):
+            _, hit = intersect_ray_boxes(origin, direction, self.lower[nodes], self.upper[nodes], margin, slope)
+            nodes = nodes[hit]
+            is_leaf = self.children[nodes, 0] < 0
+            leaves.append(nodes[is_leaf])
+            nodes = self.children[nodes[~is_leaf]].reshape(-1)
+
+        items = self.node_items(np.concatenate(leaves))
+        if not len(items):
+            return empty
+        tnear, hit = intersect_ray_boxes(origin, direction, self.boxes[items, 0], self.boxes[items, 1], margin, slope)
+        items, tnear = items[hit], tnear[hit]
+        order = np.argsort(tnear, kind="stable")
+        return items[order], tnear[order]
+
+    def intersect_frustum(self, planes) -> np.ndarray:
+        """Find the boxes that are inside or intersect a convex volume, e.g. the view frustum of a camera.
+
+        Nodes completely inside the volume are accepted with all their boxes without visiting their children,
+        and nodes completely outside are rejected.
+        The test is conservative: a box near a corner of the volume can be outside of it but still be returned.
+
+        Parameters
+        ----------
+        planes : array_like
+            The planes bounding the volume, as an array of shape (k, 4) of (a, b, c, d),
+            with the points inside the volume satisfying ``a * x + b * y + c * z + d >= 0``.
+
+        Returns
+        -------
+        numpy.ndarray
+            The sorted indices of the boxes.
+        """
+        planes = np.asarray(planes, dtype=np.float64)
+        if not len(self.boxes):
+            return np.array([], dtype=np.int64)
+
+        nodes = np.array([0])
+        accepted = []
+        while len(nodes):
+            inside, outside = classify_boxes(self.lower[nodes], self.upper[nodes], planes)
+            accepted.append(nodes[inside])
+            nodes = nodes[~inside & ~outside]
+            is_leaf = self.children[nodes, 0] < 0
+            # The boxes of leaves that intersect the volume are tested individually
+            items = self.node_items(nodes[is_leaf])
+            _, outside = classify_boxes(self.boxes[items, 0], self.boxes[items, 1], planes)
+            accepted.append(-1 - items[~outside])
+            nodes = self.children[nodes[~is_leaf]].reshape(-1)
+
+        # Accepted nodes are stored as is, and accepted boxes as negative numbers
+        accepted = np.concatenate(accepted)
+        items = np.concatenate([self.node_items(accepted[accepted >= 0]), -1 - accepted[accepted < 0]])
+        return np.sort(items)
+
+
+def classify_boxes(lower: np.ndarray, upper: np.ndarray, planes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Classify axis-aligned boxes against a convex volume bounded by planes.
+
+    Parameters
+    ----------
+    lower : numpy.ndarray
+        The min corners of the boxes, as an array of shape (n, 3).
+    upper : numpy.ndarray
+        The max corners of the boxes, as an array of shape (n, 3).
+    planes : numpy.ndarray
+        The planes bounding the volume, as an array of shape (k, 4), with normals pointing inwards.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        Whether each box is completely inside the volume, and whether it is completely outside of at least one plane.
+    """
+    normals = planes[:, :3]
+    positive = normals >= 0
+    # The corners of each box furthest along and against the normal of each plane
+    far = np.where(positive[None], upper[:, None], lower[:, None])
+    near = np.where(positive[None], lower[:, None], upper[:, None])
+    outside = (np.einsum("nkj,kj->nk", far, normals) + planes[:, 3] < 0).any(axis=1)
+    inside = (np.einsum("nkj,kj->nk", near, normals) + planes[:, 3] >= 0).all(axis=1)
+    return inside, outside
+
+
+def transform_boxes(boxes: np.ndarray, matrices: np.ndarray) -> np.ndarray:
+    """Compute the axis-aligned bounding boxes of transformed boxes.
+
+    Parameters
+    ----------
+    boxes : numpy.ndarray
+        The min and max corners of the boxes, as an array of shape (n, 2, 3).
+    matrices : numpy.ndarray
+        The transformation matrix of each box, as an array of shape (n, 4, 4), or one matrix of shape (4, 4) for all.
+
+    Returns
+    -------
+    numpy.ndarray
+        The min and max corners of the boxes around the transformed corners, as an array of shape (n, 2, 3).
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 2, 3)
+    matrices = np.broadcast_to(np.asarray(matrices, dtype=np.float64), (len(boxes), 4, 4))
+    corners = np.stack(np.meshgrid([0, 1], [0, 1], [0, 1], indexing="ij"), axis=-1).reshape(8, 3)
+    points = boxes[:, corners, [0, 1, 2]]
+    points = np.einsum("nij,nkj->nki", matrices[:, :3, :3], points) + matrices[:, None, :3, 3]
+    return np.stack([points.min(axis=1), points.max(axis=1)], axis=1)
+
+
+def intersect_ray_boxes(origin: np.ndarray, direction: np.ndarray, lower: np.ndarray, upper: np.ndarray, margin: float = 0.0, slope: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+    """Intersect a ray with a set of axis-aligned boxes, using the slab method.
+
+    Parameters
+    ----------
+    origin : numpy.ndarray
+        The origin of the ray.
+    direction : numpy.ndarray
+        The direction of the ray.
+    lower : numpy.ndarray
+        The min corners of the boxes, as an array of shape (n, 3).
+    upper : numpy.ndarray
+        The max corners of the boxes, as an array of shape (n, 3).
+    margin : float, optional
+        Grow the boxes by this distance.
+    slope : float, optional
+        Grow the boxes by an additional distance per unit of distance from the origin.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The ray parameters where the boxes are entered, clamped to zero, and whether they are hit.
+    """
+    if margin or slope:
+        # Grow each box by the tolerance at its far side
+        far = np.linalg.norm(np.maximum(np.abs(lower - origin), np.abs(upper - origin)), axis=1)
+        grow = (margin + slope * far)[:, None]
+        lower = lower - grow
+        upper = upper + grow
+    safe = np.where(np.abs(direction) < 1e-12, 1e-12, direction)
+    inverse = 1.0 / safe
+    t1 = (lower - origin) * inverse
+    t2 = (upper - origin) * inverse
+    tnear = np.minimum(t1, t2).max(axis=1)
+    tfar = np.maximum(t1, t2).min(axis=1)
+    hit = (tnear <= tfar) & (tfar >= 0)
+    return np.maximum(tnear, 0.0), hit
+
+
+def intersect_ray_triangles(origin: np.ndarray, direction: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """Intersect a ray with a set of triangles, using the Möller-Trumbore algorithm.
+
+    Parameters
+    ----------
+    origin : numpy.ndarray
+        The origin of the ray.
+    direction : numpy.ndarray
+        The direction of the ray.
+    triangles : numpy.ndarray
+        The corners of the triangles, as an array of shape (n, 3, 3).
+
+    Returns
+    -------
+    numpy.ndarray
+        The ray parameter of the intersection with each triangle, or infinity if it is missed.
+        Both sides of the triangles are hit.
+    """
+    a = triangles[:, 0]
+    e1 = triangles[:, 1] - a
+    e2 = triangles[:, 2] - a
+    p = np.cross(direction, e2)
+    det = np.einsum("ij,ij->i", e1, p)
+    valid = np.abs(det) > 1e-12
+    inv_det = np.divide(1.0, det, out=np.zeros_like(det), where=valid)
+    s = origin - a
+    u = np.einsum("ij,ij->i", s, p) * inv_det
+    q = np.cross(s, e1)
+    v = (q @ direction) * inv_det
+    t = np.einsum("ij,ij->i", e2, q) * inv_det
+    hit = valid & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0)
+    return np.where(hit, t, np.inf)
+
+
+def closest_ray_segments(origin: np.ndarray, direction: np.ndarray, segments: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find the closest points between a ray and a set of line segments.
+
+    Parameters
+    ----------
+    origin : numpy.ndarray
+        The origin of the ray.
+    direction : numpy.ndarray
+        The unit direction of the ray.
+    segments : numpy.ndarray
+        The end points of the segments, as an array of shape (n, 2, 3).
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        The ray parameters, the closest points on the segments, and the distances between them.
+    """
+    a = segments[:, 0]
+    u = segments[:, 1] - a
+    w = origin - a
+    b = u @ direction
+    c = np.einsum("ij,ij->i", u, u)
+    d = w @ direction
+    e = np.einsum("ij,ij->i", u, w)
+    denominator = c - b * b
+    parallel = np.abs(denominator) < 1e-12
+    t = np.divide(e - b * d, denominator, out=np.zeros_like(e), where=~parallel)
+    t = np.clip(t, 0.0, 1.0)
+    s = np.maximum(b * t - d, 0.0)
+    # Recompute the segment parameter for rays that were clamped at the origin
+    t = np.clip(np.divide(e + b * s, c, out=np.zeros_like(e), where=c > 0), 0.0, 1.0)
+    points = a + t[:, None] * u
+    distances = np.linalg.norm(origin + s[:, None] * direction - points, axis=1)
+    return s, points, distances
+
+
+def closest_ray_points(origin: np.ndarray, direction: np.ndarray, points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Find the distances between a ray and a set of points.
+
+    Parameters
+    ----------
+    origin : numpy.ndarray
+        The origin of the ray.
+    direction : numpy.ndarray
+        The unit direction of the ray.
+    points : numpy.ndarray
+        The points, as an array of shape (n, 3).
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The ray parameters of the closest points on the ray, and the distances to the points.
+    """
+    w = points - origin
+    s = np.maximum(w @ direction, 0.0)
+    distances = np.linalg.norm(w - s[:, None] * direction, axis=1)
+    return s, distances
@@ -7,11 +7,18 @@ from typing import Sequence
 from typing import Union
 
 from numpy import array
+from numpy import asarray
 from numpy import asfortranarray
 from numpy import dot
 from numpy import float32
+from numpy import float64
+from numpy import isfinite
+from numpy import maximum
+from numpy import ndarray
 from numpy import pi
+from numpy import where
 from numpy.linalg import det
+from numpy.linalg import inv
 from numpy.linalg import norm
 
 from compas.geometry import Rotation
@@ -24,11 +31,18 @@ if TYPE_CHECKING:
 
 
 class Position(Vector):
-    def __init__(self, vector, on_update=None):
+    def __init__(self, vector, on_update=None, on_change=None):
         super().__init__(*vector)
         self.pause_update = False
         if on_update:
             self.on_update = on_update
+        if on_change:
+            self.on_change = on_change
+
+    def _changed(self):
+        # Unlike on_update, this is also called while updates are paused.
+        if hasattr(self, "on_change"):
+            self.on_change()
 
     def set(self, x, y, z, pause_update=False):
         pause_update = pause_update or self.pause_update
@@ -37,6 +51,7 @@ class Position(Vector):
         self._x = x
         self._y = y
         self._z = z
+        self._changed()
 
     @property
     def x(self):
@@ -47,6 +62,7 @@ class Position(Vector):
         if hasattr(self, "on_update") and not self.pause_update:
             self.on_update([x, self.y, self.z])
         self._x = float(x)
+        self._changed()
 
     @property
     def y(self):
@@ -57,6 +73,7 @@ class Position(Vector):
         if hasattr(self, "on_update") and not self.pause_update:
             self.on_update([self.x, y, self.z])
         self._y = float(y)
+        self._changed()
 
     @property
     def z(self):
@@ -67,6 +84,7 @@ class Position(Vector):
         if hasattr(self, "on_update") and not self.pause_update:
             self.on_update([self.x, self.y, z])
         self._z = float(z)
+        self._changed()
 
 
 class RotationEuler(Position):
@@ -113,6 +131,8 @@ class Camera:
         Size of one pan increment.
     scale : float
         The scale factor for camera's near, far and pan_delta.
+    version : int
+        Counter incremented whenever the position, rotation or target of the camera changes.
     """
 
     def __init__(
@@ -138,9 +158,10 @@ class Camera:
         self.rotationdelta = rotationdelta
         self.pandelta = pandelta
 
-        self._position = Position([0, 0, 10 * scale], on_update=self._on_position_update)
-        self._rotation = RotationEuler([0, 0, 0], on_update=self._on_rotation_update)
-        self._target = Position([0, 0, 0], on_update=self._on_target_update)
+        self.version = 0
+        self._position = Position([0, 0, 10 * scale], on_update=self._on_position_update, on_change=self._on_change)
+        self._rotation = RotationEuler([0, 0, 0], on_update=self._on_rotation_update, on_change=self._on_change)
+        self._target = Position([0, 0, 0], on_update=self._on_target_update, on_change=self._on_change)
 
         self.reset_position(view="perspective")
         self.target.set(*target)
@@ -254,6 +275,9 @@ class Camera:
         matrix = [[sx, 0, 0, 0], [0, sy, 0, 0], [0, 0, zz, zw], [0, 0, -1, 0]]
         return Transformation.from_matrix(matrix)
 
+    def _on_change(self):
+        self.version += 1
+
     def _on_position_update(self, new_position: Position):
         """Update camera rotation to keep pointing the target."""
         old_direction = array(self.position - self.target)
@@ -407,6 +431,133 @@ class Camera:
 
         return asfortranarray(P, dtype=float32)
 
+    def pick_matrix(self, x: float, y: float, width: float, height: float, viewport_width: float, viewport_height: float) -> list[list[float]]:
+        """Compute the matrix that narrows the projection to a small region of the viewport.
+
+        Parameters
+        ----------
+        x : float
+            The left edge of the region, in pixels from the left of the viewport.
+        y : float
+            The bottom edge of the region, in pixels from the bottom of the viewport.
+        width : float
+            Width of the region in pixels.
+        height : float
+            Height of the region in pixels.
+        viewport_width : float
+            Width of the viewport in pixels.
+        viewport_height : float
+            Height of the viewport in pixels.
+
+        Returns
+        -------
+        list[list[float]]
+            The transformation matrix as a `numpy` array.
+
+        Notes
+        -----
+        Multiplied with the projection matrix, the region is mapped onto the full clip space,
+        equivalent to ``gluPickMatrix``. Rendered into a viewport of ``width`` by ``height`` pixels,
+        the region is rasterized at its original resolution and everything outside of it is clipped.
+
+        """
+        sx = viewport_width / width
+        sy = viewport_height / height
+        cx = 2 * (x + width / 2) / viewport_width - 1
+        cy = 2 * (y + height / 2) / viewport_height - 1
+        matrix = [[sx, 0, 0, -sx * cx], [0, sy, 0, -sy * cy], [0, 0, 1, 0], [0, 0, 0, 1]]
+        return array(matrix, dtype=float32)
+
+    def ray(self, x: float, y: float, width: int, height: int) -> tuple[ndarray, ndarray]:
+        """Compute the ray from the camera through a point of the screen.
+
+        Parameters
+        ----------
+        x : float
+            The x coordinate of the point, from the left of the screen.
+        y : float
+            The y coordinate of the point, from the top of the screen.
+        width : int
+            Width of the viewer.
+        height : int
+            Height of the viewer.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+            The origin of the ray on the near plane, and its unit direction, in world coordinates.
+
+        """
+        matrix = inv(array(self.projection(width, height), dtype=float64) @ array(self.viewworld(), dtype=float64))
+        ndc_x = 2 * (x + 0.5) / width - 1
+        ndc_y = 1 - 2 * (y + 0.5) / height
+        near = matrix @ array([ndc_x, ndc_y, -1.0, 1.0])
+        far = matrix @ array([ndc_x, ndc_y, 1.0, 1.0])
+        near = near[:3] / near[3]
+        far = far[:3] / far[3]
+        direction = far - near
+        return near, direction / norm(direction)
+
+    def frustum_planes(self, width: int, height: int) -> ndarray:
+        """Compute the planes bounding the view frustum of the camera.
+
+        Parameters
+        ----------
+        width : int
+            Width of the viewer.
+        height : int
+            Height of the viewer.
+
+        Returns
+        -------
+        numpy.ndarray
+            The left, right, bottom, top, near and far planes as an array of shape (6, 4) of (a, b, c, d),
+            with the points in view satisfying ``a * x + b * y + c * z + d >= 0`` in world coordinates.
+
+        Notes
+        -----
+        The planes are extracted from the rows of the combined projection and view-world matrix,
+        following Gribb and Hartmann.
+
+        """
+        matrix = array(self.projection(width, height), dtype=float64) @ array(self.viewworld(), dtype=float64)
+        planes = array([matrix[3] + matrix[0], matrix[3] - matrix[0], matrix[3] + matrix[1], matrix[3] - matrix[1], matrix[3] + matrix[2], matrix[3] - matrix[2]])
+        return planes / norm(planes[:, :3], axis=1)[:, None]
+
+    def projected_size(self, boxes: ndarray, width: int, height: int) -> ndarray:
+        """Estimate the size on screen of axis-aligned boxes.
+
+        Parameters
+        ----------
+        boxes : numpy.ndarray
+            The min and max corners of the boxes in world coordinates, as an array of shape (n, 2, 3).
+        width : int
+            Width of the viewer.
+        height : int
+            Height of the viewer.
+
+        Returns
+        -------
+        numpy.ndarray
+            The length of the diagonal of each box on screen, in pixels.
+            In perspective, the diagonal is measured at the point of the box nearest to the camera,
+            so the size is not underestimated for boxes near the center of the view. Empty boxes have size 0.
+
+        """
+        boxes = asarray(boxes, dtype=float64).reshape(-1, 2, 3)
+        empty = ~isfinite(boxes).all(axis=(1, 2))
+        boxes = where(empty[:, None, None], 0.0, boxes)
+        diagonal = norm(boxes[:, 1] - boxes[:, 0], axis=1)
+
+        if self.renderer.view == "perspective":
+            eye = array(self.position, dtype=float64)
+            distance = norm(maximum(maximum(boxes[:, 0] - eye, eye - boxes[:, 1]), 0.0), axis=1)
+            distance = maximum(distance, self.near * self.scale)
+            size = diagonal * height / (2 * tan(radians(self.fov) / 2) * distance)
+        else:
+            size = diagonal * width / (2 * self.distance)
+        return where(empty, 0.0, size)
+
     def viewworld(self) -> list[list[float]]:
         """Compute the view-world matrix corresponding to the current camera settings.
 
@@ -0,0 +1,239 @@
+from typing import TYPE_CHECKING
+from typing import Optional
+
+import numpy as np
+from OpenGL import GL
+
+from .bvh import BVH
+from .bvh import classify_boxes
+
+if TYPE_CHECKING:
+    from .camera import Camera
+    from .shaders.shader import Shader
+
+
+# The triangles of the faces of a box, as indices of its corners,
+# with the corner ``4 * x + 2 * y + z`` at the min (0) or max (1) coordinates along each axis
+BOX_TRIANGLES = np.array(
+    [
+        [0, 1, 3], [0, 3, 2], [4, 5, 7], [4, 7, 6],
+        [0, 1, 5], [0, 5, 4], [2, 3, 7], [2, 7, 6],
+        [0, 2, 6], [0, 6, 4], [1, 3, 7], [1, 7, 5],
+    ]
+)  # fmt: skip
+
+
+class OcclusionCuller:
+    """Cull the objects hidden behind opaque faces, with occlusion queries of the nodes of a bounding volume hierarchy.
+
+    After the opaque faces are drawn, the boxes of the nodes at the boundary of the traversal of the hierarchy
+    are drawn without writing color or depth, each inside a ``GL_ANY_SAMPLES_PASSED`` query.
+    The results are read in a later frame, without waiting for the GPU,
+    and the subtrees of the nodes whose boxes are hidden are skipped until their boxes are visible again.
+    Nodes whose children are all hidden are merged, so that large hidden regions cost a single query.
+
+    Skipped nodes are tested again every time the view changes, so objects appear one frame after they come into view.
+    Visible leaves are tested less often, in turns, so hidden objects may be drawn for a few more frames.
+    Nodes near the camera, and nodes that are small on screen, are never skipped,
+    because their boxes can be clipped by the near plane or miss all samples.
+
+    Attributes
+    ----------
+    bvh : :class:`compas_viewer.renderer.bvh.BVH` | None
+        The hierarchy the results apply to.
+    occluded : numpy.ndarray
+        Whether each node of the hierarchy was hidden when it was last tested.
+    frontier : numpy.ndarray
+        The nodes to test after the current frame.
+    stale : bool
+        Whether the nodes have changed since they were last tested.
+    version : int
+        Incremented whenever the results of the queries change which nodes are hidden.
+    """
+
+    # Boxes smaller than this on screen, in pixels, are always drawn
+    MIN_SIZE = 8.0
+
+    # The margin around the boxes drawn for the queries, relative to their diagonal,
+    # so that faces on the boundary of a box are not hidden by the box
+    MARGIN = 1e-3
+
+    # Visible leaves are tested in turns, each one every this many views,
+    # while hidden nodes are tested in every view
+    REVISIT = 4
+
+    def __init__(self):
+        self.bvh: Optional[BVH] = None
+        self.occluded = np.zeros(0, dtype=bool)
+        self.frontier = np.zeros(0, dtype=np.int64)
+        self.stale = False
+        self.version = 0
+        self._views = 0
+        self._queries: list[int] = []
+        self._pending: Optional[tuple[BVH, np.ndarray]] = None
+        self._vbo: Optional[int] = None
+
+    @property
+    def pending(self) -> bool:
+        """Whether queries were issued whose results have not been read yet."""
+        return self._pending is not None
+
+    def reset(self, bvh: Optional[BVH] = None):
+        """Forget the results of all queries, e.g. when the hierarchy was rebuilt.
+
+        Parameters
+        ----------
+        bvh : :class:`compas_viewer.renderer.bvh.BVH`, optional
+            The new hierarchy.
+        """
+        self.bvh = bvh
+        self.occluded = np.zeros(len(bvh.lower) if bvh is not None and len(bvh) else 0, dtype=bool)
+        self.frontier = np.zeros(0, dtype=np.int64)
+        self.stale = False
+        self._pending = None
+        self.version += 1
+
+    def cull(self, bvh: BVH, camera: "Camera", width: int, height: int) -> np.ndarray:
+        """Find the boxes in the subtrees that were hidden, and the nodes to test in the current view.
+
+        Parameters
+        ----------
+        bvh : :class:`compas_viewer.renderer.bvh.BVH`
+            The hierarchy of the bounding boxes of the objects in world coordinates.
+        camera : :class:`compas_viewer.renderer.Camera`
+            The camera.
+        width : int
+            Width of the view.
+        height : int
+            Height of the view.
+
+        Returns
+        -------
+        numpy.ndarray
+            Whether each box is hidden.
+        """
+        if bvh is not self.bvh:
+            self.reset(bvh)
+        hidden = np.zeros(len(bvh), dtype=bool)
+        self.stale = True
+        self._views += 1
+        if not len(bvh):
+            self.frontier = np.zeros(0, dtype=np.int64)
+            return hidden
+
+        lower, upper = bvh.lower, bvh.upper
+        finite = np.isfinite(lower).all(axis=1) & np.isfinite(upper).all(axis=1)
+        eye = np.array(camera.position, dtype=np.float64)
+        distance = np.linalg.norm(np.maximum(np.maximum(lower - eye, eye - upper), 0.0), axis=1)
+        sizes = camera.projected_size(np.stack([lower, upper], axis=1), width, height)
+        # The near plane is within twice its distance from the camera, up to the corners of the view
+        testable = finite & (distance > 2 * camera.near * camera.scale) & (sizes >= self.MIN_SIZE)
+
+        planes = camera.frustum_planes(width, height)
+        frontier = []
+        nodes = np.array([0])
+        while len(nodes):
+            _, outside = classify_boxes(lower[nodes], upper[nodes], planes)
+            nodes = nodes[~outside & finite[nodes]]
+            closed = self.occluded[nodes] & testable[nodes]
+            is_leaf = bvh.children[nodes, 0] < 0
+            revisit = is_leaf & ((nodes + self._views) % self.REVISIT == 0)
+            frontier.append(nodes[testable[nodes] & (closed | revisit)])
+            hidden[bvh.node_items(nodes[closed])] = True
+            nodes = bvh.children[nodes[~closed & ~is_leaf]].reshape(-1)
+
+        self.frontier = np.concatenate(frontier)
+        return hidden
+
+    def query(self, shader: "Shader"):
+        """Draw the boxes of the nodes of the frontier, each in its own occlusion query.
+
+        The depth buffer has to contain the opaque faces, and writing depth has to be disabled.
+
+        Parameters
+        ----------
+        shader : :class:`compas_viewer.renderer.shaders.Shader`
+            The bound model shader.
+        """
+        self.stale = False
+        nodes = self.frontier
+        if self.bvh is None or not len(nodes):
+            return
+
+        lower, upper = self.bvh.lower[nodes], self.bvh.upper[nodes]
+        margin = self.MARGIN * np.linalg.norm(upper - lower, axis=1)[:, None]
+        boxes = np.stack([lower - margin, upper + margin], axis=1)
+        corners = np.stack(np.meshgrid([0, 1], [0, 1], [0, 1], indexing="ij"), axis=-1).reshape(8, 3)
+        vertices = np.ascontiguousarray(boxes[:, corners, [0, 1, 2]][:, BOX_TRIANGLES.ravel()], dtype=np.float32)
+
+        if self._vbo is None:
+            self._vbo = GL.glGenBuffers(1)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._vbo)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL.GL_STREAM_DRAW)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+        if len(self._queries) < len(nodes):
+            self._queries.extend(int(query) for query in np.atleast_1d(GL.glGenQueries(len(nodes) - len(self._queries))))
+
+        shader.uniform1i("is_grid", True)
+        shader.uniform1i("element_type", 2)
+        shader.enable_attribute("position")
+        shader.disable_attribute("color")
+        shader.disable_attribute("object_index")
+        shader.bind_attribute("position", self._vbo)
+        GL.glColorMask(GL.GL_FALSE, GL.GL_FALSE, GL.GL_FALSE, GL.GL_FALSE)
+        GL.glDepthFunc(GL.GL_LEQUAL)
+        count = len(BOX_TRIANGLES) * 3
+        for i, query in enumerate(self._queries[: len(nodes)]):
+            GL.glBeginQuery(GL.GL_ANY_SAMPLES_PASSED, query)
+            GL.glDrawArrays(GL.GL_TRIANGLES, i * count, count)
+            GL.glEndQuery(GL.GL_ANY_SAMPLES_PASSED)
+        GL.glDepthFunc(GL.GL_LESS)
+        GL.glColorMask(GL.GL_TRUE, GL.GL_TRUE, GL.GL_TRUE, GL.GL_TRUE)
+        shader.disable_attribute("position")
+        shader.uniform1i("is_grid", False)
+        self._pending = (self.bvh, nodes)
+
+    def collect(self) -> bool:
+        """Read the results of the queries, if they are available, and update which nodes are hidden.
+
+        Returns
+        -------
+        bool
+            True if the results changed which nodes are hidden.
+        """
+        if self._pending is None:
+            return False
+        bvh, nodes = self._pending
+        if bvh is not self.bvh:
+            self._pending = None
+            return False
+        # The queries finish in order, so the others are done when the last one is
+        if not GL.glGetQueryObjectuiv(self._queries[len(nodes) - 1], GL.GL_QUERY_RESULT_AVAILABLE):
+            return False
+        self._pending = None
+        passed = np.array([GL.glGetQueryObjectuiv(query, GL.GL_QUERY_RESULT) for query in self._queries[: len(nodes)]], dtype=bool)
+
+        previous = self.occluded.copy()
+        self.occluded[nodes] = ~passed
+
+        # The nodes below a node that became visible are drawn until they are tested themselves
+        opened = nodes[passed & previous[nodes]]
+        while len(opened):
+            self.occluded[opened] = False
+            opened = bvh.children[opened[bvh.children[opened, 0] >= 0]].reshape(-1)
+
+        # Nodes whose children were all found hidden are tested as a whole from now on
+        tested = np.zeros(len(self.occluded), dtype=bool)
+        tested[nodes] = True
+        inner = np.flatnonzero(bvh.children[:, 0] >= 0)
+        while True:
+            merged = (self.occluded & tested)[bvh.children[inner]].all(axis=1) & ~self.occluded[inner]
+            if not merged.any():
+                break
+            self.occluded[inner[merged]] = True
+            tested[inner[merged]] = True
+
+        changed = bool((self.occluded != previous).any())
+        if changed:
+            self.version += 1
+        return changed
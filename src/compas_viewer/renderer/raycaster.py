@@ -0,0 +1,181 @@
+from typing import TYPE_CHECKING
+from typing import Optional
+
+import numpy as np
+
+from compas.geometry import Point
+from compas_viewer.scene.arrays import as_point_array
+
+from .bvh import BVH
+from .bvh import closest_ray_points
+from .bvh import closest_ray_segments
+from .bvh import intersect_ray_triangles
+
+if TYPE_CHECKING:
+    from compas_viewer.scene import ViewerSceneObject
+
+
+class RayCaster:
+    """Pick objects on the CPU, by casting rays against a bounding volume hierarchy of the scene.
+
+    The geometry of the objects is taken from their shader data and transformed to world coordinates once,
+    when the caster is built. A ray is first tested against the bounding boxes of the objects,
+    and then against the triangles, segments and points of the candidates, nearest first.
+
+    Attributes
+    ----------
+    objects : list[:class:`compas_viewer.scene.ViewerSceneObject`]
+        The objects the caster was built from.
+    bvh : :class:`compas_viewer.renderer.bvh.BVH`
+        The hierarchy of the bounding boxes of the objects.
+    key : Any
+        The state the caster was built from, used by the renderer to decide when to rebuild it.
+    """
+
+    def __init__(self):
+        self.objects: list["ViewerSceneObject"] = []
+        self.bvh: Optional[BVH] = None
+        self.key = None
+        self._geometry: list[dict[str, np.ndarray]] = []
+
+    def build(self, objects: list["ViewerSceneObject"], key=None):
+        """Collect the world geometry of the objects and build the hierarchy of their bounding boxes.
+
+        Parameters
+        ----------
+        objects : list[:class:`compas_viewer.scene.ViewerSceneObject`]
+            The objects.
+        key : Any, optional
+            The state the objects are in.
+        """
+        self.objects = []
+        self._geometry = []
+        boxes = []
+        for obj in objects:
+            geometry = self._world_geometry(obj)
+            corners = [array.reshape(-1, 3) for array in geometry.values() if len(array)]
+            if not corners:
+                continue
+            corners = np.vstack(corners)
+            self.objects.append(obj)
+            self._geometry.append(geometry)
+            boxes.append([corners.min(axis=0), corners.max(axis=0)])
+        self.bvh = BVH(np.array(boxes, dtype=np.float64).reshape(-1, 2, 3))
+        self.key = key
+
+    def _world_geometry(self, obj: "ViewerSceneObject") -> dict[str, np.ndarray]:
+        """The triangles, segments and points of an object in world coordinates."""
+        matrix = np.array(obj.worldtransformation.matrix, dtype=np.float64)
+
+        def read(name):
+            data = getattr(obj, f"_{name}_data", None)
+            if data is None:
+                data = getattr(obj, f"_read_{name}_data")()
+            if not data or not len(data[0]):
+                return np.zeros((0, 3)), np.zeros((0,), dtype=np.int64)
+            positions = as_point_array(data[0], dtype=np.float64).reshape(-1, 3)
+            positions = positions @ matrix[:3, :3].T + matrix[:3, 3]
+            return positions, np.array(data[2], dtype=np.int64)
+
+        positions, elements = read("frontfaces")
+        triangles = positions[elements.reshape(-1, 3)] if len(elements) else np.zeros((0, 3, 3))
+        positions, elements = read("lines")
+        segments = positions[elements.reshape(-1, 2)] if len(elements) else np.zeros((0, 2, 3))
+        positions, elements = read("points")
+        points = positions[elements.reshape(-1)] if len(elements) else np.zeros((0, 3))
+        return {"triangles": triangles, "segments": segments, "points": points}
+
+    def cast(
+        self,
+        origin,
+        direction,
+        pixelsize: float = 0.0,
+        pixelslope: float = 0.0,
+        radius: float = 0.0,
+        faces: bool = True,
+    ) -> tuple[Optional["ViewerSceneObject"], Optional[Point]]:
+        """Find the first visible object hit by a ray.
+
+        Faces are hit exactly, and lines and points within half their width on screen.
+        If nothing is hit, lines and points within a radius around where they are drawn are considered,
+        so that thin lines and small points are easy to pick.
+
+        Parameters
+        ----------
+        origin : array_like
+            The origin of the ray.
+        direction : array_like
+            The direction of the ray.
+        pixelsize : float, optional
+            The size of a pixel on screen in world units, for parallel views.
+        pixelslope : float, optional
+            The size of a pixel on screen per unit of distance from the origin, for perspective views.
+        radius : float, optional
+            The distance in pixels around lines and points within which they are hit if nothing else is.
+        faces : bool, optional
+            Whether faces can be hit, e.g. False in wireframe mode.
+
+        Returns
+        -------
+        tuple[:class:`compas_viewer.scene.ViewerSceneObject` | None, :class:`compas.geometry.Point` | None]
+            The object and the hit point, or None and None if nothing is hit.
+        """
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        direction = direction / np.linalg.norm(direction)
+
+        # The best hit as [ray parameter, object, point], on screen and within the radius
+        exact = [np.inf, None, None]
+        near = [np.inf, None, None]
+
+        def update(best, t, points, obj, mask=None):
+            if mask is not None:
+                t = np.where(mask, t, np.inf)
+            i = int(np.argmin(t))
+            # Lines and points are drawn on top of the faces they lie on
+            if np.isfinite(t[i]) and t[i] <= best[0] * (1 + 1e-6):
+                best[:] = t[i], obj, points[i]
+
+        reach = radius + max([max(obj.pointsize, getattr(obj, "linewidth", 1.0)) / 2 for obj in self.objects], default=0.0)
+        items, tnear = self.bvh.intersect_ray(origin, direction, pixelsize * reach, pixelslope * reach)
+        for index, t_enter in zip(items, tnear):
+            # Candidates are sorted, no later box can contain a closer hit
+            if t_enter > exact[0]:
+                break
+            obj = self.objects[index]
+            if not is_visible(obj):
+                continue
+            geometry = self._geometry[index]
+
+            if faces and obj.show_faces and len(geometry["triangles"]):
+                t = intersect_ray_triangles(origin, direction, geometry["triangles"])
+                i = int(np.argmin(t))
+                if t[i] < exact[0]:
+                    exact[:] = t[i], obj, origin + t[i] * direction
+
+            if obj.show_lines and len(geometry["segments"]):
+                s, points, distances = closest_ray_segments(origin, direction, geometry["segments"])
+                pixels = distances / (pixelsize + pixelslope * s)
+                halfwidth = getattr(obj, "linewidth", 1.0) / 2
+                update(exact, s, points, obj, pixels <= halfwidth)
+                update(near, s, points, obj, pixels <= halfwidth + radius)
+
+            if obj.show_points and len(geometry["points"]):
+                s, distances = closest_ray_points(origin, direction, geometry["points"])
+                pixels = distances / (pixelsize + pixelslope * s)
+                update(exact, s, geometry["points"], obj, pixels <= obj.pointsize / 2)
+                update(near, s, geometry["points"], obj, pixels <= obj.pointsize / 2 + radius)
+
+        _, obj, point = exact if exact[1] is not None else near
+        if obj is None:
+            return None, None
+        return obj, Point(*point.tolist())
+
+
+def is_visible(obj: "ViewerSceneObject") -> bool:
+    """Whether an object and all its parents are shown."""
+    while obj is not None:
+        if not getattr(obj, "show", True):
+            return False
+        obj = getattr(obj, "parent", None)
+    return True
@@ -1,5 +1,11 @@
 import time
+from math import radians
+from math import tan
 from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Literal
+from typing import Optional
 
 import numpy as np
 from numpy import float32
@@ -18,20 +24,29 @@ from PySide6.QtOpenGLWidgets import QOpenGLWidget
 from PySide6.QtWidgets import QGestureEvent
 
 from compas.geometry import Frame
+from compas.geometry import Point
 from compas.geometry import transform_points_numpy
 from compas.scene import Group
 from compas_viewer.base import Base
-from compas_viewer.gl import OffscreenBufferContext
+from compas_viewer.gl import FrameBuffer
+from compas_viewer.gl import PixelBuffer
+from compas_viewer.scene import OctreePointcloudObject
 from compas_viewer.scene import TagObject
 from compas_viewer.scene.buffermanager import BufferManager
 from compas_viewer.scene.gridobject import GridObject
 
 from .camera import Camera
+from .occlusion import OcclusionCuller
+from .raycaster import RayCaster
+from .renderpass import RenderPass
+from .renderpass import RenderState
+from .renderpass import default_passes
 from .shaders import Shader
 
 if TYPE_CHECKING:
     from compas_viewer.scene.gridobject import GridObject
     from compas_viewer.scene.meshobject import MeshObject
+    from compas_viewer.scene.sceneobject import ViewerSceneObject
 
 
 class Renderer(QOpenGLWidget, Base):
@@ -53,6 +68,17 @@ class Renderer(QOpenGLWidget, Base):
 
     # Enhance pixel  width for selection.
     PIXEL_SELECTION_INCREMENTAL = 2
+    PICK_RADIUS = 3
+
+    # The time after the last change of the camera during which it counts as moving, in seconds.
+    MOTION_TIME = 0.25
+
+    # The buffers drawn to pick vertices, edges or faces.
+    SUBOBJECT_BUFFERS = {
+        "vertex": ["_points_data"],
+        "edge": ["_lines_data"],
+        "face": ["_frontfaces_data", "_backfaces_data"],
+    }
 
     def __init__(self):
         format = QSurfaceFormat()
@@ -97,6 +123,25 @@ class Renderer(QOpenGLWidget, Base):
         self.setAcceptDrops(True)
 
         self.buffer_manager = BufferManager()
+        self.pick_buffer: Optional[FrameBuffer] = None
+        self._instance_map = None
+        self._instance_map_key = None
+        self._subobject_map = None
+        self._subobject_map_key = None
+        self._subobject_ranges: list[tuple[int, "ViewerSceneObject", Optional[np.ndarray]]] = []
+        self._subobject_starts = np.zeros(0, dtype=np.int64)
+        self._readbacks: list[tuple[PixelBuffer, Callable]] = []
+        self._culling_key = None
+        self._motion_version = None
+        self._motion_time = 0.0
+        self._lod_key = None
+        self._pixel_buffers: list[PixelBuffer] = []
+        self.hovered: Optional["ViewerSceneObject"] = None
+        self.raycaster = RayCaster()
+        self.occlusion = OcclusionCuller()
+
+        self.renderstate = RenderState()
+        self.passes: list[RenderPass] = default_passes()
 
         self.set_idle_refresh()
 
@@ -265,18 +310,27 @@ class Renderer(QOpenGLWidget, Base):
         """
         GL.glViewport(0, 0, w, h)
         self.resize(w, h)
+        if self.pick_buffer:
+            self.pick_buffer.resize(*self.pick_buffer_size)
 
     def paintGL(self, is_instance: bool = False):
-        """Paint the OpenGL canvas."""
+        """Paint the OpenGL canvas.
+
+        Parameters
+        ----------
+        is_instance : bool, optional
+            Paint the instance map into the currently bound framebuffer, using its viewport.
+        """
         self.clear()
 
-        if is_instance or self.rendermode == "instance":
-            GL.glViewport(0, 0, self.width(), self.height())  # Use unscaled viewport for FBO
+        if is_instance:
             self.paint(is_instance=True)
         else:
+            # Callbacks of readbacks can change the selection and the scene, which should not happen while painting an instance map
+            self.resolve_readbacks()
             r = self.devicePixelRatio()
             GL.glViewport(0, 0, int(self.width() * r), int(self.height() * r))  # Normal scaled viewport
-            self.paint()
+            self.paint(is_instance=self.rendermode == "instance")
 
         self._frames += 1
         if time.time() - self._now > 1:
@@ -313,6 +367,8 @@ class Renderer(QOpenGLWidget, Base):
         """
         if self.isActiveWindow() and self.underMouse():
             self.viewer.eventmanager.delegate_mousemove(event)
+            if self.viewer.config.renderer.hoverhighlight and event.buttons() == QtCore.Qt.MouseButton.NoButton:
+                self.hover(event.pos().x(), event.pos().y())
 
     def mousePressEvent(self, event: QMouseEvent):
         """
@@ -510,6 +566,9 @@ class Renderer(QOpenGLWidget, Base):
         # Unbind VAO when setup is complete.
         GL.glBindVertexArray(0)
 
+        # The framebuffer of the instance map is kept alive and only resized with the widget.
+        self.pick_buffer = FrameBuffer(*self.pick_buffer_size, internal_format=GL.GL_R32UI, pixel_format=GL.GL_RED_INTEGER, pixel_type=GL.GL_UNSIGNED_INT)
+
         projection = self.camera.projection(self.viewer.config.window.width, self.viewer.config.window.height)
         viewworld = self.camera.viewworld()
 
@@ -534,6 +593,8 @@ class Renderer(QOpenGLWidget, Base):
         self.shader_lines.uniformBuffer("settingsBuffer", self.buffer_manager.settings_texture, unit=1)
         self.shader_lines.release()
 
+        self.shader_instance = Shader(name="instance")
+
     def rebuild_buffers(self):
         """Rebuild the buffers."""
         GL.glBindVertexArray(self._vao)
@@ -590,6 +651,12 @@ class Renderer(QOpenGLWidget, Base):
         """
         self.update_projection(w, h)
 
+    @property
+    def pick_buffer_size(self) -> tuple[int, int]:
+        """The size of the instance map in device pixels."""
+        r = self.devicePixelRatio()
+        return int(self.width() * r), int(self.height() * r)
+
     def sort_objects_from_viewworld(self, objects: list["MeshObject"], viewworld: list[list[float]]):
         """Sort objects by the distances from their bounding box centers to camera location
 
@@ -621,6 +688,66 @@ class Renderer(QOpenGLWidget, Base):
             transparent_objects, _ = zip(*transparent_objects)
         return opaque_objects + list(transparent_objects)
 
+    # ==========================================================================
+    # passes
+    # ==========================================================================
+
+    def get_pass(self, name: str) -> Optional[RenderPass]:
+        """Get a render pass by name.
+
+        Parameters
+        ----------
+        name : str
+            The name of the pass.
+
+        Returns
+        -------
+        :class:`compas_viewer.renderer.renderpass.RenderPass` | None
+        """
+        for renderpass in self.passes:
+            if renderpass.name == name:
+                return renderpass
+        return None
+
+    def add_pass(self, renderpass: RenderPass, before: Optional[str] = None, after: Optional[str] = None):
+        """Add a render pass to the frame.
+
+        Parameters
+        ----------
+        renderpass : :class:`compas_viewer.renderer.renderpass.RenderPass`
+            The pass to add.
+        before : str, optional
+            The name of the pass to insert the new pass before.
+        after : str, optional
+            The name of the pass to insert the new pass after.
+            If neither `before` nor `after` is given, the pass is executed last.
+        """
+        if before is None and after is None:
+            self.passes.append(renderpass)
+            return
+        reference = self.get_pass(before or after)
+        if reference is None:
+            raise ValueError(f"No render pass named: {before or after}")
+        index = self.passes.index(reference)
+        self.passes.insert(index if before else index + 1, renderpass)
+
+    def remove_pass(self, name: str):
+        """Remove a render pass from the frame.
+
+        Parameters
+        ----------
+        name : str
+            The name of the pass.
+        """
+        renderpass = self.get_pass(name)
+        if renderpass is not None:
+            self.passes.remove(renderpass)
+
+    @property
+    def timings(self) -> dict[str, float]:
+        """The time spent in each pass during the last frame, in milliseconds."""
+        return {renderpass.name: renderpass.time for renderpass in self.passes}
+
     def paint(self, is_instance: bool = False):
         """Paint all the items in the render"""
 
@@ -632,6 +759,8 @@ class Renderer(QOpenGLWidget, Base):
 
         # Update object settings (visibility, selection, etc.)
         self.buffer_manager.update_settings()
+        self.update_culling()
+        self.update_lods()
 
         # Update uniforms for both shaders
         for shader in [self.shader_model, self.shader_lines]:
@@ -648,53 +777,80 @@ class Renderer(QOpenGLWidget, Base):
         self.shader_lines.uniform2f("viewport", (self.width(), self.height()))
         self.shader_lines.release()
 
-        # Draw the grid (skip during instance rendering since grid doesn't have instance colors)
-        if self.viewer.config.renderer.show_grid and not is_instance:
-            self.shader_model.bind()
-            self.grid.draw(self.shader_model)
-            self.shader_model.release()
+        self.renderstate.reset(blend=not is_instance)
+        for renderpass in self.passes:
+            renderpass.execute(self, is_instance=is_instance)
+        self.renderstate.reset(blend=not is_instance)
 
-        # Draw all the objects in the buffer manager
-        self.buffer_manager.draw(
-            self.shader_model,
-            self.shader_lines,
-            self.rendermode,
-            is_instance=is_instance,
-        )
+        # Unbind once we're done
+        GL.glBindVertexArray(0)
 
-        # Draw text tag sprites if there are any
-        tag_objs = [obj for obj in self.viewer.scene.objects if isinstance(obj, TagObject)]
-        if tag_objs:
-            # release the model shader and bind the tag shader
-            self.shader_tag.bind()
-            self.shader_tag.uniform4x4("viewworld", viewworld)
-            for obj in tag_objs:
-                obj.draw(self.shader_tag, self.camera.position, self.width(), self.height())
-            self.shader_tag.release()
-
-        # draw 2D box for multi-selection
-        if self.viewer.mouse.is_tracing_a_window:
-            # Ensure the model shader is bound before drawing
-            self.shader_model.bind()
+    def update_culling(self):
+        """Only draw the objects in the view frustum of the camera, and not hidden behind opaque faces.
 
-            # Draw the selection box
-            self.shader_model.draw_2d_box(
-                (
-                    self.viewer.mouse.window_start_point.x(),
-                    self.viewer.mouse.window_start_point.y(),
-                    self.viewer.mouse.last_pos.x(),
-                    self.viewer.mouse.last_pos.y(),
-                ),
-                self.width(),
-                self.height(),
-            )
-            self.shader_model.release()
+        The objects are only culled again when the camera, the buffers or the size of the view changed,
+        or when the results of the occlusion queries of an earlier frame arrived, so a static view does not pay for it.
+        If ``frustumculling`` is disabled in the renderer config, all objects are drawn.
+        Occlusion culling is only done if ``occlusionculling`` is enabled as well, in shaded and lighted mode.
+        See :class:`compas_viewer.renderer.occlusion.OcclusionCuller`.
 
-        # Unbind once we're done
-        GL.glBindVertexArray(0)
+        Objects whose bounding boxes are smaller on screen than ``smallfeaturepixels`` are left out
+        if ``smallfeatureculling`` is ``"always"``, or while the camera moves if it is ``"motion"``.
+        The camera counts as moving until :attr:`MOTION_TIME` seconds after its last change,
+        and the idle refresh draws the small objects again after that.
+        If ``smallfeatureselected`` is enabled, selected objects are always drawn.
 
-    def read_instance_color(self, box: tuple[int, int, int, int]):
-        """Read instance colors from the specified screen region.
+        The numbers of culled objects are stored in :attr:`BufferManager.culled`.
+        """
+        config = self.viewer.config.renderer
+        culling = config.frustumculling
+        occlusion = culling and config.occlusionculling and self.rendermode in ("shaded", "lighted")
+        if occlusion:
+            self.occlusion.collect()
+        elif self.occlusion.bvh is not None:
+            self.occlusion.reset()
+
+        if self.camera.version != self._motion_version:
+            self._motion_version = self.camera.version
+            self._motion_time = time.perf_counter()
+        moving = time.perf_counter() - self._motion_time < self.MOTION_TIME
+        smallfeatures = culling and (config.smallfeatureculling == "always" or (config.smallfeatureculling == "motion" and moving))
+        selected = self.buffer_manager.selected() if smallfeatures and config.smallfeatureselected else None
+
+        key = (culling, occlusion, self.occlusion.version, self.camera.version, self.buffer_manager.version, self.view, self.width(), self.height())
+        key += (smallfeatures, config.smallfeaturepixels, np.flatnonzero(selected).tobytes() if selected is not None else None)
+        if key == self._culling_key:
+            return
+        self._culling_key = key
+        if not culling:
+            self.buffer_manager.cull(None)
+            return
+        hidden = self.occlusion.cull(self.buffer_manager.bvh, self.camera, self.width(), self.height()) if occlusion else None
+        small = None
+        if smallfeatures:
+            small = self.camera.projected_size(self.buffer_manager.bvh.boxes, self.width(), self.height()) < config.smallfeaturepixels
+            if selected is not None:
+                small &= ~selected
+        self.buffer_manager.cull(self.camera.frustum_planes(self.width(), self.height()), hidden, small)
+
+    def update_lods(self):
+        """Choose the level of detail of the objects that have them, from their size on screen.
+
+        The levels are only chosen again when the camera, the buffers or the size of the view changed.
+        See :meth:`compas_viewer.scene.buffermanager.BufferManager.update_lods`.
+        """
+        if not self.buffer_manager.lod_resolutions:
+            return
+        config = self.viewer.config.renderer
+        key = (config.lodpixels, config.lodhysteresis, self.camera.version, self.buffer_manager.version, self.view, self.width(), self.height())
+        if key == self._lod_key:
+            return
+        self._lod_key = key
+        sizes = self.camera.projected_size(self.buffer_manager.bvh.boxes, self.width(), self.height())
+        self.buffer_manager.update_lods(sizes, config.lodpixels, config.lodhysteresis)
+
+    def read_instance_ids(self, box: tuple[int, int, int, int]):
+        """Read the object IDs in a region of the screen from the instance map.
 
         Parameters
         ----------
@@ -704,54 +860,450 @@ class Renderer(QOpenGLWidget, Base):
         Returns
         -------
         numpy.ndarray
-            Array of RGB color values for each pixel in the selection area.
+            Array of the IDs of each pixel in the selection area, with 0 for the background.
+            Use :meth:`compas_viewer.scene.InstanceIdAllocator.lookup` to find the objects.
+        """
+        x, y, width, height = self._selection_area(box)
+
+        ids = self.instance_map()[y : y + height, x : x + width]
+
+        # Debug output if enabled
+        if self.viewer.config.renderer.debug_instance:
+            self._save_debug_images(box, x, y, width, height)
+
+        return ids.reshape(-1)
+
+    def request_instance_ids(self, box: tuple[int, int, int, int], callback: Callable[[np.ndarray], Any]):
+        """Read the object IDs in a region of the screen without waiting for the GPU.
+
+        If the cached instance map is still valid, the IDs are looked up in it and the callback is called immediately.
+        Otherwise the IDs of the region are rendered, and copied into a pixel buffer object
+        that is only mapped when the copy is complete, at the earliest in the next frame.
+        The callback is then called from :meth:`paintGL`.
+
+        Parameters
+        ----------
+        box : tuple[int, int, int, int]
+            Screen coordinates (x1, y1, x2, y2) defining the selection area.
+        callback : Callable[[numpy.ndarray], Any]
+            Function called with the sorted unique IDs in the area, without the background.
+            Use :meth:`compas_viewer.scene.InstanceIdAllocator.lookup` to find the objects.
+        """
+        x, y, width, height = self._selection_area(box)
+
+        self.buffer_manager.update_settings()
+        if self._instance_map is not None and self._instance_map_key == self.instance_map_key:
+            callback(self._unique_ids(self._instance_map[y : y + height, x : x + width]))
+            return
+
+        if self.viewer.config.renderer.debug_instance:
+            self._save_debug_images(box, x, y, width, height)
+
+        pixel_buffer = self._pixel_buffers.pop() if self._pixel_buffers else PixelBuffer()
+        with self.pick_buffer:
+            GL.glEnable(GL.GL_SCISSOR_TEST)
+            GL.glScissor(x, y, width, height)
+            self._clear_ids()
+            self._paint_ids(self.camera.projection(self.width(), self.height()))
+            GL.glDisable(GL.GL_SCISSOR_TEST)
+            pixel_buffer.read(x, y, width, height, GL.GL_RED_INTEGER, GL.GL_UNSIGNED_INT)
+        GL.glFlush()
+        self._readbacks.append((pixel_buffer, callback))
+        self.update()
+
+    def resolve_readbacks(self):
+        """Call the callbacks of the requests of :meth:`request_instance_ids` whose pixels have arrived.
+
+        Requests whose pixels are not complete yet are kept for a later frame.
+        """
+        pending = []
+        for pixel_buffer, callback in self._readbacks:
+            if not pixel_buffer.ready():
+                pending.append((pixel_buffer, callback))
+                continue
+            ids = pixel_buffer.resolve(self._unique_ids)
+            self._pixel_buffers.append(pixel_buffer)
+            callback(ids)
+        self._readbacks = pending
+        if pending:
+            self.update()
+
+    @staticmethod
+    def _unique_ids(ids):
+        """The sorted unique IDs of an array of IDs, without the background."""
+        ids = np.unique(ids)
+        return ids[ids != 0]
+
+    def pick(self, x: int, y: int) -> Optional["ViewerSceneObject"]:
+        """Pick the object under a point of the screen.
+
+        If the cached instance map is still valid, the object is looked up in it.
+        Otherwise only a window of :attr:`PICK_RADIUS` pixels around the point is rasterized,
+        using a pick matrix that narrows the view frustum to it, a scissor rectangle,
+        and a minimal shader that writes nothing but the object IDs.
+        Of the objects in the window, the one closest to the point is returned,
+        so that thin lines and small points are easy to hit.
+
+        Parameters
+        ----------
+        x : int
+            The x coordinate of the point on the screen.
+        y : int
+            The y coordinate of the point on the screen.
+
+        Returns
+        -------
+        :class:`compas_viewer.scene.ViewerSceneObject` | None
+            The picked object, or None if there is no object near the point.
+
+        Notes
+        -----
+        If ``pickbackend`` is ``"cpu"`` in the renderer config, :meth:`raycast` is used instead.
+
+        """
+        if self.viewer.config.renderer.pickbackend == "cpu":
+            return self.raycast(x, y)[0]
+
+        left, bottom, size = self._pick_window(x, y)
+
+        self.buffer_manager.update_settings()
+        if self._instance_map is not None and self._instance_map_key == self.instance_map_key:
+            return self._nearest_instance(self._crop_instance_map(left, bottom, size), left, bottom)
+
+        viewport_width, viewport_height = self.pick_buffer.width, self.pick_buffer.height
+        projection = self.camera.pick_matrix(left, bottom, size, size, viewport_width, viewport_height) @ self.camera.projection(self.width(), self.height())
+
+        with self.pick_buffer:
+            GL.glViewport(0, 0, size, size)
+            GL.glEnable(GL.GL_SCISSOR_TEST)
+            GL.glScissor(0, 0, size, size)
+            self._clear_ids()
+            self._paint_ids(projection)
+            GL.glDisable(GL.GL_SCISSOR_TEST)
+            ids = self._read_ids(0, 0, size, size)
+
+        return self._nearest_instance(ids, left, bottom)
+
+    def hover(self, x: int, y: int) -> Optional["ViewerSceneObject"]:
+        """Highlight the object under a point of the screen.
+
+        The object is looked up in the cached instance map,
+        which is only rendered again when the camera, the buffers or the visibility of the objects changed.
+        Moving the mouse over a static scene therefore does not render anything.
+
+        Parameters
+        ----------
+        x : int
+            The x coordinate of the point on the screen.
+        y : int
+            The y coordinate of the point on the screen.
+
+        Returns
+        -------
+        :class:`compas_viewer.scene.ViewerSceneObject` | None
+            The hovered object, or None if there is no object near the point.
+        """
+        if self.viewer.config.renderer.pickbackend == "cpu":
+            obj = self.raycast(x, y)[0]
+        else:
+            left, bottom, size = self._pick_window(x, y)
+            self.instance_map()
+            obj = self._nearest_instance(self._crop_instance_map(left, bottom, size), left, bottom)
+
+        if obj is not self.hovered:
+            if self.hovered is not None:
+                self.hovered.is_hovered = False
+            if obj is not None:
+                obj.is_hovered = True
+            self.hovered = obj
+            self.update()
+        return obj
+
+    def raycast(self, x: int, y: int) -> tuple[Optional["ViewerSceneObject"], Optional[Point]]:
+        """Pick the object under a point of the screen by casting a ray on the CPU.
+
+        The ray is cast from the camera against a bounding volume hierarchy of the objects,
+        and then against the triangles of the candidates, nearest first.
+        Lines and points are hit where they are drawn, or within :attr:`PICK_RADIUS` pixels if nothing else is.
+        This does not need an OpenGL context, and also returns the hit point.
+        The hierarchy is rebuilt when the objects or the buffers changed.
+
+        Parameters
+        ----------
+        x : int
+            The x coordinate of the point on the screen.
+        y : int
+            The y coordinate of the point on the screen.
+
+        Returns
+        -------
+        tuple[:class:`compas_viewer.scene.ViewerSceneObject` | None, :class:`compas.geometry.Point` | None]
+            The picked object and the point where it is hit, or None and None.
+        """
+        objects = [obj for obj in self.viewer.scene.objects if not isinstance(obj, (Group, TagObject))]
+        key = (self.buffer_manager.version, tuple(id(obj) for obj in objects))
+        if self.raycaster.key != key:
+            self.raycaster.build(objects, key=key)
+
+        width, height = self.width(), self.height()
+        origin, direction = self.camera.ray(x, y, width, height)
+
+        # The size of a pixel, at the target for parallel views and per unit of depth in perspective
+        if self.view == "perspective":
+            pixelsize = 0.0
+            pixelslope = 2 * tan(radians(self.camera.fov) / 2) / height
+        else:
+            pixelsize = 2 * self.camera.distance / width
+            pixelslope = 0.0
+
+        return self.raycaster.cast(origin, direction, pixelsize, pixelslope, radius=self.PICK_RADIUS, faces=self.rendermode != "wireframe")
+
+    @property
+    def instance_map_key(self) -> tuple:
+        """The state the instance map depends on, including the objects that are culled."""
+        manager = self.buffer_manager
+        return (self.camera.version, manager.version, manager.culling_version, self.rendermode, self.view, self.pick_buffer.width, self.pick_buffer.height)
+
+    def instance_map(self):
+        """The object IDs of the full viewport, rendered with the instance shader.
+
+        The map is cached, and only rendered again when :attr:`instance_map_key` changed.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape (height, width) in device pixels, starting from the bottom of the screen,
+            with 0 for the background.
+        """
+        self.buffer_manager.update_settings()
+        key = self.instance_map_key
+        if self._instance_map is None or self._instance_map_key != key:
+            with self.pick_buffer:
+                self._clear_ids()
+                self._paint_ids(self.camera.projection(self.width(), self.height()))
+                self._instance_map = self._read_ids(0, 0, self.pick_buffer.width, self.pick_buffer.height)
+            self._instance_map_key = key
+        return self._instance_map
+
+    def subobject_map(self, mode: Literal["vertex", "edge", "face"]):
+        """The IDs of the vertices, edges or faces of the full viewport, rendered with the instance shader.
+
+        Each object is drawn separately, and its primitives are numbered from the ID of its first one,
+        which the shader adds to ``gl_PrimitiveID``.
+        Vertices and edges are hidden by the faces in front of them, but the faces themselves are not numbered.
+        Vertices and edges can be picked even if the points and lines of the object are not shown.
+        The map is cached like :meth:`instance_map`, per mode.
+
+        Parameters
+        ----------
+        mode : Literal["vertex", "edge", "face"]
+            The type of primitive.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape (height, width) in device pixels, starting from the bottom of the screen,
+            with 0 for the background.
+            Use :meth:`read_subobjects` or :meth:`pick_subobject` to find the keys of the vertices, edges or faces.
         """
-        # Calculate selection area
+        self.buffer_manager.update_settings()
+        key = self.instance_map_key + (mode,)
+        if self._subobject_map is None or self._subobject_map_key != key:
+            with self.pick_buffer:
+                self._clear_ids()
+                self._subobject_ranges = self._paint_primitive_ids(self.camera.projection(self.width(), self.height()), mode)
+                self._subobject_map = self._read_ids(0, 0, self.pick_buffer.width, self.pick_buffer.height)
+            self._subobject_starts = np.array([base for base, _, _ in self._subobject_ranges], dtype=np.int64)
+            self._subobject_map_key = key
+        return self._subobject_map
+
+    def pick_subobject(self, x: int, y: int, mode: Literal["vertex", "edge", "face"]) -> tuple[Optional["ViewerSceneObject"], Any]:
+        """Pick the vertex, edge or face under a point of the screen.
+
+        Parameters
+        ----------
+        x : int
+            The x coordinate of the point on the screen.
+        y : int
+            The y coordinate of the point on the screen.
+        mode : Literal["vertex", "edge", "face"]
+            The type of primitive.
+
+        Returns
+        -------
+        tuple[:class:`compas_viewer.scene.ViewerSceneObject` | None, Any]
+            The object and the key of its vertex, edge or face closest to the point, or None and None.
+        """
+        left, bottom, size = self._pick_window(x, y)
+        ids = self._crop_instance_map(left, bottom, size, self.subobject_map(mode))
+        primitive = self._nearest_id(ids, left, bottom)
+        if not primitive:
+            return None, None
+        for obj, keys in self._lookup_subobjects(np.array([primitive]), mode).items():
+            return obj, keys[0]
+        return None, None
+
+    def read_subobjects(self, box: tuple[int, int, int, int], mode: Literal["vertex", "edge", "face"]) -> dict["ViewerSceneObject", list]:
+        """Find the vertices, edges or faces visible in a region of the screen.
+
+        Parameters
+        ----------
+        box : tuple[int, int, int, int]
+            Screen coordinates (x1, y1, x2, y2) defining the selection area.
+        mode : Literal["vertex", "edge", "face"]
+            The type of primitive.
+
+        Returns
+        -------
+        dict[:class:`compas_viewer.scene.ViewerSceneObject`, list]
+            The keys of the vertices, edges or faces in the area, per object.
+        """
+        x, y, width, height = self._selection_area(box)
+        return self._lookup_subobjects(self.subobject_map(mode)[y : y + height, x : x + width], mode)
+
+    def _lookup_subobjects(self, ids, mode: Literal["vertex", "edge", "face"]) -> dict["ViewerSceneObject", list]:
+        """Map primitive IDs of the cached sub-object map to the keys of the vertices, edges or faces of the objects."""
+        ids = np.unique(ids)
+        ids = ids[ids != 0].astype(np.int64)
+        if not len(ids):
+            return {}
+        # The IDs are sorted, so the primitives of each range are consecutive
+        ranges = np.searchsorted(self._subobject_starts, ids, side="right") - 1
+        splits = np.flatnonzero(np.diff(ranges)) + 1
+        result: dict["ViewerSceneObject", dict] = {}
+        for group, index in zip(np.split(ids, splits), ranges[np.r_[0, splits]]):
+            base, obj, primitives = self._subobject_ranges[index]
+            indices = group - base
+            if primitives is not None:
+                indices = primitives[indices]
+            # Several triangles can belong to the same face, and several ranges to the same object
+            result.setdefault(obj, {}).update(dict.fromkeys(obj.subobject_keys(mode, indices)))
+        return {obj: list(keys) for obj, keys in result.items()}
+
+    def _selection_area(self, box: tuple[int, int, int, int]) -> tuple[int, int, int, int]:
+        """The left and bottom edge, width and height of a selection box, in device pixels."""
+        r = self.devicePixelRatio()
         x1, y1, x2, y2 = box
-        x, y = min(x1, x2), self.height() - max(y1, y2)
-        width = max(self.PIXEL_SELECTION_INCREMENTAL, abs(x1 - x2))
-        height = max(self.PIXEL_SELECTION_INCREMENTAL, abs(y1 - y2))
+        left = int(min(x1, x2) * r)
+        bottom = self.pick_buffer.height - int(max(y1, y2) * r)
+        right = left + max(self.PIXEL_SELECTION_INCREMENTAL, int(abs(x1 - x2) * r))
+        top = bottom + max(self.PIXEL_SELECTION_INCREMENTAL, int(abs(y1 - y2) * r))
+        # The parts of the box outside of the view are cut off
+        left, right = (min(max(value, 0), self.pick_buffer.width) for value in (left, right))
+        bottom, top = (min(max(value, 0), self.pick_buffer.height) for value in (bottom, top))
+        return left, bottom, right - left, top - bottom
+
+    def _pick_window(self, x: int, y: int) -> tuple[int, int, int]:
+        """The left and bottom edge and the size of the window around a point, in device pixels."""
+        r = self.devicePixelRatio()
+        radius = self.PICK_RADIUS
+        left = int(x * r) - radius
+        bottom = self.pick_buffer.height - 1 - int(y * r) - radius
+        return left, bottom, 2 * radius + 1
+
+    def _crop_instance_map(self, left: int, bottom: int, size: int, ids_map=None):
+        """Copy a window of the cached instance map, or of another map of IDs, with zeros outside of the screen."""
+        ids_map = self._instance_map if ids_map is None else ids_map
+        ids = np.zeros((size, size), dtype=np.uint32)
+        height, width = ids_map.shape[:2]
+        x0, y0 = max(left, 0), max(bottom, 0)
+        x1, y1 = min(left + size, width), min(bottom + size, height)
+        if x0 < x1 and y0 < y1:
+            ids[y0 - bottom : y1 - bottom, x0 - left : x1 - left] = ids_map[y0:y1, x0:x1]
+        return ids
+
+    def _nearest_instance(self, ids, left: int, bottom: int) -> Optional["ViewerSceneObject"]:
+        """Find the object closest to the center of a window of object IDs."""
+        instance_id = self._nearest_id(ids, left, bottom)
+        return self.viewer.scene.instances[instance_id] if instance_id else None
+
+    def _nearest_id(self, ids, left: int, bottom: int) -> int:
+        """Find the ID closest to the center of a window of IDs, or 0 if there is none."""
+        size = ids.shape[0]
+        radius = size // 2
+        # Ignore the part of the window outside of the screen.
+        rows, columns = np.mgrid[bottom : bottom + size, left : left + size]
+        hits = (ids != 0) & (columns >= 0) & (columns < self.pick_buffer.width) & (rows >= 0) & (rows < self.pick_buffer.height)
+        if not hits.any():
+            return 0
+        distances = (rows - bottom - radius) ** 2 + (columns - left - radius) ** 2
+        distances[~hits] = size**2
+        row, column = np.unravel_index(np.argmin(distances), distances.shape)
+        return int(ids[row, column])
+
+    def _bind_instance_shader(self, projection: list[list[float]]) -> Shader:
+        """Bind the instance shader and set the uniforms shared by all its draw calls."""
+        self.update_culling()
+        self.update_lods()
+        GL.glBindVertexArray(self._vao)
+
+        shader = self.shader_instance
+        shader.bind()
+        shader.uniform4x4("projection", projection)
+        shader.uniform4x4("viewworld", self.camera.viewworld())
+        shader.uniformBuffer("transformBuffer", self.buffer_manager.transform_texture, unit=0)
+        shader.uniformBuffer("settingsBuffer", self.buffer_manager.settings_texture, unit=1)
+        shader.uniform1i("is_primitive", False)
+        return shader
+
+    def _paint_ids(self, projection: list[list[float]]):
+        """Draw the object IDs of the faces, points and lines with the instance shader."""
+        shader = self._bind_instance_shader(projection)
+
+        self.renderstate.reset(blend=False)
+        if self.rendermode != "wireframe" and self.buffer_manager.has_faces:
+            self.renderstate.apply({"polygon_offset_fill": True})
+            self.buffer_manager.draw_faces(shader, is_instance=True)
+        if self.buffer_manager.has_points:
+            self.renderstate.apply({})
+            self.buffer_manager.draw_points(shader)
+        for obj in self.viewer.scene.objects:
+            if isinstance(obj, OctreePointcloudObject) and obj.show:
+                self.renderstate.apply({})
+                obj.draw(shader)
+        if self.buffer_manager.has_lines:
+            self.renderstate.apply({"cull_face": False})
+            self.buffer_manager.draw_lines(shader)
+        self.renderstate.reset()
+
+        shader.release()
+        GL.glBindVertexArray(0)
 
-        # Render to offscreen buffer and read pixels
-        with OffscreenBufferContext(self.width(), self.height()) as fbo_context:
-            self._render_instance_map()
-            pixels = self._read_pixels(x, y, width, height)
+    def _paint_primitive_ids(self, projection: list[list[float]], mode: Literal["vertex", "edge", "face"]) -> list[tuple[int, "ViewerSceneObject", Optional[np.ndarray]]]:
+        """Draw the IDs of the vertices, edges or faces with the instance shader, and return the ranges of IDs of the objects."""
+        shader = self._bind_instance_shader(projection)
+
+        self.renderstate.reset(blend=False)
+        if mode != "face" and self.rendermode != "wireframe" and self.buffer_manager.has_faces:
+            # The faces only hide what is behind them
+            self.renderstate.apply({"polygon_offset_fill": True})
+            GL.glColorMask(GL.GL_FALSE, GL.GL_FALSE, GL.GL_FALSE, GL.GL_FALSE)
+            self.buffer_manager.draw_faces(shader, is_instance=True)
+            GL.glColorMask(GL.GL_TRUE, GL.GL_TRUE, GL.GL_TRUE, GL.GL_TRUE)
+
+        self.renderstate.apply({"polygon_offset_fill": mode == "face", "cull_face": mode != "edge"})
+        shader.uniform1i("is_primitive", True)
+        # Do not check whether the points, lines or faces of the objects are shown
+        shader.uniform1i("element_type", -1)
+        ranges = self.buffer_manager.draw_primitives(shader, self.SUBOBJECT_BUFFERS[mode])
+        self.renderstate.reset()
+
+        shader.release()
+        GL.glBindVertexArray(0)
+        return ranges
 
-            # Debug output if enabled
-            if self.viewer.config.renderer.debug_instance:
-                self._save_debug_images(box, x, y, width, height, fbo_context.viewport)
+    def _read_ids(self, x: int, y: int, width: int, height: int):
+        """Read the object IDs from the current framebuffer."""
+        GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, 4)
+        buffer = GL.glReadPixels(x, y, width, height, GL.GL_RED_INTEGER, GL.GL_UNSIGNED_INT)
+        return np.frombuffer(buffer, dtype=np.uint32).reshape(height, width)
 
-        return pixels.reshape(-1, 3)
+    def _clear_ids(self):
+        """Clear the object IDs and the depth of the current framebuffer."""
+        GL.glClearBufferuiv(GL.GL_COLOR, 0, np.zeros(4, dtype=np.uint32))
+        GL.glClear(GL.GL_DEPTH_BUFFER_BIT)
 
-    def _render_instance_map(self):
-        """Render the scene in instance color mode."""
-        # Set up rendering state for instance mode
-        GL.glEnable(GL.GL_DEPTH_TEST)
-        GL.glDepthFunc(GL.GL_LESS)
-        GL.glDepthMask(GL.GL_TRUE)
-        GL.glClearColor(0.0, 0.0, 0.0, 1.0)
-        GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
-
-        # Temporarily disable blending for clean instance colors
-        was_blend_enabled = GL.glIsEnabled(GL.GL_BLEND)
-        GL.glDisable(GL.GL_BLEND)
-
-        try:
-            self.paintGL(is_instance=True)
-            GL.glFlush()
-            GL.glFinish()
-        finally:
-            # Restore blending state
-            if was_blend_enabled:
-                GL.glEnable(GL.GL_BLEND)
-
-    def _read_pixels(self, x: int, y: int, width: int, height: int):
-        """Read pixel data from the current framebuffer."""
-        GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, 1)
-        buffer = GL.glReadPixels(x, y, width, height, GL.GL_RGB, GL.GL_UNSIGNED_BYTE)
-        return np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, 3)
-
-    def _save_debug_images(self, box: tuple[int, int, int, int], x: int, y: int, width: int, height: int, viewport: tuple):
+    def _save_debug_images(self, box: tuple[int, int, int, int], x: int, y: int, width: int, height: int):
         """Save debug images when debugging is enabled."""
 
         from PIL import Image
@@ -759,22 +1311,21 @@ class Renderer(QOpenGLWidget, Base):
 
         x1, y1, x2, y2 = box
 
-        # Read and save full frame
-        GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, 1)
-        full_buffer = GL.glReadPixels(0, 0, self.width(), self.height(), GL.GL_RGBA, GL.GL_UNSIGNED_BYTE)
-        full_map = np.frombuffer(full_buffer, dtype=np.uint8).reshape(self.height(), self.width(), 4)
+        # Display the IDs as colors and save the full map
+        ids = self.instance_map()
+        full_map = np.stack([ids & 255, (ids >> 8) & 255, (ids >> 16) & 255], axis=-1).astype(np.uint8)
         full_image = Image.fromarray(full_map).transpose(Image.FLIP_TOP_BOTTOM)
         full_image.save("instance_debug_full.png")
 
         # Create version with selection box highlighted
         full_with_box = full_image.copy()
         draw = ImageDraw.Draw(full_with_box)
-        draw.rectangle([x1, y1, x2, y2], outline="red", width=2)
+        r = self.devicePixelRatio()
+        draw.rectangle([x1 * r, y1 * r, x2 * r, y2 * r], outline="red", width=2)
         full_with_box.save("instance_debug_full_with_box.png")
 
         # Save selection area
-        box_pixels = self._read_pixels(x, y, width, height)
-        box_image = Image.fromarray(box_pixels).transpose(Image.FLIP_TOP_BOTTOM)
+        box_image = Image.fromarray(full_map[y : y + height, x : x + width]).transpose(Image.FLIP_TOP_BOTTOM)
         box_image.save("instance_debug_box.png")
 
         # Print debug info
@@ -785,4 +1336,4 @@ class Renderer(QOpenGLWidget, Base):
         print(f"Box coordinates: x={x}, y={y}, width={width}, height={height}")
         print(f"Original box: x1={x1}, y1={y1}, x2={x2}, y2={y2}")
         print(f"Window size: {self.width()}x{self.height()}")
-        print(f"Viewport: {viewport}")
+        print(f"Instance map size: {self.pick_buffer.width}x{self.pick_buffer.height}")
@@ -0,0 +1,409 @@
+from time import perf_counter
+from typing import TYPE_CHECKING
+from typing import Optional
+
+from OpenGL import GL
+from PySide6.QtCore import QTimer
+
+from compas_viewer.scene import OctreePointcloudObject
+from compas_viewer.scene import TagObject
+
+if TYPE_CHECKING:
+    from .renderer import Renderer
+
+
+# The OpenGL state set up by :meth:`Renderer.initializeGL`.
+# Render passes only declare where they deviate from it.
+DEFAULT_STATE = {
+    "depth_test": True,
+    "depth_mask": True,
+    "cull_face": True,
+    "blend": True,
+    "polygon_offset_fill": False,
+}
+
+CAPABILITIES = {
+    "depth_test": GL.GL_DEPTH_TEST,
+    "cull_face": GL.GL_CULL_FACE,
+    "blend": GL.GL_BLEND,
+    "polygon_offset_fill": GL.GL_POLYGON_OFFSET_FILL,
+}
+
+
+class RenderState:
+    """Cache of the OpenGL state toggled by the render passes.
+
+    Only the switches that differ from the current state are sent to OpenGL,
+    so consecutive passes with the same requirements do not pay for redundant calls.
+
+    Attributes
+    ----------
+    defaults : dict[str, bool]
+        The state every pass starts from, unless it declares otherwise.
+    current : dict[str, bool]
+        The state as it was last sent to OpenGL.
+    """
+
+    def __init__(self):
+        self.defaults = dict(DEFAULT_STATE)
+        self.current = {}
+
+    def reset(self, **overrides: bool):
+        """Send the full default state to OpenGL, e.g. at the start of a frame.
+
+        Parameters
+        ----------
+        **overrides : bool
+            Values replacing the entries of :attr:`DEFAULT_STATE` until the next reset.
+        """
+        self.defaults = {**DEFAULT_STATE, **overrides}
+        self.current = {}
+        self.apply({})
+
+    def apply(self, state: dict[str, bool]):
+        """Bring OpenGL into the default state with the given deviations.
+
+        Parameters
+        ----------
+        state : dict[str, bool]
+            The required deviations from the defaults.
+        """
+        target = {**self.defaults, **state}
+        for key, value in target.items():
+            if self.current.get(key) == value:
+                continue
+            if key == "depth_mask":
+                GL.glDepthMask(GL.GL_TRUE if value else GL.GL_FALSE)
+            elif value:
+                GL.glEnable(CAPABILITIES[key])
+            else:
+                GL.glDisable(CAPABILITIES[key])
+            self.current[key] = value
+
+
+class RenderPass:
+    """Base class of the steps the renderer executes, in order, to paint a frame.
+
+    Subclasses implement :meth:`draw` and can override :meth:`has_work`
+    to be skipped when there is nothing for them to draw.
+
+    Parameters
+    ----------
+    name : str, optional
+        The name of the pass. Defaults to the class attribute :attr:`name`.
+    enabled : bool, optional
+        Whether the pass is executed. Default is True.
+
+    Attributes
+    ----------
+    name : str
+        The name of the pass, used to look it up in :attr:`Renderer.passes`.
+    enabled : bool
+        Whether the pass is executed.
+    state : dict[str, bool]
+        The OpenGL state the pass requires, as deviations from :data:`DEFAULT_STATE`.
+    instance : bool
+        Whether the pass also runs when the instance map is painted.
+    time : float
+        The time spent in the pass during the last frame, in milliseconds.
+        This is the CPU time needed to submit the commands, not the GPU time.
+
+    Examples
+    --------
+    >>> class DepthPrepass(RenderPass):
+    ...     name = "depth-prepass"
+    ...
+    ...     def draw(self, renderer, is_instance=False):
+    ...         GL.glColorMask(False, False, False, False)
+    ...         renderer.buffer_manager.draw_faces(renderer.shader_model, is_instance)
+    ...         GL.glColorMask(True, True, True, True)
+    >>> renderer.add_pass(DepthPrepass(), before="faces")  # doctest: +SKIP
+
+    """
+
+    name: str = "pass"
+    state: dict[str, bool] = {}
+    instance: bool = True
+
+    def __init__(self, name: Optional[str] = None, enabled: bool = True):
+        if name:
+            self.name = name
+        self.enabled = enabled
+        self.time = 0.0
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {self.name}>"
+
+    def has_work(self, renderer: "Renderer", is_instance: bool = False) -> bool:
+        """Whether there is anything to draw in the current frame.
+
+        Parameters
+        ----------
+        renderer : :class:`compas_viewer.renderer.Renderer`
+            The renderer executing the pass.
+        is_instance : bool, optional
+            Whether the instance map is painted.
+
+        Returns
+        -------
+        bool
+        """
+        return True
+
+    def draw(self, renderer: "Renderer", is_instance: bool = False):
+        """Draw the content of the pass.
+
+        Parameters
+        ----------
+        renderer : :class:`compas_viewer.renderer.Renderer`
+            The renderer executing the pass.
+        is_instance : bool, optional
+            Whether the instance map is painted.
+        """
+        raise NotImplementedError
+
+    def execute(self, renderer: "Renderer", is_instance: bool = False) -> bool:
+        """Set up the required state and draw, unless the pass is disabled or has no work.
+
+        Parameters
+        ----------
+        renderer : :class:`compas_viewer.renderer.Renderer`
+            The renderer executing the pass.
+        is_instance : bool, optional
+            Whether the instance map is painted.
+
+        Returns
+        -------
+        bool
+            True if the pass was executed.
+        """
+        if not self.enabled or (is_instance and not self.instance) or not self.has_work(renderer, is_instance):
+            self.time = 0.0
+            return False
+        start = perf_counter()
+        renderer.renderstate.apply(self.state)
+        self.draw(renderer, is_instance)
+        self.time = (perf_counter() - start) * 1000
+        return True
+
+
+class GridPass(RenderPass):
+    """Draw the world XY grid."""
+
+    name = "grid"
+    instance = False
+
+    def has_work(self, renderer, is_instance=False):
+        return renderer.viewer.config.renderer.show_grid and renderer.grid is not None
+
+    def draw(self, renderer, is_instance=False):
+        renderer.shader_model.bind()
+        renderer.grid.draw(renderer.shader_model)
+        renderer.shader_model.release()
+
+
+class FacesPass(RenderPass):
+    """Draw the opaque faces, or all faces when the instance map is painted."""
+
+    name = "faces"
+    state = {"polygon_offset_fill": True}
+
+    def has_work(self, renderer, is_instance=False):
+        if renderer.rendermode == "wireframe":
+            return False
+        if renderer.rendermode == "ghosted" and not is_instance:
+            return False
+        return renderer.buffer_manager.has_faces
+
+    def draw(self, renderer, is_instance=False):
+        shader = renderer.shader_model
+        shader.bind()
+        shader.uniform1i("is_grid", False)
+        renderer.buffer_manager.draw_faces(shader, is_instance=is_instance, is_lighted=renderer.rendermode == "lighted")
+        shader.release()
+
+
+class OcclusionPass(RenderPass):
+    """Test which parts of the scene are hidden behind the opaque faces, to cull them in the next frames.
+
+    See :class:`compas_viewer.renderer.occlusion.OcclusionCuller`.
+    """
+
+    name = "occlusion"
+    instance = False
+    state = {"depth_mask": False, "cull_face": False, "blend": False}
+
+    # The time until the frame that reads the results, in milliseconds
+    INTERVAL = 15
+
+    def has_work(self, renderer, is_instance=False):
+        occlusion = renderer.occlusion
+        return occlusion.bvh is not None and (occlusion.stale or occlusion.pending)
+
+    def draw(self, renderer, is_instance=False):
+        if not renderer.occlusion.pending:
+            shader = renderer.shader_model
+            shader.bind()
+            renderer.occlusion.query(shader)
+            shader.release()
+        # Another frame is needed to read the results, even if the view does not change
+        if renderer.occlusion.pending:
+            QTimer.singleShot(self.INTERVAL, renderer.update)
+
+
+class PointsPass(RenderPass):
+    """Draw the points of all objects."""
+
+    name = "points"
+
+    def has_work(self, renderer, is_instance=False):
+        return renderer.buffer_manager.has_points
+
+    def draw(self, renderer, is_instance=False):
+        shader = renderer.shader_model
+        shader.bind()
+        shader.uniform1i("is_grid", False)
+        shader.uniform1i("is_lighted", renderer.rendermode == "lighted")
+        renderer.buffer_manager.draw_points(shader)
+        shader.release()
+
+
+class PointcloudsPass(RenderPass):
+    """Draw the point clouds that are loaded from octrees on demand, and request new frames while they load."""
+
+    name = "pointclouds"
+
+    # The time between frames while nodes are loading, in milliseconds
+    INTERVAL = 15
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pointclouds: list[OctreePointcloudObject] = []
+
+    def has_work(self, renderer, is_instance=False):
+        self._pointclouds = [obj for obj in renderer.viewer.scene.objects if isinstance(obj, OctreePointcloudObject) and obj.show]
+        return len(self._pointclouds) > 0
+
+    def draw(self, renderer, is_instance=False):
+        pending = False
+        if not is_instance:
+            for obj in self._pointclouds:
+                pending = obj.refine(renderer) or pending
+
+        shader = renderer.shader_model
+        shader.bind()
+        shader.uniform1i("is_grid", False)
+        shader.uniform1i("is_lighted", False)
+        for obj in self._pointclouds:
+            obj.draw(shader)
+        shader.release()
+
+        if pending:
+            QTimer.singleShot(self.INTERVAL, renderer.update)
+
+
+class LinesPass(RenderPass):
+    """Draw the lines of all objects as screen-space quads."""
+
+    name = "lines"
+    state = {"cull_face": False}
+
+    def has_work(self, renderer, is_instance=False):
+        return renderer.buffer_manager.has_lines
+
+    def draw(self, renderer, is_instance=False):
+        shader = renderer.shader_lines
+        shader.bind()
+        shader.uniform1i("is_grid", False)
+        renderer.buffer_manager.draw_lines(shader)
+        shader.release()
+
+
+class TransparentPass(RenderPass):
+    """Draw the transparent faces without writing depth, or all faces in ghosted mode."""
+
+    name = "transparent"
+    state = {"depth_mask": False}
+    instance = False
+
+    def has_work(self, renderer, is_instance=False):
+        if renderer.rendermode == "wireframe":
+            return False
+        if renderer.rendermode == "ghosted":
+            return renderer.buffer_manager.has_faces
+        return renderer.buffer_manager.has_transparent_faces
+
+    def draw(self, renderer, is_instance=False):
+        shader = renderer.shader_model
+        shader.bind()
+        shader.uniform1i("is_grid", False)
+        renderer.buffer_manager.draw_transparent_faces(shader, is_lighted=renderer.rendermode == "lighted", is_ghosted=renderer.rendermode == "ghosted")
+        shader.release()
+
+
+class TagPass(RenderPass):
+    """Draw the text tags."""
+
+    name = "tags"
+    instance = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._tags: list[TagObject] = []
+
+    def has_work(self, renderer, is_instance=False):
+        self._tags = [obj for obj in renderer.viewer.scene.objects if isinstance(obj, TagObject)]
+        return len(self._tags) > 0
+
+    def draw(self, renderer, is_instance=False):
+        shader = renderer.shader_tag
+        shader.bind()
+        shader.uniform4x4("viewworld", renderer.camera.viewworld())
+        for obj in self._tags:
+            obj.draw(shader, renderer.camera.position, renderer.width(), renderer.height())
+        shader.release()
+
+
+class SelectionBoxPass(RenderPass):
+    """Draw the 2D box of a window selection."""
+
+    name = "selectionbox"
+    instance = False
+
+    def has_work(self, renderer, is_instance=False):
+        return renderer.viewer.mouse.is_tracing_a_window
+
+    def draw(self, renderer, is_instance=False):
+        mouse = renderer.viewer.mouse
+        renderer.shader_model.bind()
+        renderer.shader_model.draw_2d_box(
+            (
+                mouse.window_start_point.x(),
+                mouse.window_start_point.y(),
+                mouse.last_pos.x(),
+                mouse.last_pos.y(),
+            ),
+            renderer.width(),
+            renderer.height(),
+        )
+        renderer.shader_model.release()
+
+
+def default_passes() -> list[RenderPass]:
+    """Create the passes of the default frame, in order.
+
+    Returns
+    -------
+    list[:class:`RenderPass`]
+    """
+    return [
+        GridPass(),
+        FacesPass(),
+        OcclusionPass(),
+        PointsPass(),
+        PointcloudsPass(),
+        LinesPass(),
+        TransparentPass(),
+        TagPass(),
+        SelectionBoxPass(),
+    ]
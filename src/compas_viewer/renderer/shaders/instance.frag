@@ -0,0 +1,23 @@
+#version 330 core
+
+// Inputs
+flat in uint instance_id;
+flat in float show;
+
+// Uniforms
+uniform bool is_primitive;
+uniform int primitive_base;
+
+out uint fragId;
+
+void main() {
+    if (show == 0.0) {
+        discard;
+    }
+    // When picking vertices, edges or faces, the ID of the primitive in the draw call is offset by the base of the object
+    if (is_primitive) {
+        fragId = uint(primitive_base + gl_PrimitiveID);
+    } else {
+        fragId = instance_id;
+    }
+}
@@ -0,0 +1,74 @@
+#version 330 core
+
+// Minimal shader for picking: writes the object IDs, without colors, lighting, opacity or line geometry.
+
+// Inputs
+in vec3 position;
+in float object_index;
+
+// Uniforms
+uniform mat4 projection;
+uniform mat4 viewworld;
+uniform samplerBuffer transformBuffer;
+uniform samplerBuffer settingsBuffer;
+uniform int element_type;
+
+// Number of rows of the settings of each object in the settings buffer
+const int SETTINGS_ROWS = 7;
+
+// Outputs
+flat out uint instance_id;
+flat out float show;
+
+float getEffectiveShow(float objectIndex) {
+    float showValue = texelFetch(settingsBuffer, int(objectIndex * SETTINGS_ROWS)).r;
+    float parentIndex = texelFetch(settingsBuffer, int(objectIndex * SETTINGS_ROWS) + 2).r;
+
+    while (parentIndex >= 0.0 && showValue > 0.0) {
+        showValue *= texelFetch(settingsBuffer, int(parentIndex * SETTINGS_ROWS)).r;
+        parentIndex = texelFetch(settingsBuffer, int(parentIndex * SETTINGS_ROWS) + 2).r;
+    }
+    return showValue;
+}
+
+mat4 getEffectiveTransform(float objectIndex) {
+    mat4 transform = transpose(mat4(
+        texelFetch(transformBuffer, int(objectIndex * 4) + 0),
+        texelFetch(transformBuffer, int(objectIndex * 4) + 1),
+        texelFetch(transformBuffer, int(objectIndex * 4) + 2),
+        texelFetch(transformBuffer, int(objectIndex * 4) + 3)
+    ));
+
+    float parentIndex = texelFetch(settingsBuffer, int(objectIndex * SETTINGS_ROWS) + 2).r;
+
+    while (parentIndex >= 0.0) {
+        mat4 parentTransform = transpose(mat4(
+            texelFetch(transformBuffer, int(parentIndex * 4) + 0),
+            texelFetch(transformBuffer, int(parentIndex * 4) + 1),
+            texelFetch(transformBuffer, int(parentIndex * 4) + 2),
+            texelFetch(transformBuffer, int(parentIndex * 4) + 3)
+        ));
+        transform = parentTransform * transform;
+        parentIndex = texelFetch(settingsBuffer, int(parentIndex * SETTINGS_ROWS) + 2).r;
+    }
+
+    return transform;
+}
+
+void main() {
+    vec4 settings_row1 = texelFetch(settingsBuffer, int(object_index * SETTINGS_ROWS));
+    vec4 settings_row2 = texelFetch(settingsBuffer, int(object_index * SETTINGS_ROWS) + 1);
+    vec4 settings_row3 = texelFetch(settingsBuffer, int(object_index * SETTINGS_ROWS) + 2);
+
+    // Visibility of the object and of the element type being drawn
+    show = getEffectiveShow(object_index);
+    if ((element_type == 0 && settings_row1.g == 0.0) ||
+        (element_type == 1 && settings_row1.b == 0.0) ||
+        (element_type == 2 && settings_row1.a == 0.0)) {
+        show = 0.0;
+    }
+    instance_id = uint(settings_row2.r) | (uint(settings_row2.g) << 16);
+
+    gl_Position = projection * viewworld * getEffectiveTransform(object_index) * vec4(position, 1.0);
+    gl_PointSize = settings_row3.b;
+}
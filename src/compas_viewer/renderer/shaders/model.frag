@@ -4,6 +4,7 @@
 in vec4 vertex_color;
 in vec3 ec_pos;
 in float is_selected;
+in float is_hovered;
 in float show;
 in float show_points;
 in float show_lines;
@@ -47,6 +48,8 @@ void main() {
                                  element_type == 1 ? 0.8 : 
                                  1.0);
         alpha = max(alpha, 0.5);
+    } else if (is_hovered > 0.5) {
+        color = mix(color, selection_color, 0.5);
     }
 
     // Draw circular points
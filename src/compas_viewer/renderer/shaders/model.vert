@@ -13,10 +13,14 @@ uniform samplerBuffer settingsBuffer;
 uniform bool is_grid;
 uniform int element_type;
 
+// Number of rows of the settings of each object in the settings buffer
+const int SETTINGS_ROWS = 7;
+
 // Outputs
 out vec4 vertex_color;
 out vec3 ec_pos;
 out float is_selected;
+out float is_hovered;
 out float show;
 out float show_points;
 out float show_lines;
@@ -25,23 +29,23 @@ out vec4 instance_color;
 out float object_opacity;
 
 float getEffectiveShow(float objectIndex) {
-    float showValue = texelFetch(settingsBuffer, int(objectIndex * 3)).r;
-    float parentIndex = texelFetch(settingsBuffer, int(objectIndex * 3) + 2).r;
+    float showValue = texelFetch(settingsBuffer, int(objectIndex * SETTINGS_ROWS)).r;
+    float parentIndex = texelFetch(settingsBuffer, int(objectIndex * SETTINGS_ROWS) + 2).r;
     
     while (parentIndex >= 0.0 && showValue > 0.0) {
-        showValue *= texelFetch(settingsBuffer, int(parentIndex * 3)).r;
-        parentIndex = texelFetch(settingsBuffer, int(parentIndex * 3) + 2).r;
+        showValue *= texelFetch(settingsBuffer, int(parentIndex * SETTINGS_ROWS)).r;
+        parentIndex = texelFetch(settingsBuffer, int(parentIndex * SETTINGS_ROWS) + 2).r;
     }
     return showValue;
 }
 
 float getEffectiveSelection(float objectIndex) {
-    float selectionValue = texelFetch(settingsBuffer, int(objectIndex * 3) + 1).a;
-    float parentIndex = texelFetch(settingsBuffer, int(objectIndex * 3) + 2).r;
+    float selectionValue = texelFetch(settingsBuffer, int(objectIndex * SETTINGS_ROWS) + 1).a;
+    float parentIndex = texelFetch(settingsBuffer, int(objectIndex * SETTINGS_ROWS) + 2).r;
     
     while (parentIndex >= 0.0 && selectionValue == 0.0) {  // Continue until we find a selected parent
-        selectionValue = max(selectionValue, texelFetch(settingsBuffer, int(parentIndex * 3) + 1).a);
-        parentIndex = texelFetch(settingsBuffer, int(parentIndex * 3) + 2).r;
+        selectionValue = max(selectionValue, texelFetch(settingsBuffer, int(parentIndex * SETTINGS_ROWS) + 1).a);
+        parentIndex = texelFetch(settingsBuffer, int(parentIndex * SETTINGS_ROWS) + 2).r;
     }
     return selectionValue;
 }
@@ -54,7 +58,7 @@ mat4 getEffectiveTransform(float objectIndex) {
         texelFetch(transformBuffer, int(objectIndex * 4) + 3)
     ));
     
-    float parentIndex = texelFetch(settingsBuffer, int(objectIndex * 3) + 2).r;
+    float parentIndex = texelFetch(settingsBuffer, int(objectIndex * SETTINGS_ROWS) + 2).r;
     
     while (parentIndex >= 0.0) {
         mat4 parentTransform = transpose(mat4(
@@ -64,7 +68,7 @@ mat4 getEffectiveTransform(float objectIndex) {
             texelFetch(transformBuffer, int(parentIndex * 4) + 3)
         ));
         transform = parentTransform * transform;
-        parentIndex = texelFetch(settingsBuffer, int(parentIndex * 3) + 2).r;
+        parentIndex = texelFetch(settingsBuffer, int(parentIndex * SETTINGS_ROWS) + 2).r;
     }
     
     return transform;
@@ -80,23 +84,33 @@ void main() {
     if (is_grid) {
         show = show_points = show_lines = show_faces = 1.0;
         is_selected = 0.0;
+        is_hovered = 0.0;
         object_opacity = 1.0;
     } else {
-        vec4 settings_row1 = texelFetch(settingsBuffer, int(object_index * 3));
-        vec4 settings_row2 = texelFetch(settingsBuffer, int(object_index * 3) + 1);
-        vec4 settings_row3 = texelFetch(settingsBuffer, int(object_index * 3) + 2);
+        vec4 settings_row1 = texelFetch(settingsBuffer, int(object_index * SETTINGS_ROWS));
+        vec4 settings_row2 = texelFetch(settingsBuffer, int(object_index * SETTINGS_ROWS) + 1);
+        vec4 settings_row3 = texelFetch(settingsBuffer, int(object_index * SETTINGS_ROWS) + 2);
+        vec4 settings_row4 = texelFetch(settingsBuffer, int(object_index * SETTINGS_ROWS) + 3);
         show = getEffectiveShow(object_index);
         show_points = settings_row1.g;
         show_lines = settings_row1.b;
         show_faces = settings_row1.a;
-        instance_color = vec4(settings_row2.rgb, 1.0);
+        // Display the object ID as a color, as written to the instance map
+        uint id = uint(settings_row2.r) | (uint(settings_row2.g) << 16);
+        instance_color = vec4(float(id & 255u), float((id >> 8) & 255u), float((id >> 16) & 255u), 255.0) / 255.0;
         is_selected = getEffectiveSelection(object_index);
+        is_hovered = settings_row4.r;
         object_opacity = settings_row3.g;
         pointSize = settings_row3.b;
     }
 
-    // Calculate final position
+    // Points, lines and faces with a single color take it from the settings of the object
     vertex_color = color;
+    if (!is_grid && element_type >= 0 && element_type <= 2 && texelFetch(settingsBuffer, int(object_index * SETTINGS_ROWS) + 3)[element_type + 1] > 0.0) {
+        vertex_color = texelFetch(settingsBuffer, int(object_index * SETTINGS_ROWS) + 4 + element_type);
+    }
+
+    // Calculate final position
     vec4 worldPos = transform * vec4(position, 1.0);
     
     // Bypass matrix transformations 2D elements
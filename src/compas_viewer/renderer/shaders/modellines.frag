@@ -4,6 +4,7 @@
 in vec4 g_vertex_color;
 in vec3 g_ec_pos;
 in float g_is_selected;
+in float g_is_hovered;
 in float g_show;
 in float g_show_points;
 in float g_show_lines;
@@ -47,6 +48,8 @@ void main() {
                                  element_type == 1 ? 0.8 : 
                                  1.0);
         alpha = max(alpha, 0.5);
+    } else if (g_is_hovered > 0.5) {
+        color = mix(color, selection_color, 0.5);
     }
 
     // Draw circular points
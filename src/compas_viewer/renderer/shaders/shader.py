@@ -1,8 +1,12 @@
+import ctypes
 from pathlib import Path
 from typing import Any
 from typing import Union
 
 from numpy import array
+from numpy import asarray
+from numpy import int32
+from numpy import uintp
 from OpenGL import GL
 
 
@@ -123,12 +127,17 @@ class Shader:
     def enable_attribute(self, name: str):
         """Enable a named attribute in the shader program.
 
+        Attributes that are not used by the program are ignored,
+        so that the same buffers can be drawn with different shaders.
+
         Parameters
         ----------
         name : str
             The name of the attribute.
         """
         location = GL.glGetAttribLocation(self.program, name)
+        if location < 0:
+            return
         GL.glEnableVertexAttribArray(location)
         self.locations[name] = location
 
@@ -144,15 +153,36 @@ class Shader:
         step : int, optional
             The step size of the attribute.
         """
-        location = self.locations[name]
+        location = self.locations.get(name)
+        if location is None:
+            return
         GL.glBindBuffer(GL.GL_ARRAY_BUFFER, value)
         GL.glVertexAttribPointer(location, step, GL.GL_FLOAT, False, 0, None)
 
+    def constant_attribute(self, name: str, value: float):
+        """Give a named attribute the same value for all vertices, instead of reading it from a buffer.
+
+        Parameters
+        ----------
+        name : str
+            The name of the attribute.
+        value : float
+            The value of the attribute.
+        """
+        location = GL.glGetAttribLocation(self.program, name)
+        if location < 0:
+            return
+        GL.glDisableVertexAttribArray(location)
+        GL.glVertexAttrib1f(location, value)
+        self.locations.pop(name, None)
+
     def disable_attribute(self, name: str):
+        if name not in self.locations:
+            return
         GL.glDisableVertexAttribArray(self.locations[name])
         del self.locations[name]
 
-    def draw_triangles(self, elements: Any = None, n: int = 0, background: bool = False):
+    def draw_triangles(self, elements: Any = None, n: int = 0, background: bool = False, first: int = 0):
         """
         Draw triangles.
 
@@ -164,17 +194,19 @@ class Shader:
             The number of elements.
         background : bool, optional
             Draw in background.
+        first : int, optional
+            The index of the first element to draw.
 
         """
         if elements:
             if background:
                 GL.glDisable(GL.GL_DEPTH_TEST)
             GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, elements)
-            GL.glDrawElements(GL.GL_TRIANGLES, n, GL.GL_UNSIGNED_INT, None)
+            GL.glDrawElements(GL.GL_TRIANGLES, n, GL.GL_UNSIGNED_INT, element_offset(first))
         else:
             GL.glDrawArrays(GL.GL_TRIANGLES, 0, GL.GL_BUFFER_SIZE)
 
-    def draw_lines(self, elements: Any = None, n: int = 0, width: float = 1, background: bool = False):
+    def draw_lines(self, elements: Any = None, n: int = 0, width: float = 1, background: bool = False, first: int = 0):
         """
         Draw lines.
 
@@ -188,18 +220,20 @@ class Shader:
             The width of the lines.
         background : bool, optional
             Draw in background.
+        first : int, optional
+            The index of the first element to draw.
         """
         if elements:
             if background:
                 GL.glDisable(GL.GL_DEPTH_TEST)
             GL.glLineWidth(width)
             GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, elements)
-            GL.glDrawElements(GL.GL_LINES, n, GL.GL_UNSIGNED_INT, None)
+            GL.glDrawElements(GL.GL_LINES, n, GL.GL_UNSIGNED_INT, element_offset(first))
             GL.glEnable(GL.GL_DEPTH_TEST)
         else:
             GL.glDrawArrays(GL.GL_LINES, 0, GL.GL_BUFFER_SIZE)
 
-    def draw_points(self, size: float = 1, elements: Any = None, n: int = 0, background: bool = False):
+    def draw_points(self, size: float = 1, elements: Any = None, n: int = 0, background: bool = False, first: int = 0):
         """
         Draw points.
 
@@ -209,20 +243,48 @@ class Shader:
             The size of the points.
         elements : Any, optional
             The buffer elements.
+            If None, ``n`` vertices of the bound vertex buffers are drawn in order.
         n : int, optional
             The number of elements.
         background : bool, optional
             Draw in background.
+        first : int, optional
+            The index of the first element to draw.
         """
         GL.glPointSize(size)
         if elements:
             if background:
                 GL.glDisable(GL.GL_DEPTH_TEST)
             GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, elements)
-            GL.glDrawElements(GL.GL_POINTS, n, GL.GL_UNSIGNED_INT, None)
+            GL.glDrawElements(GL.GL_POINTS, n, GL.GL_UNSIGNED_INT, element_offset(first))
+        elif n:
+            GL.glDrawArrays(GL.GL_POINTS, first, n)
         else:
             GL.glDrawArrays(GL.GL_POINTS, 0, GL.GL_BUFFER_SIZE)
 
+    def draw_ranges(self, mode: int, elements: Any, firsts, counts):
+        """
+        Draw several ranges of an element buffer with a single call.
+
+        Parameters
+        ----------
+        mode : GLenum
+            The type of primitive, e.g. GL.GL_TRIANGLES.
+        elements : Any
+            The buffer elements.
+        firsts : array_like
+            The index of the first element of each range.
+        counts : array_like
+            The number of elements of each range.
+        """
+        if not len(counts):
+            return
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, elements)
+        offsets = asarray(firsts, dtype=uintp) * 4
+        GL.glMultiDrawElements(mode, asarray(counts, dtype=int32), GL.GL_UNSIGNED_INT, offsets, len(counts))
+        if mode == GL.GL_LINES:
+            GL.glEnable(GL.GL_DEPTH_TEST)
+
     def draw_texts(self, elements: Any = None, n: int = 0):
         """
         Draw texts.
@@ -360,6 +422,11 @@ class Shader:
         GL.glPolygonMode(GL.GL_FRONT_AND_BACK, GL.GL_FILL)  # Reset polygon mode
 
 
+def element_offset(first: int):
+    """The byte offset of the first element to draw in a bound element buffer of unsigned integers."""
+    return ctypes.c_void_p(first * 4) if first else None
+
+
 def make_shader_program(name: str):
     """Make a shader program.
 
@@ -49,7 +49,10 @@ from .collectionobject import Collection
 from .collectionobject import CollectionObject
 from .bufferobject import BufferGeometry
 from .bufferobject import BufferObject
+from .octree import OctreePointcloud
+from .octreeobject import OctreePointcloudObject
 from .scene import ViewerScene
+from .scene import InstanceIdAllocator
 
 
 @plugin(category="drawing-utils", requires=["compas_viewer"])
@@ -87,6 +90,7 @@ def register_scene_objects():
     register(Polyhedron, PolyhedronObject, context="Viewer")
     register(Collection, CollectionObject, context="Viewer")
     register(BufferGeometry, BufferObject, context="Viewer")
+    register(OctreePointcloud, OctreePointcloudObject, context="Viewer")
 
     try:
         from compas.geometry import NurbsCurve
@@ -143,5 +147,8 @@ __all__ = [
     "CollectionObject",
     "BufferGeometry",
     "BufferObject",
+    "OctreePointcloud",
+    "OctreePointcloudObject",
     "ViewerScene",
+    "InstanceIdAllocator",
 ]
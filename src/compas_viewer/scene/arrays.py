@@ -0,0 +1,87 @@
+"""Conversion of the points and colors of scene objects to numpy arrays."""
+
+from itertools import chain
+from operator import attrgetter
+
+import numpy as np
+
+from compas.colors import ColorDict
+from compas.geometry import Point
+from compas.geometry import Vector
+
+# The coordinates of points and vectors, read without the properties and the sequence protocol
+_coordinates = attrgetter("_x", "_y", "_z")
+
+# The channels of colors, read without the properties
+_channels = attrgetter("_r", "_g", "_b", "_a")
+
+
+def as_point_array(points, dtype=np.float32) -> np.ndarray:
+    """Convert points to a numpy array, reading the coordinates of COMPAS points and vectors directly.
+
+    Numpy reads :class:`compas.geometry.Point` and :class:`compas.geometry.Vector` objects as generic sequences,
+    item by item, which is several times slower than reading their coordinates.
+    Arrays of the right type are returned without copying them.
+
+    Parameters
+    ----------
+    points : array_like
+        A list of points or vectors, or of their coordinates, or an array.
+    dtype : numpy.dtype, optional
+        The type of the array.
+
+    Returns
+    -------
+    numpy.ndarray
+        An array of shape (n, 3) for a list of points or vectors,
+        otherwise the array of the given coordinates in their own shape.
+    """
+    if isinstance(points, (list, tuple)) and points and isinstance(points[0], (Point, Vector)):
+        try:
+            coordinates = np.fromiter(chain.from_iterable(map(_coordinates, points)), dtype=dtype, count=3 * len(points))
+        except AttributeError:
+            # A list mixing points and vectors with other sequences
+            pass
+        else:
+            return coordinates.reshape(-1, 3)
+    return np.asarray(points, dtype=dtype)
+
+
+def as_color_array(colordict: ColorDict, keys: list, dtype=np.float32) -> np.ndarray:
+    """Convert the colors of keys in a color dictionary to a numpy array.
+
+    The array is filled with the default color, and only the colors in the dictionary are written to the rows of their keys,
+    without looking up the keys one at a time or creating a color per key.
+
+    Parameters
+    ----------
+    colordict : :class:`compas.colors.ColorDict`
+        The color dictionary, e.g. of a :class:`compas.scene.descriptors.colordict.ColorDictAttribute`.
+    keys : list
+        The keys, e.g. of the vertices, edges or faces of a mesh, in the order of the rows.
+    dtype : numpy.dtype, optional
+        The type of the array.
+
+    Returns
+    -------
+    numpy.ndarray
+        The colors of the keys, as an array of shape (n, 4).
+    """
+    colors = np.empty((len(keys), 4), dtype=dtype)
+    colors[:] = _channels(colordict.default)
+    if len(colordict) and len(keys):
+        keys = list(map(colordict.keymapper, keys))
+        index = dict(zip(keys, range(len(keys))))
+        rows = []
+        values = []
+        for key, color in colordict.items():
+            row = index.get(key)
+            if row is not None:
+                rows.append(row)
+                values.append(color)
+        if rows:
+            colors[rows] = np.fromiter(chain.from_iterable(map(_channels, values)), dtype=dtype, count=4 * len(values)).reshape(-1, 4)
+        if len(index) < len(keys):
+            # Only the last row of a key that is in the list more than once was written
+            colors = colors[[index[key] for key in keys]]
+    return colors
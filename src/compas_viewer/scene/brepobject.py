@@ -1,6 +1,6 @@
+import numpy as np
 from compas_occ.brep import OCCBrep
 
-from compas.geometry import Line
 from compas.geometry import Point
 from compas.scene import GeometryObject
 from compas.tolerance import TOL
@@ -34,11 +34,8 @@ class BRepObject(ViewerGeometryObject, GeometryObject):
         return self.geometry.points
 
     @property
-    def lines(self) -> list[Line]:
-        lines = []
-        for polyline in self._boundaries:
-            lines += polyline.lines
-        return lines
+    def lines(self) -> np.ndarray:
+        return np.concatenate([self._segments(polyline.points) for polyline in self._boundaries] or [np.zeros((0, 2, 3))])
 
     @property
     def viewmesh(self) -> tuple[list[Point], list[list[int]]]:
@@ -1,6 +1,7 @@
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
 
 import numpy as np
 import OpenGL.GL as GL
@@ -11,7 +12,10 @@ from compas_viewer.gl import make_texture_buffer
 from compas_viewer.gl import make_vertex_buffer
 from compas_viewer.gl import update_texture_buffer
 from compas_viewer.gl import update_vertex_buffer
+from compas_viewer.renderer.bvh import BVH
+from compas_viewer.renderer.bvh import transform_boxes
 from compas_viewer.renderer.shaders import Shader
+from compas_viewer.scene.arrays import as_point_array
 
 
 class BufferManager:
@@ -19,36 +23,94 @@ class BufferManager:
 
     The BufferManager combines vertex data from multiple objects into consolidated buffers
     to minimize draw calls and state changes during rendering.
+    The vertices of all geometry types are stored in the same vertex buffers,
+    and the data of an object whose points, lines or faces share the same positions and colors arrays
+    share the same vertices, referenced by the element buffers of each geometry type.
 
     Attributes
     ----------
-    positions : Dict[str, np.ndarray]
-        Combined position buffers for different geometry types (points, lines, faces)
-    colors : Dict[str, np.ndarray]
-        Combined color buffers for different geometry types
+    positions : np.ndarray
+        Combined position buffer of the vertices of all geometry types (points, lines, faces)
+    colors : np.ndarray
+        Combined color buffer of the vertices
     elements : Dict[str, np.ndarray]
         Combined element index buffers for different geometry types
-    object_indices : Dict[str, np.ndarray]
-        Combined object index buffers for different geometry types
+    object_indices : np.ndarray
+        Combined object index buffer of the vertices
     objects : Dict[Any, int]
         Dictionary mapping objects to their indices in the buffer
     buffer_ids : Dict[str, Dict[str, int]]
-        Dictionary mapping buffer types to their IDs
+        Dictionary mapping buffer types to their IDs, where all types share the vertex buffers
+    vertex_ranges : Dict[int, Dict[str, tuple[int, int]]]
+        The first vertex and the number of vertices of the data of each object index for each buffer type.
+    uniform_colors : Dict[int, Dict[str, Color]]
+        The single color of the points, lines and faces data of each object index whose vertices all have the same color.
+        The shaders take these colors from the settings of the objects instead of the colors of the vertices.
     transforms : List[float]
         List of transformation matrices for each object
     settings : List[float]
         List of setting values for each object
     object_settings_cache : Dict[Any, List[float]]
         Cache for object settings to avoid redundant GPU updates
+    ranges : Dict[str, Dict[int, tuple[int, int]]]
+        The first element and the number of elements of each object index in each element buffer.
+    primitives : Dict[str, Dict[int, np.ndarray]]
+        The indices of the triangles of each object index in each face element buffer,
+        since the triangles of an object are split in opaque and transparent ones.
+    lods : Dict[str, Dict[int, List[tuple[int, int]]]]
+        The first element and the number of elements of the simplified levels of detail of each object index in each face element buffer,
+        from fine to coarse. The full geometry is the range of the object in :attr:`ranges`.
+    lod_resolutions : Dict[int, List[int]]
+        The grid resolution of each level of detail of each object index, from fine to coarse.
+    lod : np.ndarray
+        The level of detail drawn for each object index, where 0 is the full geometry.
+    bvh : :class:`compas_viewer.renderer.bvh.BVH`, read-only
+        The bounding volume hierarchy of the bounding boxes of the objects in world coordinates.
+    bounds : List[np.ndarray]
+        The bounding box of the geometry of each object index in its own coordinates, as an array of shape (2, 3).
+    visible : np.ndarray | None
+        Whether each object index passed the last call to :meth:`cull`, or None if all objects are drawn.
+    culled : Dict[str, int]
+        The numbers of objects that were outside the view frustum, hidden behind other objects, and too small on screen,
+        in the last call to :meth:`cull`.
+    shown : np.ndarray | None
+        Whether each object index, its points, its lines and its faces are shown, as an array of shape (n, 4),
+        taking the visibility of the parents into account.
+    draw_ranges : Dict[str, tuple[np.ndarray, np.ndarray] | None]
+        The first elements and the numbers of elements drawn from each element buffer,
+        or None if the whole buffer is drawn.
+    version : int
+        Counter incremented whenever the geometry, transforms, visibility or IDs in the buffers change,
+        but not when only the selection or hover state changes.
+    culling_version : int
+        Counter incremented whenever :meth:`cull` or :meth:`update_lods` changes the objects or levels of detail that are drawn.
     """
 
+    SETTINGS_ROWS = 7
+
+    # The buffer types whose single colors are stored in the last rows of the settings, in order
+    UNIFORM_COLOR_TYPES = ["_points_data", "_lines_data", "_frontfaces_data"]
+
+    # The size of a vertex in bytes: its position, color and object index
+    VERTEX_BYTES = (3 + 4 + 1) * 4
+
+    BUFFER_TYPES = ["_points_data", "_lines_data", "_frontfaces_data", "_backfaces_data"]
+
     def __init__(self):
         # Shader buffer data
-        self.positions: Dict[str, np.ndarray] = {}
-        self.colors: Dict[str, np.ndarray] = {}
+        self.positions = np.array([], dtype=np.float32)
+        self.colors = np.array([], dtype=np.float32)
         self.elements: Dict[str, np.ndarray] = {}
-        self.object_indices: Dict[str, np.ndarray] = {}
+        self.object_indices = np.array([], dtype=np.float32)
         self.objects: Dict[Any, int] = {}
+        self.vertex_ranges: Dict[int, Dict[str, tuple[int, int]]] = {}
+        self.uniform_colors: Dict[int, Dict[str, Color]] = {}
+
+        # The data of the added objects, concatenated when the buffers are created
+        self._vertex_chunks: List[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._vertex_count = 0
+        self._element_chunks: Dict[str, List[np.ndarray]] = {}
+        self._element_counts: Dict[str, int] = {}
 
         # OpenGL buffer IDs
         self.buffer_ids: Dict[str, Dict[str, int]] = {}
@@ -59,25 +121,71 @@ class BufferManager:
         # Settings data
         self.settings: List[float] = []
         self.object_settings_cache: Dict[Any, List[float]] = {}
+        self._settings_array = np.zeros((0, self.SETTINGS_ROWS, 4), dtype=np.float32)
+
+        # Per-object element ranges, for drawing the objects separately
+        self.ranges: Dict[str, Dict[int, tuple[int, int]]] = {}
+        self.primitives: Dict[str, Dict[int, np.ndarray]] = {}
+
+        # Levels of detail
+        self.lods: Dict[str, Dict[int, List[tuple[int, int]]]] = {}
+        self.lod_resolutions: Dict[int, List[int]] = {}
+        self.lod = np.zeros(0, dtype=np.int64)
+
+        # Frustum culling
+        self.bounds: List[np.ndarray] = []
+        self.visible: Optional[np.ndarray] = None
+        self.culled: Dict[str, int] = {"frustum": 0, "occlusion": 0, "small": 0}
+        self.shown: Optional[np.ndarray] = None
+        self.draw_ranges: Dict[str, Optional[tuple[np.ndarray, np.ndarray]]] = {}
+        self._bvh = None
+        self._bvh_version = None
+        self._bounds_version = 0
+        self._ranges_dirty = True
+
+        self.version = 0
+        self.culling_version = 0
 
         # Initialize empty buffers for each geometry type
-        for buffer_type in ["_points_data", "_lines_data", "_frontfaces_data", "_backfaces_data"]:
-            self.positions[buffer_type] = np.array([], dtype=np.float32)
-            self.colors[buffer_type] = np.array([], dtype=np.float32)
+        for buffer_type in self.BUFFER_TYPES:
             self.elements[buffer_type] = np.array([], dtype=np.int32)
             if buffer_type == "_frontfaces_data" or buffer_type == "_backfaces_data":
                 self.elements[buffer_type + "_transparent"] = np.array([], dtype=np.int32)
-            self.object_indices[buffer_type] = np.array([], dtype=np.float32)
             self.buffer_ids[buffer_type] = {}
+        for element_type in self.elements:
+            self.ranges[element_type] = {}
+            self.primitives[element_type] = {}
+            self.lods[element_type] = {}
+            self.draw_ranges[element_type] = None
 
     def add_object(self, obj: Any) -> None:
         """Add an object's buffer data to the combined buffers."""
         self.objects[obj] = len(self.transforms)
+        self.vertex_ranges[len(self.transforms)] = {}
+        self.uniform_colors[len(self.transforms)] = {}
+
+        # The vertices already added for the positions and colors arrays of the object
+        shared = {}
 
         # Process geometry data
-        for data_type in ["_points_data", "_lines_data", "_frontfaces_data", "_backfaces_data"]:
+        chunks = len(self._vertex_chunks)
+        for data_type in self.BUFFER_TYPES:
             if hasattr(obj, data_type) and getattr(obj, data_type):
-                self._add_buffer_data(obj, data_type)
+                self._add_buffer_data(obj, data_type, shared=shared)
+            elif data_type == "_backfaces_data" and getattr(obj, "_frontfaces_data", None):
+                # Without back faces of their own, the back faces reuse the vertices of the front faces
+                self._add_buffer_data(obj, data_type, self._reverse_faces(obj._frontfaces_data), shared=shared)
+
+        # The bounds of the vertices added for the object, which are already converted to arrays
+        self.bounds.append(self._vertex_bounds([positions for positions, _, _ in self._vertex_chunks[chunks:]]))
+
+        # The simplified versions of the faces follow the full ones in the face buffers
+        lods = getattr(obj, "_lods_data", None)
+        if lods and getattr(obj, "_frontfaces_data", None):
+            self.lod_resolutions[len(self.transforms)] = [resolution for *_, resolution in lods]
+            for level, data in enumerate(lods, 1):
+                self._add_buffer_data(obj, "_frontfaces_data", data[:3], level, shared)
+                self._add_buffer_data(obj, "_backfaces_data", self._reverse_faces(data[:3]), level, shared)
 
         if obj.transformation is not None:
             matrix = np.array(obj.transformation.matrix, dtype=np.float32).flatten()
@@ -85,82 +193,188 @@ class BufferManager:
             matrix = np.identity(4, dtype=np.float32).flatten()
         self.transforms.append(matrix)
 
-        if hasattr(obj, "instance_color"):
-            instance_color = obj.instance_color.rgb
-        else:
-            instance_color = [0.0, 0.0, 0.0]
+        self.settings.append(self._object_settings(obj))
+
+    def _object_settings(self, obj: Any) -> List[List[float]]:
+        """Collect the rows of the settings texture of an object."""
+        # The 32-bit ID is split in two 16-bit halves, which float32 represents exactly
+        instance_id = getattr(obj, "instance_id", None) or 0
 
         # Get parent index
         parent_index = -1.0
         if hasattr(obj, "parent") and obj.parent in self.objects:
             parent_index = float(self.objects[obj.parent])
 
-        obj_settings = [
+        # The single colors of the points, lines and faces, with their current values if the object provides them
+        colors = self.uniform_colors.get(self.objects.get(obj), {})
+        if colors and hasattr(obj, "_uniform_colors"):
+            current = obj._uniform_colors()
+            colors = {buffer_type: current.get(buffer_type, color) for buffer_type, color in colors.items()}
+        colors = [colors.get(buffer_type) for buffer_type in self.UNIFORM_COLOR_TYPES]
+
+        return [
             [obj.show, obj.show_points, obj.show_lines, obj.show_faces],  # Row 1
-            [*instance_color, obj.is_selected],  # Row 2
+            [instance_id & 0xFFFF, instance_id >> 16, 0.0, obj.is_selected],  # Row 2
             [parent_index, obj.opacity, obj.pointsize, getattr(obj, "linewidth", 1.0)],  # Row 3
+            [obj.is_hovered, *(float(color is not None) for color in colors)],  # Row 4
+            *(list(color.rgba) if color is not None else [0.0, 0.0, 0.0, 0.0] for color in colors),  # Rows 5 to 7
         ]
-        self.settings.append(obj_settings)
-
-    def _add_buffer_data(self, obj: Any, buffer_type: str) -> None:
-        """Add buffer data for a specific geometry type."""
-        positions, colors, elements = getattr(obj, buffer_type)
-
-        if len(colors) > len(positions):
-            print(
-                f"WARNING: Buffer type: {buffer_type} colors length: {len(colors)} greater than positions length: {len(positions)} for {obj},the remaining colors will be ignored"
-            )
-            colors = colors[: len(positions)]
-        elif len(colors) < len(positions):
-            print(f"WARNING: Buffer type: {buffer_type} colors length: {len(colors)} less than positions length: {len(positions)} for {obj}, last color will be repeated")
-            colors = colors + [colors[-1]] * (len(positions) - len(colors))
-
-        # Convert to numpy arrays
-        pos_array = np.array(positions, dtype=np.float32).flatten()
-        col_array = np.array([c.rgba for c in colors] if len(colors) > 0 and isinstance(colors[0], Color) else colors, dtype=np.float32).flatten()
-        elem_array = np.array(elements, dtype=np.int32).flatten()
-
-        if buffer_type == "_frontfaces_data" or buffer_type == "_backfaces_data":
-            opaque_elements = []
-            transparent_elements = []
-            for e in elem_array:
-                if e >= len(colors):
-                    # print("WARNING: Element index out of range", obj) # TODO: Fix BREP from IFC
-                    continue
 
-                color = colors[e]
-                alpha = color.a if isinstance(color, Color) else color[3]
-                if alpha < 1.0 or obj.opacity < 1.0:
-                    transparent_elements.append(e)
-                else:
-                    opaque_elements.append(e)
-
-        # Update elements to account for offset
-        start_idx = len(self.positions[buffer_type]) // 3
-        elem_array += start_idx
+    def _add_buffer_data(self, obj: Any, buffer_type: str, data: Optional[tuple] = None, level: int = 0, shared: Optional[dict] = None) -> None:
+        """Add buffer data for a specific geometry type, or a simplified level of detail of the faces.
 
-        # Create vertex indices
+        The vertices are only added once for the positions and colors arrays in ``shared``,
+        which maps the arrays already added for the object to their first vertex.
+        Data with a single color for all vertices can use the vertices of any data with the same positions array,
+        as the shaders take its color from the settings of the object.
+        """
+        positions, colors, elements = data if data is not None else getattr(obj, buffer_type)
         object_index = len(self.transforms)
-        obj_indices = np.full(len(positions), object_index, dtype=np.float32)
-
-        # Append to existing buffers
-        self.positions[buffer_type] = np.append(self.positions[buffer_type], pos_array)
-        self.colors[buffer_type] = np.append(self.colors[buffer_type], col_array)
-        self.object_indices[buffer_type] = np.append(self.object_indices[buffer_type], obj_indices)
+        uniform = isinstance(colors, Color)
+        if uniform and not level and buffer_type in self.UNIFORM_COLOR_TYPES:
+            self.uniform_colors[object_index][buffer_type] = colors
+
+        # Convert to numpy arrays, unless the vertices are shared with other data of the object
+        key = (id(positions), id(colors))
+        if uniform and shared is not None:
+            key = next((other for other in shared if other[0] == id(positions)), key)
+        if shared is not None and key in shared:
+            start_idx, col_array, _ = shared[key]
+        else:
+            pos_array, col_array = self._vertex_arrays(obj, buffer_type, positions, colors)
+            start_idx = self._append_vertices(pos_array, col_array, object_index)
+            if shared is not None:
+                # The arrays are kept, so that their IDs are not reused
+                shared[key] = (start_idx, col_array, (positions, colors))
+        if not level:
+            self.vertex_ranges[object_index][buffer_type] = (start_idx, len(col_array) // 4)
+        elem_array = np.asarray(elements, dtype=np.int32).reshape(-1)
 
         if buffer_type == "_frontfaces_data" or buffer_type == "_backfaces_data":
-            opaque_elements = np.array(opaque_elements, dtype=np.int32)
-            transparent_elements = np.array(transparent_elements, dtype=np.int32)
-            opaque_elements += start_idx
-            transparent_elements += start_idx
+            # Split the triangles in opaque and transparent ones, keeping track of their indices
+            triangles = elem_array.reshape(-1, 3)
+            # TODO: Fix BREP from IFC, which has element indices out of range
+            inside = triangles < len(col_array) // 4
+            valid = inside[:, 0] & inside[:, 1] & inside[:, 2]
+            if obj.opacity < 1.0 or (uniform and colors.a < 1.0):
+                transparent = valid.copy()
+            else:
+                transparent = np.zeros(len(triangles), dtype=bool)
+                alpha = col_array.reshape(-1, 4)[:, 3]
+                # Vertex colors are mostly opaque
+                if not uniform and len(alpha) and alpha.min() < 1.0:
+                    translucent = alpha[triangles[valid]] < 1.0
+                    transparent[valid] = translucent[:, 0] | translucent[:, 1] | translucent[:, 2]
+            opaque_triangles = np.flatnonzero(valid & ~transparent)
+            transparent_triangles = np.flatnonzero(valid & transparent)
+            opaque_elements = triangles[opaque_triangles].reshape(-1)
+            transparent_elements = triangles[transparent_triangles].reshape(-1)
 
-            self.elements[buffer_type] = np.append(self.elements[buffer_type], opaque_elements)
-            self.elements[buffer_type + "_transparent"] = np.append(self.elements[buffer_type + "_transparent"], transparent_elements)
+        # Update elements to account for offset
+        if buffer_type == "_frontfaces_data" or buffer_type == "_backfaces_data":
+            first = self._append_elements(buffer_type, opaque_elements + start_idx)
+            self._add_range(buffer_type, object_index, first, len(opaque_elements), opaque_triangles, level)
+            first = self._append_elements(buffer_type + "_transparent", transparent_elements + start_idx)
+            self._add_range(buffer_type + "_transparent", object_index, first, len(transparent_elements), transparent_triangles, level)
         else:
-            self.elements[buffer_type] = np.append(self.elements[buffer_type], elem_array)
+            first = self._append_elements(buffer_type, elem_array + start_idx)
+            self._add_range(buffer_type, object_index, first, len(elem_array))
+
+    def _append_vertices(self, positions: np.ndarray, colors: np.ndarray, object_index: int) -> int:
+        """Queue vertices to be appended to the vertex buffers, and return the index of the first one."""
+        first = self._vertex_count
+        self._vertex_chunks.append((positions, colors, np.full(len(positions) // 3, object_index, dtype=np.float32)))
+        self._vertex_count += len(positions) // 3
+        return first
+
+    def _append_elements(self, element_type: str, elements: np.ndarray) -> int:
+        """Queue elements to be appended to an element buffer, and return the position of the first one."""
+        first = self._element_counts.get(element_type, 0)
+        self._element_chunks.setdefault(element_type, []).append(elements)
+        self._element_counts[element_type] = first + len(elements)
+        return first
+
+    def _concatenate_chunks(self) -> None:
+        """Append the queued vertices and elements to the combined arrays, copying each array once."""
+        if self._vertex_chunks:
+            positions, colors, object_indices = zip(*self._vertex_chunks)
+            self.positions = np.concatenate([self.positions, *positions])
+            self.colors = np.concatenate([self.colors, *colors])
+            self.object_indices = np.concatenate([self.object_indices, *object_indices])
+        for element_type, chunks in self._element_chunks.items():
+            self.elements[element_type] = np.concatenate([self.elements[element_type], *chunks])
+        self._vertex_chunks = []
+        self._element_chunks = {}
+
+    @staticmethod
+    def _vertex_bounds(arrays: List[np.ndarray]) -> np.ndarray:
+        """The min and max corners of the positions in flat arrays, as an array of shape (2, 3)."""
+        bounds = np.array([[np.inf] * 3, [-np.inf] * 3])
+        for positions in arrays:
+            if len(positions):
+                positions = positions.reshape(-1, 3)
+                bounds = np.array([np.minimum(bounds[0], positions.min(axis=0)), np.maximum(bounds[1], positions.max(axis=0))])
+        return bounds
+
+    @staticmethod
+    def _reverse_faces(data: tuple) -> tuple:
+        """The back faces of faces data, with the same positions and colors and the triangles in reverse order."""
+        positions, colors, elements = data
+        return positions, colors, np.asarray(elements, dtype=np.int64).reshape(-1, 3)[:, ::-1]
+
+    @staticmethod
+    def _vertex_arrays(obj: Any, buffer_type: str, positions, colors) -> tuple[np.ndarray, np.ndarray]:
+        """Convert the positions and colors of an object to flat float32 arrays, with one color per position.
+
+        The positions can be given as an array of shape (n, 3) or (3 * n,), or as a list of points.
+        The colors can be given as an array of shape (n, 4) or (4 * n,), as a list of colors or RGBA values,
+        or as a single color or RGBA value for all positions.
+        Contiguous float32 arrays are used without copying them.
+        """
+        pos_array = as_point_array(positions).reshape(-1)
+        if len(pos_array) % 3:
+            raise ValueError(f"The positions of {buffer_type} of {obj} have {len(pos_array)} coordinates, which is not a multiple of 3.")
+        count = len(pos_array) // 3
+
+        if isinstance(colors, Color):
+            colors = colors.rgba
+        elif not isinstance(colors, np.ndarray):
+            colors = [c.rgba if isinstance(c, Color) else c for c in colors]
+        col_array = np.asarray(colors, dtype=np.float32)
+        if col_array.shape == (4,) and count != 1:
+            # A single color for all positions
+            return pos_array, np.broadcast_to(col_array, (count, 4)).reshape(-1)
+        if col_array.size % 4:
+            raise ValueError(f"The colors of {buffer_type} of {obj} have {col_array.size} components, which is not a multiple of 4.")
+        col_array = col_array.reshape(-1, 4)
+
+        if len(col_array) > count:
+            print(f"WARNING: Buffer type: {buffer_type} colors length: {len(col_array)} greater than positions length: {count} for {obj},the remaining colors will be ignored")
+            col_array = col_array[:count]
+        elif len(col_array) < count:
+            print(f"WARNING: Buffer type: {buffer_type} colors length: {len(col_array)} less than positions length: {count} for {obj}, last color will be repeated")
+            col_array = np.concatenate([col_array, np.repeat(col_array[-1:], count - len(col_array), axis=0)])
+        return pos_array, col_array.reshape(-1)
+
+    def _add_range(self, element_type: str, object_index: int, first: int, count: int, primitives: Optional[np.ndarray] = None, level: int = 0) -> None:
+        """Record the range of the elements of an object in an element buffer."""
+        if level:
+            # Empty levels are kept, to find the levels by their number
+            self.lods[element_type].setdefault(object_index, []).append((first, count))
+            return
+        if not count:
+            return
+        self.ranges[element_type][object_index] = (first, count)
+        if primitives is not None:
+            self.primitives[element_type][object_index] = primitives
 
     def create_buffers(self) -> None:
         """Create OpenGL buffers from the collected data."""
+        self._concatenate_chunks()
+        self.version += 1
+        self._bounds_version += 1
+        self._ranges_dirty = True
+
         # Create transform buffer and texture
         if len(self.transforms) > 0:
             transforms_array = np.array(self.transforms, dtype=np.float32)
@@ -173,115 +387,404 @@ class BufferManager:
             settings_array = np.array(self.settings, dtype=np.float32)
         else:
             # Create dummy settings for empty scenes
-            # Format: [show, show_points, show_lines, show_faces], [r, g, b, is_selected], [parent_index, opacity, pointsize, linewidth]
-            dummy_settings = [[[False, False, False, False], [0.0, 0.0, 0.0, False], [-1.0, 1.0, 1.0, 1.0]]]
+            # Format: [show, show_points, show_lines, show_faces], [id_low, id_high, 0, is_selected], [parent_index, opacity, pointsize, linewidth],
+            # [is_hovered, has_pointcolor, has_linecolor, has_facecolor], pointcolor, linecolor, facecolor
+            dummy_settings = [[[False, False, False, False], [0.0, 0.0, 0.0, False], [-1.0, 1.0, 1.0, 1.0], [False, 0.0, 0.0, 0.0], *[[0.0, 0.0, 0.0, 0.0]] * 3]]
             settings_array = np.array(dummy_settings, dtype=np.float32)
         self.settings_texture = make_texture_buffer(settings_array)
+        self._settings_array = settings_array
+        self.lod = np.zeros(len(self.transforms), dtype=np.int64)
 
-        for buffer_type in self.positions:
-            if len(self.positions[buffer_type]):
-                self.buffer_ids[buffer_type]["positions"] = make_vertex_buffer(self.positions[buffer_type])
-                self.buffer_ids[buffer_type]["colors"] = make_vertex_buffer(self.colors[buffer_type])
-                self.buffer_ids[buffer_type]["object_indices"] = make_vertex_buffer(self.object_indices[buffer_type])
+        if not len(self.positions):
+            return
+        vertex_buffers = {
+            "positions": make_vertex_buffer(self.positions),
+            "colors": make_vertex_buffer(self.colors),
+            "object_indices": make_vertex_buffer(self.object_indices),
+        }
+        for buffer_type in self.BUFFER_TYPES:
+            if len(self.elements[buffer_type]) or len(self.elements.get(buffer_type + "_transparent", [])):
+                self.buffer_ids[buffer_type] = dict(vertex_buffers)
                 if buffer_type == "_frontfaces_data" or buffer_type == "_backfaces_data":
                     self.buffer_ids[buffer_type]["elements"] = make_index_buffer(self.elements[buffer_type])
                     self.buffer_ids[buffer_type]["elements_transparent"] = make_index_buffer(self.elements[buffer_type + "_transparent"])
                 else:
                     self.buffer_ids[buffer_type]["elements"] = make_index_buffer(self.elements[buffer_type])
 
-    def _draw_faces(self, shader: Shader, is_instance: bool, is_lighted: bool, is_ghosted: bool, is_wireframe: bool):
-        GL.glEnable(GL.GL_POLYGON_OFFSET_FILL)
-        if not is_wireframe and (not is_ghosted or is_instance):
-            shader.uniform1i("is_lighted", is_lighted)
-            shader.uniform1i("element_type", 2)
-            for face_type in ["_frontfaces_data", "_backfaces_data"]:
-                if self.buffer_ids[face_type]:
-                    shader.bind_attribute("position", self.buffer_ids[face_type]["positions"])
-                    shader.bind_attribute("color", self.buffer_ids[face_type]["colors"], step=4)
-                    shader.bind_attribute("object_index", self.buffer_ids[face_type]["object_indices"], step=1)
-                    shader.draw_triangles(elements=self.buffer_ids[face_type]["elements"], n=len(self.elements[face_type]))
-                    if is_instance:
-                        shader.draw_triangles(elements=self.buffer_ids[face_type]["elements_transparent"], n=len(self.elements[face_type + "_transparent"]))
-        GL.glDisable(GL.GL_POLYGON_OFFSET_FILL)
-
-    def _draw_points(self, shader: Shader):
+    @property
+    def has_points(self) -> bool:
+        """Whether there are points to draw."""
+        return bool(self.buffer_ids["_points_data"])
+
+    @property
+    def has_lines(self) -> bool:
+        """Whether there are lines to draw."""
+        return bool(self.buffer_ids["_lines_data"])
+
+    @property
+    def has_faces(self) -> bool:
+        """Whether there are faces to draw."""
+        return bool(self.buffer_ids["_frontfaces_data"] or self.buffer_ids["_backfaces_data"])
+
+    @property
+    def has_transparent_faces(self) -> bool:
+        """Whether there are transparent faces to draw."""
+        return any(len(self.elements[face_type + "_transparent"]) for face_type in ["_frontfaces_data", "_backfaces_data"] if self.buffer_ids[face_type])
+
+    def _bind_buffers(self, shader: Shader, buffer_type: str) -> None:
+        shader.enable_attribute("position")
+        shader.enable_attribute("color")
+        shader.enable_attribute("object_index")
+        shader.bind_attribute("position", self.buffer_ids[buffer_type]["positions"])
+        shader.bind_attribute("color", self.buffer_ids[buffer_type]["colors"], step=4)
+        shader.bind_attribute("object_index", self.buffer_ids[buffer_type]["object_indices"], step=1)
+
+    def draw_faces(self, shader: Shader, is_instance: bool = False, is_lighted: bool = False) -> None:
+        """Draw the opaque faces, including the transparent ones when drawing instance colors.
+
+        Parameters
+        ----------
+        shader : :class:`compas_viewer.renderer.shaders.Shader`
+            The bound model shader.
+        is_instance : bool, optional
+            Whether instance colors are drawn.
+        is_lighted : bool, optional
+            Whether the faces are lighted.
+        """
+        shader.uniform1i("is_lighted", is_lighted)
+        shader.uniform1i("element_type", 2)
+        for face_type in ["_frontfaces_data", "_backfaces_data"]:
+            if self.buffer_ids[face_type]:
+                self._bind_buffers(shader, face_type)
+                self._draw_elements(shader, face_type)
+                if is_instance:
+                    self._draw_elements(shader, face_type + "_transparent")
+
+    def draw_points(self, shader: Shader) -> None:
+        """Draw the points.
+
+        Parameters
+        ----------
+        shader : :class:`compas_viewer.renderer.shaders.Shader`
+            The bound model shader.
+        """
         shader.uniform1i("element_type", 0)
-        if self.buffer_ids["_points_data"]:
-            shader.bind_attribute("position", self.buffer_ids["_points_data"]["positions"])
-            shader.bind_attribute("color", self.buffer_ids["_points_data"]["colors"], step=4)
-            shader.bind_attribute("object_index", self.buffer_ids["_points_data"]["object_indices"], step=1)
-            shader.draw_points(elements=self.buffer_ids["_points_data"]["elements"], n=len(self.elements["_points_data"]))
-
-    def _draw_lines(self, line_shader: Shader):
-        GL.glDisable(GL.GL_CULL_FACE)
-        line_shader.bind()
-        line_shader.uniform1i("is_lighted", False)
-        line_shader.uniform1i("element_type", 1)
-        if self.buffer_ids["_lines_data"]:
-            line_shader.enable_attribute("position")
-            line_shader.enable_attribute("color")
-            line_shader.enable_attribute("object_index")
-            line_shader.bind_attribute("position", self.buffer_ids["_lines_data"]["positions"])
-            line_shader.bind_attribute("color", self.buffer_ids["_lines_data"]["colors"], step=4)
-            line_shader.bind_attribute("object_index", self.buffer_ids["_lines_data"]["object_indices"], step=1)
-            line_shader.draw_lines(elements=self.buffer_ids["_lines_data"]["elements"], n=len(self.elements["_lines_data"]))
-        line_shader.release()
-        GL.glEnable(GL.GL_CULL_FACE)
-
-    def _draw_transparent_faces(self, shader: Shader, is_lighted: bool, is_ghosted: bool):
-        shader.bind()
+        self._bind_buffers(shader, "_points_data")
+        self._draw_elements(shader, "_points_data")
+
+    def draw_lines(self, shader: Shader) -> None:
+        """Draw the lines.
+
+        Parameters
+        ----------
+        shader : :class:`compas_viewer.renderer.shaders.Shader`
+            The bound line shader.
+        """
+        shader.uniform1i("is_lighted", False)
+        shader.uniform1i("element_type", 1)
+        self._bind_buffers(shader, "_lines_data")
+        self._draw_elements(shader, "_lines_data")
+
+    def draw_transparent_faces(self, shader: Shader, is_lighted: bool = False, is_ghosted: bool = False) -> None:
+        """Draw the transparent faces, including the opaque ones in ghosted mode.
+
+        Parameters
+        ----------
+        shader : :class:`compas_viewer.renderer.shaders.Shader`
+            The bound model shader.
+        is_lighted : bool, optional
+            Whether the faces are lighted.
+        is_ghosted : bool, optional
+            Whether all faces are drawn as transparent.
+        """
         shader.uniform1i("is_lighted", is_lighted)
         shader.uniform1i("element_type", 2)
-        GL.glDepthMask(GL.GL_FALSE)
         for face_type in ["_frontfaces_data", "_backfaces_data"]:
             if self.buffer_ids[face_type]:
-                shader.bind_attribute("position", self.buffer_ids[face_type]["positions"])
-                shader.bind_attribute("color", self.buffer_ids[face_type]["colors"], step=4)
-                shader.bind_attribute("object_index", self.buffer_ids[face_type]["object_indices"], step=1)
-                shader.draw_triangles(elements=self.buffer_ids[face_type]["elements_transparent"], n=len(self.elements[face_type + "_transparent"]))
+                self._bind_buffers(shader, face_type)
+                self._draw_elements(shader, face_type + "_transparent")
                 if is_ghosted:
-                    shader.draw_triangles(elements=self.buffer_ids[face_type]["elements"], n=len(self.elements[face_type]))
-        GL.glDepthMask(GL.GL_TRUE)
+                    self._draw_elements(shader, face_type)
+
+    def _draw_elements(self, shader: Shader, element_type: str) -> None:
+        """Draw an element buffer, or only the ranges of the objects that are shown and not culled."""
+        if self._ranges_dirty:
+            self.update_draw_ranges()
+        buffer_type = element_type.replace("_transparent", "")
+        elements = self.buffer_ids[buffer_type]["elements_transparent" if element_type.endswith("_transparent") else "elements"]
+        mode = GL.GL_POINTS if buffer_type == "_points_data" else GL.GL_LINES if buffer_type == "_lines_data" else GL.GL_TRIANGLES
+        ranges = self.draw_ranges.get(element_type)
+        if ranges is not None:
+            shader.draw_ranges(mode, elements, *ranges)
+        elif mode == GL.GL_TRIANGLES:
+            shader.draw_triangles(elements=elements, n=len(self.elements[element_type]))
+        elif mode == GL.GL_LINES:
+            shader.draw_lines(elements=elements, n=len(self.elements[element_type]))
+        else:
+            shader.draw_points(elements=elements, n=len(self.elements[element_type]))
 
-    def draw(self, shader: Shader, line_shader: Shader, rendermode: str, is_instance: bool = False) -> None:
-        """Draw all objects using the combined buffers."""
-        is_wireframe = rendermode == "wireframe"
-        is_lighted = rendermode == "lighted"
-        is_ghosted = rendermode == "ghosted"
+    def world_bounds(self) -> np.ndarray:
+        """Compute the bounding boxes of the objects in world coordinates, including the transformations of their parents.
 
-        has_geometry = any(self.buffer_ids[buffer_type] for buffer_type in ["_points_data", "_frontfaces_data", "_backfaces_data", "_lines_data"])
+        Returns
+        -------
+        numpy.ndarray
+            The min and max corners of the box of each object index, as an array of shape (n, 2, 3),
+            with infinite corners for objects without geometry.
+        """
+        n = len(self.transforms)
+        if not n:
+            return np.zeros((0, 2, 3))
+        local = np.array(self.transforms, dtype=np.float64).reshape(n, 4, 4)
+        parents = [int(settings[2][0]) for settings in self.settings]
+
+        # Compose the transformations along the parent chains, like the shaders do
+        world = np.full((n, 4, 4), np.nan)
+
+        def resolve(index):
+            if np.isnan(world[index, 0, 0]):
+                parent = parents[index]
+                world[index] = resolve(parent) @ local[index] if parent >= 0 else local[index]
+            return world[index]
+
+        for index in range(n):
+            resolve(index)
+
+        bounds = np.array(self.bounds, dtype=np.float64).reshape(n, 2, 3)
+        empty = ~np.isfinite(bounds).all(axis=(1, 2))
+        bounds[empty] = 0.0
+        result = transform_boxes(bounds, world)
+        result[empty] = [[np.inf] * 3, [-np.inf] * 3]
+        return result
+
+    def cull(self, planes: Optional[np.ndarray] = None, hidden: Optional[np.ndarray] = None, small: Optional[np.ndarray] = None) -> None:
+        """Only draw the objects whose bounding boxes intersect a convex volume, e.g. the view frustum.
+
+        The objects are looked up in a bounding volume hierarchy of their bounding boxes in world coordinates,
+        which is rebuilt when the geometry or the transformations of the objects change.
+        The draw ranges are updated before the next draw call.
 
-        if not has_geometry:
+        Parameters
+        ----------
+        planes : numpy.ndarray, optional
+            The planes bounding the volume, as an array of shape (k, 4), with normals pointing inwards.
+            If None, all objects are drawn.
+        hidden : numpy.ndarray, optional
+            Whether each object index is hidden behind other objects, and is not drawn either.
+        small : numpy.ndarray, optional
+            Whether each object index is too small on screen, and is not drawn either.
+        """
+        self._ranges_dirty = True
+        self.culling_version += 1
+        n = len(self.transforms)
+        if planes is None or not n:
+            self.visible = None
+            self.culled = {"frustum": 0, "occlusion": 0, "small": 0}
             return
 
-        # Draw opaque elements
-        shader.bind()
-        shader.uniform1i("is_grid", False)
-        shader.enable_attribute("position")
-        shader.enable_attribute("color")
-        shader.enable_attribute("object_index")
+        self.visible = np.zeros(n, dtype=bool)
+        self.visible[self.bvh.intersect_frustum(planes)] = True
+        inside = int(self.visible.sum())
+        if hidden is not None:
+            self.visible &= ~hidden
+        unoccluded = int(self.visible.sum())
+        if small is not None:
+            self.visible &= ~small
+        self.culled = {"frustum": n - inside, "occlusion": inside - unoccluded, "small": unoccluded - int(self.visible.sum())}
+
+    @property
+    def bvh(self) -> BVH:
+        """The bounding volume hierarchy of the bounding boxes of the objects in world coordinates.
+
+        It is rebuilt when the geometry, the transformations or the parents of the objects change.
+        """
+        if self._bvh is None or self._bvh_version != self._bounds_version:
+            self._bvh = BVH(self.world_bounds())
+            self._bvh_version = self._bounds_version
+        return self._bvh
 
-        self._draw_faces(shader, is_instance, is_lighted, is_ghosted, is_wireframe)
-        self._draw_points(shader)
-        shader.release()
+    def update_shown(self) -> None:
+        """Update which objects and which of their points, lines and faces are shown, from the settings of the objects.
 
-        # Draw lines with their own shader
-        self._draw_lines(line_shader)
+        An object is only shown if all its parents are shown, like in the shaders.
+        """
+        n = len(self.settings)
+        if not n:
+            self.shown = None
+            return
+        settings = self._settings_array[:n]
+        show = settings[:, 0, 0] > 0
+        parents = settings[:, 2, 0].astype(np.int64)
+
+        # Walk up the parent chains of all objects at once
+        shown = show.copy()
+        parent = parents
+        while (parent >= 0).any():
+            has_parent = parent >= 0
+            shown[has_parent] &= show[parent[has_parent]]
+            parent = np.where(has_parent, parents[np.maximum(parent, 0)], -1)
+
+        self.shown = np.column_stack([shown, shown[:, None] & (settings[:, 0, 1:] > 0)])
+
+    def selected(self) -> np.ndarray:
+        """Find the objects that are selected, or whose parents are selected, from the settings of the objects.
+
+        Returns
+        -------
+        numpy.ndarray
+            Whether each object index is highlighted as selected, like in the shaders.
+        """
+        n = len(self.settings)
+        settings = self._settings_array[:n]
+        selected = settings[:, 1, 3] > 0
+        parents = settings[:, 2, 0].astype(np.int64)
+
+        result = selected.copy()
+        parent = parents
+        while (parent >= 0).any():
+            has_parent = parent >= 0
+            result[has_parent] |= selected[parent[has_parent]]
+            parent = np.where(has_parent, parents[np.maximum(parent, 0)], -1)
+        return result
+
+    def update_draw_ranges(self) -> None:
+        """Collect the ranges of the element buffers to draw, leaving out hidden and culled objects.
+
+        The points, lines and faces of an object are left out if the object or its parents are hidden,
+        or if its points, lines or faces are hidden, instead of being discarded by the shaders after being processed.
+        The faces of objects with levels of detail are drawn at the level in :attr:`lod`.
+        The element ranges of consecutive drawn objects are merged,
+        and the remaining ranges are drawn with a single ``glMultiDrawElements`` per element buffer.
+        This is called before drawing if the visibility of the objects, the culling or the levels of detail changed.
+        """
+        self._ranges_dirty = False
+        self.update_shown()
+        for element_type, ranges in self.ranges.items():
+            if not ranges or self.shown is None:
+                self.draw_ranges[element_type] = None
+                continue
+            column = 1 if element_type == "_points_data" else 2 if element_type == "_lines_data" else 3
+            indices = np.fromiter(ranges.keys(), dtype=np.int64, count=len(ranges))
+            visible = self.shown[indices, column]
+            if self.visible is not None:
+                visible &= self.visible[indices]
+            lods = self.lods[element_type]
+            # The levels of detail are in the buffer too, so it is never drawn whole if there are any
+            if visible.all() and not lods:
+                self.draw_ranges[element_type] = None
+                continue
+            firsts, counts = np.array(list(ranges.values()), dtype=np.int64).reshape(-1, 2).T
+            for index, levels in lods.items():
+                level = self.lod[index] if index < len(self.lod) else 0
+                position = np.searchsorted(indices, index)
+                if level and position < len(indices) and indices[position] == index:
+                    firsts[position], counts[position] = levels[level - 1]
+            visible &= counts > 0
+            firsts, counts = firsts[visible], counts[visible]
+            # Merge the ranges of objects that are consecutive in the buffer
+            starts = np.flatnonzero(np.r_[True, firsts[1:] != firsts[:-1] + counts[:-1]])[: len(firsts)]
+            self.draw_ranges[element_type] = (firsts[starts], np.add.reduceat(counts, starts) if len(starts) else counts)
+
+    def update_lods(self, sizes: np.ndarray, tolerance: float = 1.0, hysteresis: float = 0.2) -> bool:
+        """Choose the level of detail of the faces of each object from its size on screen.
+
+        A level is fine enough if the cells of its grid are smaller than ``tolerance`` pixels on screen,
+        i.e. if the projected size of the object is at most ``tolerance`` times the resolution of the grid.
+        To avoid switching back and forth at the boundary, an object only switches to a coarser level below
+        ``1 - hysteresis`` times the threshold, and back to a finer level above ``1 + hysteresis`` times it.
 
-        # Draw transparent elements if not in instance mode
-        if not is_instance and not is_wireframe:
-            self._draw_transparent_faces(shader, is_lighted, is_ghosted)
+        Parameters
+        ----------
+        sizes : numpy.ndarray
+            The size of each object index on screen, in pixels.
+        tolerance : float, optional
+            The size of the cells of the grid on screen, in pixels.
+        hysteresis : float, optional
+            The relative margin around the thresholds between the levels.
+
+        Returns
+        -------
+        bool
+            True if the level of any object changed.
+        """
+        if not self.lod_resolutions or len(self.lod) != len(sizes):
+            return False
+        indices = np.fromiter(self.lod_resolutions.keys(), dtype=np.int64, count=len(self.lod_resolutions))
+        depth = max(len(resolutions) for resolutions in self.lod_resolutions.values())
+        # The thresholds of the levels of each object, from fine to coarse, padded with levels that are never chosen
+        thresholds = np.full((len(indices), depth), -np.inf)
+        for row, resolutions in enumerate(self.lod_resolutions.values()):
+            thresholds[row, : len(resolutions)] = resolutions
+        thresholds *= tolerance
+
+        current = self.lod[indices]
+        factors = np.where(np.arange(1, depth + 1) <= current[:, None], 1 + hysteresis, 1 - hysteresis)
+        lod = (sizes[indices, None] <= thresholds * factors).sum(axis=1)
+        if (lod == current).all():
+            return False
+        self.lod[indices] = lod
+        self._ranges_dirty = True
+        self.culling_version += 1
+        return True
+
+    def draw_primitives(self, shader: Shader, buffer_types: List[str], base: int = 1) -> List[tuple[int, Any, Optional[np.ndarray]]]:
+        """Draw the elements of each object separately, giving each primitive a consecutive ID.
+
+        The instance shader adds the ID of the first primitive of the object, passed as ``primitive_base``,
+        to ``gl_PrimitiveID``, which counts the primitives from zero in each draw call.
+
+        Parameters
+        ----------
+        shader : :class:`compas_viewer.renderer.shaders.Shader`
+            The bound instance shader.
+        buffer_types : list[str]
+            The buffers to draw, e.g. ``["_frontfaces_data", "_backfaces_data"]``.
+        base : int, optional
+            The ID of the first primitive.
+
+        Returns
+        -------
+        list[tuple[int, Any, numpy.ndarray | None]]
+            For each drawn range, the ID of its first primitive, the object,
+            and the indices of the primitives in the data of the object, or None if they are in order.
+        """
+        if self._ranges_dirty:
+            self.update_draw_ranges()
+        objects = {index: obj for obj, index in self.objects.items()}
+        table = []
+        for buffer_type in buffer_types:
+            if not self.buffer_ids[buffer_type]:
+                continue
+            self._bind_buffers(shader, buffer_type)
+            is_faces = buffer_type == "_frontfaces_data" or buffer_type == "_backfaces_data"
+            for element_type in [buffer_type, buffer_type + "_transparent"] if is_faces else [buffer_type]:
+                elements = self.buffer_ids[buffer_type]["elements_transparent" if element_type.endswith("_transparent") else "elements"]
+                for index, (first, count) in self.ranges[element_type].items():
+                    if self.visible is not None and not self.visible[index]:
+                        continue
+                    # The points, lines and faces are drawn even if hidden, as long as the object is shown
+                    if self.shown is not None and not self.shown[index, 0]:
+                        continue
+                    shader.uniform1i("primitive_base", base)
+                    if is_faces:
+                        shader.draw_triangles(elements=elements, n=count, first=first)
+                        size = 3
+                    elif buffer_type == "_lines_data":
+                        shader.draw_lines(elements=elements, n=count, first=first)
+                        size = 2
+                    else:
+                        shader.draw_points(elements=elements, n=count, first=first)
+                        size = 1
+                    table.append((base, objects[index], self.primitives[element_type].get(index)))
+                    base += count // size
+        return table
 
     def clear(self) -> None:
         """Clear all buffer data."""
-        # Delete OpenGL buffers before clearing references
-        for buffer_type in self.buffer_ids:
-            if self.buffer_ids[buffer_type]:
-                buffer_ids_to_delete = []
-                for buffer_name, buffer_id in self.buffer_ids[buffer_type].items():
-                    buffer_ids_to_delete.append(buffer_id)
-                if buffer_ids_to_delete:
-                    GL.glDeleteBuffers(len(buffer_ids_to_delete), buffer_ids_to_delete)
+        # Delete OpenGL buffers before clearing references, once for the vertex buffers shared by all buffer types
+        buffer_ids_to_delete = list({buffer_id for buffer_ids in self.buffer_ids.values() for buffer_id in buffer_ids.values()})
+        if buffer_ids_to_delete:
+            GL.glDeleteBuffers(len(buffer_ids_to_delete), buffer_ids_to_delete)
 
         # Delete OpenGL textures
         if hasattr(self, "transform_texture"):
@@ -292,20 +795,42 @@ class BufferManager:
             delattr(self, "settings_texture")
 
         # Clear numpy arrays and dictionaries
-        for buffer_type in self.positions:
-            self.positions[buffer_type] = np.array([], dtype=np.float32)
-            self.colors[buffer_type] = np.array([], dtype=np.float32)
+        self.positions = np.array([], dtype=np.float32)
+        self.colors = np.array([], dtype=np.float32)
+        self.object_indices = np.array([], dtype=np.float32)
+        self.vertex_ranges = {}
+        self.uniform_colors = {}
+        self._vertex_chunks = []
+        self._vertex_count = 0
+        self._element_chunks = {}
+        self._element_counts = {}
+        for buffer_type in self.BUFFER_TYPES:
             self.elements[buffer_type] = np.array([], dtype=np.int32)
             # Clear transparent elements for face data types
             if buffer_type == "_frontfaces_data" or buffer_type == "_backfaces_data":
                 self.elements[buffer_type + "_transparent"] = np.array([], dtype=np.int32)
-            self.object_indices[buffer_type] = np.array([], dtype=np.float32)
             self.buffer_ids[buffer_type] = {}
 
+        for element_type in self.elements:
+            self.ranges[element_type] = {}
+            self.primitives[element_type] = {}
+            self.lods[element_type] = {}
+            self.draw_ranges[element_type] = None
+        self.lod_resolutions = {}
+        self.lod = np.zeros(0, dtype=np.int64)
+        self.bounds = []
+        self.visible = None
+        self.culled = {"frustum": 0, "occlusion": 0, "small": 0}
+        self.shown = None
+        self._bvh = None
+        self._bvh_version = None
+        self._ranges_dirty = True
+
         self.objects = {}
         self.transforms = []
         self.settings = []
         self.object_settings_cache = {}
+        self._settings_array = np.zeros((0, self.SETTINGS_ROWS, 4), dtype=np.float32)
 
     def update_object_transform(self, obj: Any) -> None:
         """Update the transformation matrix for a single object.
@@ -326,88 +851,177 @@ class BufferManager:
         self.transforms[index] = matrix
         byte_offset = index * (4 * 16)
         update_texture_buffer(matrix, self.transform_texture, offset=byte_offset)
+        self.version += 1
+        self._bounds_version += 1
+
+    def update_object_data(self, obj: Any) -> bool:
+        """Update the position and color buffers and the bounds of a single object.
+
+        Parameters
+        ----------
+        obj : Any
+            The object.
 
-    def update_object_data(self, obj: Any) -> None:
-        """Update the position and color buffers for a single object."""
+        Returns
+        -------
+        bool
+            False if the number of vertices of the object changed, or if it has levels of detail,
+            which are read again, so that the buffers have to be rebuilt.
+        """
         if obj not in self.objects:
-            return
+            return True
 
         index = self.objects[obj]
+        self.version += 1
+        self._bounds_version += 1
 
-        # Update each buffer type that the object has
-        data_types = ["_points_data", "_lines_data", "_frontfaces_data", "_backfaces_data"]
-        for data_type in data_types:
+        if hasattr(obj, "_read_vertices_data"):
+            obj._vertices_data = obj._read_vertices_data()
+
+        # Update each buffer type that the object has, and the shared vertices once
+        updated = set()
+        arrays = []
+        fits = True
+        for data_type in self.BUFFER_TYPES:
             if hasattr(obj, data_type) and getattr(obj, data_type):
                 setattr(obj, data_type, getattr(obj, f"_read{data_type}")())
                 data = getattr(obj, data_type)
+                if data and data_type in self.UNIFORM_COLOR_TYPES:
+                    if isinstance(data[1], Color):
+                        self.uniform_colors[index][data_type] = data[1]
+                    else:
+                        self.uniform_colors[index].pop(data_type, None)
 
-                if not self.buffer_ids[data_type]:
+                if not self.buffer_ids[data_type] or data_type not in self.vertex_ranges[index]:
+                    continue
+                start_idx, count = self.vertex_ranges[index][data_type]
+                if start_idx in updated:
                     continue
+                updated.add(start_idx)
 
                 positions, colors, _ = data  # We don't update elements as topology stays the same
 
-                if len(colors) > len(positions):
-                    print(
-                        f"WARNING: Buffer type: {data_type} colors length: {len(colors)} greater than positions length: {len(positions)} for {obj},"
-                        "the remaining colors will be ignored"
-                    )
-                    colors = colors[: len(positions)]
-                elif len(colors) < len(positions):
-                    print(f"WARNING: Buffer type: {data_type} colors length: {len(colors)} less than positions length: {len(positions)} for {obj},last color will be repeated")
-                    colors = colors + [colors[-1]] * (len(positions) - len(colors))
-
                 # Convert to numpy arrays
-                pos_array = np.array(positions, dtype=np.float32).flatten()
-                col_array = np.array([c.rgba for c in colors] if len(colors) > 0 and isinstance(colors[0], Color) else colors, dtype=np.float32).flatten()
+                pos_array, col_array = self._vertex_arrays(obj, data_type, positions, colors)
+                # The data of all types is read, also if the vertices do not fit, e.g. when the shared vertices of a mesh are split by color
+                fits = fits and len(pos_array) // 3 == count
+                arrays.append((data_type, start_idx, pos_array, col_array))
+
+        if not fits:
+            return False
+        if index in self.lod_resolutions:
+            # The simplified faces have their own vertices, whose number depends on the positions
+            obj._lods_data = obj._read_lods_data()
+            return False
+        if arrays:
+            # The bounds of the culling hierarchy follow the new positions
+            self.bounds[index] = self._vertex_bounds([pos_array for _, _, pos_array, _ in arrays])
+        for data_type, start_idx, pos_array, col_array in arrays:
+            # Update the position buffer
+            pos_byte_offset = start_idx * 3 * 4  # 3 floats per vertex * 4 bytes per float
+            update_vertex_buffer(pos_array, self.buffer_ids[data_type]["positions"], offset=pos_byte_offset)
+
+            # Update the color buffer
+            col_byte_offset = start_idx * 4 * 4  # 4 floats per color * 4 bytes per float
+            update_vertex_buffer(col_array, self.buffer_ids[data_type]["colors"], offset=col_byte_offset)
+        return True
+
+    def update_object_colors(self, obj: Any) -> bool:
+        """Update the colors of a single object.
+
+        If the points, lines and faces of the object each have a single color, only its settings are updated.
+        Otherwise the data of the object is read again.
 
-                # Find the start and end indices for this object in the buffer
-                start_idx = 0
-                for i in range(len(self.object_indices[data_type])):
-                    if self.object_indices[data_type][i] == index:
-                        start_idx = i
-                        break
+        Parameters
+        ----------
+        obj : Any
+            The object.
+
+        Returns
+        -------
+        bool
+            False if the number of vertices of the object changed, so that the buffers have to be rebuilt.
+        """
+        index = self.objects.get(obj)
+        if index is None:
+            return True
+        colors = self.uniform_colors[index]
+        current = obj._uniform_colors() if hasattr(obj, "_uniform_colors") else {}
+        drawn = [buffer_type for buffer_type, (_, count) in self.vertex_ranges[index].items() if count and buffer_type in self.UNIFORM_COLOR_TYPES]
+        if all(buffer_type in colors and buffer_type in current for buffer_type in drawn):
+            self.update_object_settings(obj)
+            return True
+        return self.update_object_data(obj)
+
+    def memory_usage(self, obj: Any) -> Dict[str, int]:
+        """Measure the memory used by the vertices and elements of an object in the buffers.
 
-                # Update the position buffer
-                pos_byte_offset = start_idx * 3 * 4  # 3 floats per vertex * 4 bytes per float
-                update_vertex_buffer(pos_array, self.buffer_ids[data_type]["positions"], offset=pos_byte_offset)
+        Parameters
+        ----------
+        obj : Any
+            The object.
 
-                # Update the color buffer
-                col_byte_offset = start_idx * 4 * 4  # 4 floats per color * 4 bytes per float
-                update_vertex_buffer(col_array, self.buffer_ids[data_type]["colors"], offset=col_byte_offset)
+        Returns
+        -------
+        Dict[str, int]
+            The number of ``vertices`` and ``elements``, the number of ``bytes`` they use,
+            and the number of bytes ``saved`` by sharing vertices, compared to a vertex per element.
+        """
+        index = self.objects[obj]
+        vertices = int((self.object_indices == index).sum())
+        elements = 0
+        for element_type, ranges in self.ranges.items():
+            elements += ranges.get(index, (0, 0))[1] + sum(count for _, count in self.lods[element_type].get(index, []))
+        return {
+            "vertices": vertices,
+            "elements": elements,
+            "bytes": vertices * self.VERTEX_BYTES + elements * 4,
+            "saved": max(elements - vertices, 0) * self.VERTEX_BYTES,
+        }
 
     def update_settings(self):
-        """Update the settings for all objects."""
-        for obj in self.objects:
-            self.update_object_settings(obj)
+        """Update the settings for all objects.
+
+        The rows of the objects whose settings changed, e.g. after a box selection, are uploaded at once.
+        """
+        changed = [index for index in map(self._update_settings_cache, self.objects) if index is not None]
+        if changed:
+            self._upload_settings(min(changed), max(changed) + 1)
 
     def update_object_settings(self, obj: Any) -> None:
         """Update the settings for a single object."""
-        if obj not in self.objects:
-            return
+        index = self._update_settings_cache(obj)
+        if index is not None:
+            self._upload_settings(index, index + 1)
 
-        if hasattr(obj, "instance_color"):
-            instance_color = obj.instance_color.rgb
-        else:
-            instance_color = [0.0, 0.0, 0.0]
-
-        # Get parent index
-        parent_index = -1.0
-        if hasattr(obj, "parent") and obj.parent in self.objects:
-            parent_index = float(self.objects[obj.parent])
+    def _update_settings_cache(self, obj: Any) -> Optional[int]:
+        """Update the cached settings of an object, and return its index if they changed."""
+        if obj not in self.objects:
+            return None
 
-        obj_settings = [
-            [obj.show, obj.show_points, obj.show_lines, obj.show_faces],  # Row 1
-            [*instance_color, obj.is_selected],  # Row 2
-            [parent_index, obj.opacity, obj.pointsize, getattr(obj, "linewidth", 1.0)],  # Row 3: parent index and padding
-        ]
+        obj_settings = self._object_settings(obj)
 
         # Check against cache to avoid unnecessary GPU updates
-        if self.object_settings_cache.get(obj) == obj_settings:
-            return
+        cached = self.object_settings_cache.get(obj)
+        if cached == obj_settings:
+            return None
+
+        # Selection and hover states do not change what is drawn, only how it is colored
+        if cached is None or cached[0] != obj_settings[0] or cached[1][:2] != obj_settings[1][:2] or cached[2] != obj_settings[2]:
+            self.version += 1
+        # Only the visibility and the parents change which ranges are drawn
+        if cached is None or cached[0] != obj_settings[0] or cached[2][0] != obj_settings[2][0]:
+            self._ranges_dirty = True
+            if cached is not None and cached[2][0] != obj_settings[2][0]:
+                self._bounds_version += 1
 
-        # If settings have changed, update the GPU buffer and the cache
         self.object_settings_cache[obj] = obj_settings
         index = self.objects[obj]
         self.settings[index] = obj_settings
-        byte_offset = index * 4 * 12  # 3 rows * 4 floats per row * 4 bytes per float
-        update_texture_buffer(np.array(obj_settings, dtype=np.float32), self.settings_texture, offset=byte_offset)
+        self._settings_array[index] = obj_settings
+        return index
+
+    def _upload_settings(self, start: int, stop: int) -> None:
+        """Upload the settings of a range of object indices to the settings texture."""
+        byte_offset = start * 4 * 4 * self.SETTINGS_ROWS  # 4 floats per row * 4 bytes per float
+        update_texture_buffer(self._settings_array[start:stop], self.settings_texture, offset=byte_offset)
@@ -1,8 +1,10 @@
 from typing import Optional
+from typing import Union
 
 import numpy as np
 from numpy.typing import NDArray
 
+from compas.colors import Color
 from compas.geometry import Geometry
 from compas_viewer.scene import ViewerSceneObject
 
@@ -18,12 +20,18 @@ class BufferGeometry(Geometry):
         The flat list of line segment vertices, in the form of [x1, y1, z1, x2, y2, z2, ...].
     faces : Optional[NDArray], optional
         The flat list of face vertices, in the form of [x1, y1, z1, x2, y2, z2, ...].
-    pointcolor : Optional[NDArray], optional
-        The flat list of point colors, in the form of [r1, g1, b1, a1, r2, g2, b2, a2, ...].
-    linecolor : Optional[NDArray], optional
-        The flat list of line vertices colors, in the form of [r1, g1, b1, a1, r2, g2, b2, a2, ...].
-    facecolor : Optional[NDArray], optional
-        The flat list of face vertices colors, in the form of [r1, g1, b1, a1, r2, g2, b2, a2, ...].
+    pointcolor : Optional[Union[NDArray, Color]], optional
+        The flat list of point colors, in the form of [r1, g1, b1, a1, r2, g2, b2, a2, ...],
+        or a single color for all of them.
+        Defaults to the value of `pointcolor` in `viewer.config.ui.display`.
+    linecolor : Optional[Union[NDArray, Color]], optional
+        The flat list of line vertices colors, in the form of [r1, g1, b1, a1, r2, g2, b2, a2, ...],
+        or a single color for all of them.
+        Defaults to the value of `linecolor` in `viewer.config.ui.display`.
+    facecolor : Optional[Union[NDArray, Color]], optional
+        The flat list of face vertices colors, in the form of [r1, g1, b1, a1, r2, g2, b2, a2, ...],
+        or a single color for all of them.
+        Defaults to the value of `surfacecolor` in `viewer.config.ui.display`.
 
     Attributes
     ----------
@@ -33,12 +41,15 @@ class BufferGeometry(Geometry):
         The flat list of line segment vertices, in the form of [x1, y1, z1, x2, y2, z2, ...].
     faces : NDArray
         The flat list of face vertices, in the form of [x1, y1, z1, x2, y2, z2, ...].
-    pointcolor : NDArray
-        The flat list of point colors, in the form of [r1, g1, b1, a1, r2, g2, b2, a2, ...].
-    linecolor : NDArray
-        The flat list of line vertices colors, in the form of [r1, g1, b1, a1, r2, g2, b2, a2, ...].
-    facecolor : NDArray
-        The flat list of face vertices colors, in the form of [r1, g1, b1, a1, r2, g2, b2, a2, ...].
+    pointcolor : Union[NDArray, Color, None]
+        The flat list of point colors, in the form of [r1, g1, b1, a1, r2, g2, b2, a2, ...],
+        or a single color for all of them.
+    linecolor : Union[NDArray, Color, None]
+        The flat list of line vertices colors, in the form of [r1, g1, b1, a1, r2, g2, b2, a2, ...],
+        or a single color for all of them.
+    facecolor : Union[NDArray, Color, None]
+        The flat list of face vertices colors, in the form of [r1, g1, b1, a1, r2, g2, b2, a2, ...],
+        or a single color for all of them.
 
     """
 
@@ -47,9 +58,9 @@ class BufferGeometry(Geometry):
         points: Optional[NDArray] = None,
         lines: Optional[NDArray] = None,
         faces: Optional[NDArray] = None,
-        pointcolor: Optional[NDArray] = None,
-        linecolor: Optional[NDArray] = None,
-        facecolor: Optional[NDArray] = None,
+        pointcolor: Optional[Union[NDArray, Color]] = None,
+        linecolor: Optional[Union[NDArray, Color]] = None,
+        facecolor: Optional[Union[NDArray, Color]] = None,
         **kwargs,
     ) -> None:
         super().__init__(**kwargs)
@@ -133,12 +144,26 @@ class BufferObject(ViewerSceneObject):
         else:
             return positions.shape[0]
 
+    @staticmethod
+    def _vertex_colors(colors: Optional[Union[NDArray, Color]], default: Color) -> Union[NDArray, Color]:
+        """The given colors, or the default color for all vertices if none are given."""
+        return default if colors is None else colors
+
+    def _uniform_colors(self) -> dict[str, Color]:
+        display = self.viewer.config.ui.display
+        colors = {
+            "_points_data": self._vertex_colors(self.buffergeometry.pointcolor, display.pointcolor),
+            "_lines_data": self._vertex_colors(self.buffergeometry.linecolor, display.linecolor),
+            "_frontfaces_data": self._vertex_colors(self.buffergeometry.facecolor, display.surfacecolor),
+        }
+        return {data_type: color for data_type, color in colors.items() if isinstance(color, Color)}
+
     def _read_points_data(self):
         """Read points data from the object."""
         if self.buffergeometry.points is None:
             return None
         positions = self.buffergeometry.points
-        colors = self.buffergeometry.pointcolor
+        colors = self._vertex_colors(self.buffergeometry.pointcolor, self.viewer.config.ui.display.pointcolor)
         elements = np.arange(self._get_num_vertices(positions), dtype=int)
         return positions, colors, elements
 
@@ -147,7 +172,7 @@ class BufferObject(ViewerSceneObject):
         if self.buffergeometry.lines is None:
             return None
         positions = self.buffergeometry.lines
-        colors = self.buffergeometry.linecolor
+        colors = self._vertex_colors(self.buffergeometry.linecolor, self.viewer.config.ui.display.linecolor)
         elements = np.arange(self._get_num_vertices(positions), dtype=int)
         return positions, colors, elements
 
@@ -156,15 +181,6 @@ class BufferObject(ViewerSceneObject):
         if self.buffergeometry.faces is None:
             return None
         positions = self.buffergeometry.faces
-        colors = self.buffergeometry.facecolor
+        colors = self._vertex_colors(self.buffergeometry.facecolor, self.viewer.config.ui.display.surfacecolor)
         elements = np.arange(self._get_num_vertices(positions), dtype=int)
         return positions, colors, elements
-
-    def _read_backfaces_data(self):
-        """Read backfaces data from the object."""
-        if self.buffergeometry.faces is None:
-            return None
-        positions = self.buffergeometry.faces
-        colors = self.buffergeometry.facecolor
-        elements = np.flip(np.arange(self._get_num_vertices(positions), dtype=int))
-        return positions, colors, elements
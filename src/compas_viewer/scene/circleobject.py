@@ -1,5 +1,6 @@
+import numpy as np
+
 from compas.geometry import Circle
-from compas.geometry import Line
 from compas.geometry import Point
 
 from .geometryobject import GeometryObject
@@ -19,5 +20,5 @@ class CircleObject(GeometryObject):
         return [self.geometry.center]
 
     @property
-    def lines(self) -> list[Line]:
-        return self.geometry.to_polyline(n=self.u).lines
+    def lines(self) -> np.ndarray:
+        return self._segments(self.geometry.to_points(n=self.u + 1))
@@ -1,13 +1,16 @@
+import hashlib
 from typing import Union
 
 import numpy as np
-from numpy import array
 
+import compas
+from compas.colors import Color
 from compas.data import Data
 from compas.datastructures import Mesh
 from compas.geometry import Geometry
 from compas.scene import GeometryObject
 
+from .arrays import as_point_array
 from .sceneobject import ShaderDataType
 from .sceneobject import ViewerSceneObject
 
@@ -23,11 +26,35 @@ class Collection(Data):
 
 
 class CollectionObject(ViewerSceneObject, GeometryObject):
-    """Viewer scene object for displaying a collection of COMPAS geometries."""
-
-    def __init__(self, **kwargs):
+    """Viewer scene object for displaying a collection of COMPAS geometries.
+
+    The points, lines and faces of the geometries are merged into one array each,
+    so that the collection is drawn as a single object.
+
+    Parameters
+    ----------
+    share_data : bool, optional
+        Whether geometries with the same data, by the hash of their content, are read only once.
+        Repeated references to the same geometry are always read once.
+        Hashing is faster than reading shapes, but slower than reading simple geometries such as points.
+    **kwargs : dict, optional
+        Additional options for the scene objects of the geometries.
+
+    Attributes
+    ----------
+    objects : list[:class:`compas_viewer.scene.ViewerSceneObject`]
+        The scene objects of the geometries.
+    share_data : bool
+        Whether geometries with the same data are read only once.
+    """
+
+    # The number of vertices of the elements of each data type
+    ELEMENT_SIZES = {"_points_data": 1, "_lines_data": 2, "_frontfaces_data": 3}
+
+    def __init__(self, share_data: bool = False, **kwargs):
         super().__init__(**kwargs)
         kwargs.pop("item")
+        self.share_data = share_data
         self.objects = [ViewerSceneObject(item=item, **kwargs) for item in self.collection.items]
 
     @property
@@ -35,57 +62,60 @@ class CollectionObject(ViewerSceneObject, GeometryObject):
         return self.item
 
     def _read_points_data(self) -> ShaderDataType:
-        positions = []
-        colors = []
-        elements = []
-        count = 0
-        for obj in self.objects:
-            p, c, e = obj._read_points_data() or ([], [], [])
-            positions += p
-            colors += c
-            elements += (array(e) + count).tolist()
-            count += len(p)
-
-        return positions, colors, elements
+        return self._merge_data("_points_data")
 
     def _read_lines_data(self) -> ShaderDataType:
-        positions = []
-        colors = []
-        elements = []
-        count = 0
-        for obj in self.objects:
-            p, c, e = obj._read_lines_data() or ([], [], [])
-            positions += p
-            colors += c
-            elements += (array(e) + count).tolist()
-            count += len(p)
-
-        return positions, colors, elements
+        return self._merge_data("_lines_data")
 
     def _read_frontfaces_data(self) -> ShaderDataType:
-        positions = []
-        colors = []
-        elements = []
-        count = 0
-        for obj in self.objects:
-            p, c, e = obj._read_frontfaces_data() or ([], [], [])
-            positions += p
-            colors += c
-            elements += (np.array(e) + count).tolist()
-            count += len(p)
-
-        return positions, colors, elements
-
-    def _read_backfaces_data(self) -> ShaderDataType:
-        positions = []
-        colors = []
-        elements = []
-        count = 0
+        return self._merge_data("_frontfaces_data")
+
+    @staticmethod
+    def _content_hash(item: Data) -> bytes:
+        """The hash of the type and data of an item, without its GUID, which differs between equal items."""
+        return hashlib.sha256(f"{item.__dtype__}:{compas.json_dumps(item.__data__)}".encode()).digest()
+
+    def _objects_data(self, data_type: str) -> list[tuple[np.ndarray, Union[np.ndarray, Color], np.ndarray]]:
+        """The data of each object as arrays, read once for objects with the same geometry."""
+        size = self.ELEMENT_SIZES[data_type]
+        keys = {}
+        cache = {}
+        datas = []
         for obj in self.objects:
-            p, c, e = obj._read_backfaces_data() or ([], [], [])
-            positions += p
-            colors += c
-            elements += (np.array(e) + count).tolist()
-            count += len(p)
-
-        return positions, colors, elements
+            key = keys.get(id(obj.item))
+            if key is None:
+                key = keys[id(obj.item)] = self._content_hash(obj.item) if self.share_data else id(obj.item)
+            data = cache.get(key)
+            if data is None:
+                positions, colors, elements = getattr(obj, f"_read{data_type}")() or ([], [], [])
+                positions = as_point_array(positions).reshape(-1, 3)
+                if not isinstance(colors, (Color, np.ndarray)):
+                    colors = [color.rgba if isinstance(color, Color) else color for color in colors]
+                if not isinstance(colors, Color):
+                    colors = np.asarray(colors, dtype=np.float32).reshape(-1, 4)
+                data = cache[key] = positions, colors, np.asarray(elements, dtype=np.int64).reshape(-1, size)
+            datas.append(data)
+        return datas
+
+    def _merge_data(self, data_type: str) -> ShaderDataType:
+        """Merge the data of the objects into arrays allocated once, offsetting the elements of each object by its first vertex."""
+        datas = self._objects_data(data_type)
+        counts = [len(positions) for positions, _, _ in datas]
+        starts = np.cumsum([0] + counts)
+        element_starts = np.cumsum([0] + [len(elements) for _, _, elements in datas])
+
+        positions = np.empty((starts[-1], 3), dtype=np.float32)
+        elements = np.empty((element_starts[-1], self.ELEMENT_SIZES[data_type]), dtype=np.int64)
+        for (p, _, e), start, element_start in zip(datas, starts, element_starts):
+            positions[start : start + len(p)] = p
+            elements[element_start : element_start + len(e)] = e + start
+
+        # A single color if all objects with vertices have the same single color
+        colors = [c for _, c, _ in datas]
+        uniform = [c for c, count in zip(colors, counts) if count]
+        if uniform and all(isinstance(c, Color) and c.rgba == uniform[0].rgba for c in uniform):
+            return positions, uniform[0], elements
+        merged = np.empty((starts[-1], 4), dtype=np.float32)
+        for c, start, count in zip(colors, starts, counts):
+            merged[start : start + count] = c.rgba if isinstance(c, Color) else c
+        return positions, merged, elements
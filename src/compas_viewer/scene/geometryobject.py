@@ -1,12 +1,15 @@
 from typing import Iterable
 from typing import Optional
+from typing import Union
+
+import numpy as np
 
 from compas.colors import Color
 from compas.geometry import Geometry
-from compas.itertools import flatten
 from compas.scene import GeometryObject as BaseGeometryObject
 from compas.scene.descriptors.color import ColorAttribute
 
+from .arrays import as_point_array
 from .sceneobject import ShaderDataType
 from .sceneobject import ViewerSceneObject
 
@@ -72,47 +75,49 @@ class GeometryObject(ViewerSceneObject, BaseGeometryObject):
         self.surfacecolor = color
 
     @property
-    def points(self) -> Optional[list[Iterable[float]]]:
+    def points(self) -> Optional[Union[list[Iterable[float]], np.ndarray]]:
         return None
 
     @property
-    def lines(self) -> Optional[list[Iterable[Iterable[float]]]]:
+    def lines(self) -> Optional[Union[list[Iterable[Iterable[float]]], np.ndarray]]:
         return None
 
     @property
     def viewmesh(self) -> Optional[tuple[list[Iterable[float]], list[Iterable[int]]]]:
         return None
 
+    def _uniform_colors(self) -> dict[str, Color]:
+        return {"_points_data": self.pointcolor, "_lines_data": self.linecolor, "_frontfaces_data": self.facecolor}
+
+    @staticmethod
+    def _segments(points: Union[list[Iterable[float]], np.ndarray], closed: bool = False) -> np.ndarray:
+        """The line segments between consecutive points, and between the last and the first point if closed, as an array of shape (n, 2, 3)."""
+        points = as_point_array(points).reshape(-1, 3)
+        if closed and len(points):
+            points = np.vstack([points, points[:1]])
+        return np.stack([points[:-1], points[1:]], axis=1)
+
     def _read_points_data(self) -> ShaderDataType:
-        if self.points is None:
+        points = self.points
+        if points is None:
             return [], [], []
-        positions = self.points
-        colors = [self.pointcolor] * len(positions)
-        elements = [[i] for i in range(len(positions))]
+        positions = as_point_array(points).reshape(-1, 3)
+        colors = self.pointcolor
+        elements = np.arange(len(positions)).reshape(-1, 1)
         return positions, colors, elements
 
     def _read_lines_data(self) -> ShaderDataType:
-        if self.lines is None:
+        lines = self.lines
+        if lines is None:
             return [], [], []
-        positions = []
-        elements = []
-        positions = list(flatten(self.lines))
-        colors = [self.linecolor] * len(positions)
-        elements = [[2 * i, 2 * i + 1] for i in range(len(self.lines))]
+        positions = as_point_array(lines).reshape(-1, 3)
+        colors = self.linecolor
+        elements = np.arange(len(positions)).reshape(-1, 2)
         return positions, colors, elements
 
     def _read_frontfaces_data(self) -> ShaderDataType:
         if self.viewmesh is None:
             return [], [], []
         positions, elements = self.viewmesh
-        colors = [self.facecolor] * len(positions)
-        return positions, colors, elements  # type: ignore
-
-    def _read_backfaces_data(self) -> ShaderDataType:
-        if self.viewmesh is None:
-            return [], [], []
-        positions, elements = self.viewmesh
-        for element in elements:
-            element.reverse()
-        colors = [self.facecolor] * len(positions)
+        colors = self.facecolor
         return positions, colors, elements  # type: ignore
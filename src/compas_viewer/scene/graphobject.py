@@ -1,6 +1,10 @@
+import numpy as np
+
+from compas.colors import Color
 from compas.datastructures import Graph
 from compas.scene import GraphObject as BaseGraphObject
 
+from .arrays import as_color_array
 from .sceneobject import ShaderDataType
 from .sceneobject import ViewerSceneObject
 
@@ -10,31 +14,28 @@ class GraphObject(ViewerSceneObject, BaseGraphObject):
 
     graph: Graph
 
+    def _uniform_colors(self) -> dict[str, Color]:
+        colors = {}
+        for data_type, colordict in [("_points_data", self.nodecolor), ("_lines_data", self.edgecolor)]:
+            # Without colors of their own, all nodes or edges have the default color
+            if not len(colordict):
+                colors[data_type] = colordict.default
+        return colors
+
     def _read_points_data(self) -> ShaderDataType:
-        positions = []
-        colors = []
-        elements = []
-        i = 0
-
-        for node in self.graph.nodes():
-            positions.append(self.graph.node_coordinates(node))
-            colors.append(self.nodecolor.default)
-            elements.append([i])
-            i += 1
+        nodes = list(self.graph.nodes())
+        positions = [self.graph.node_coordinates(node) for node in nodes]
+        colors = self._uniform_colors().get("_points_data")
+        if colors is None:
+            colors = as_color_array(self.nodecolor, nodes)
+        elements = np.arange(len(nodes)).reshape(-1, 1)
         return positions, colors, elements
 
     def _read_lines_data(self) -> ShaderDataType:
-        positions = []
-        colors = []
-        elements = []
-        i = 0
-
-        for u, v in self.graph.edges():
-            color = self.edgecolor.default
-            positions.append(self.graph.node_coordinates(u))
-            positions.append(self.graph.node_coordinates(v))
-            colors.append(color)
-            colors.append(color)
-            elements.append([i + 0, i + 1])
-            i += 2
+        edges = list(self.graph.edges())
+        positions = [self.graph.node_coordinates(node) for edge in edges for node in edge]
+        colors = self._uniform_colors().get("_lines_data")
+        if colors is None:
+            colors = np.repeat(as_color_array(self.edgecolor, edges), 2, axis=0)
+        elements = np.arange(len(positions)).reshape(-1, 2)
         return positions, colors, elements
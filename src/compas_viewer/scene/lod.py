@@ -0,0 +1,106 @@
+"""Levels of detail of triangle meshes, simplified with numpy."""
+
+from typing import Optional
+
+import numpy as np
+
+
+def cluster_vertices(positions, colors, triangles, resolution: int) -> Optional[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Simplify a triangle mesh by merging the vertices in the cells of a regular grid.
+
+    All vertices in a cell are replaced by their average, and the triangles that collapse are removed,
+    as in the vertex clustering of Rossignac and Borrel.
+    The deviation from the original mesh is bounded by the size of the cells.
+
+    Parameters
+    ----------
+    positions : array_like
+        The vertex positions, as an array of shape (n, 3).
+        The vertices do not have to be shared by the triangles, coincident vertices are merged.
+    colors : array_like
+        The vertex colors, as an array of shape (n, 4).
+    triangles : array_like
+        The vertex indices of the triangles, as an array of shape (m, 3).
+    resolution : int
+        The number of cells along the largest side of the bounding box of the mesh.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray] | None
+        The positions, colors and triangles of the simplified mesh, or None if the mesh has no extent.
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    colors = np.asarray(colors, dtype=np.float64).reshape(-1, 4)
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+
+    lower = positions.min(axis=0)
+    size = float((positions.max(axis=0) - lower).max())
+    if size <= 0:
+        return None
+
+    cells = np.minimum(((positions - lower) * (resolution / size)).astype(np.int64), resolution - 1)
+    keys = (cells[:, 0] * resolution + cells[:, 1]) * resolution + cells[:, 2]
+    _, clusters, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    clusters = clusters.reshape(-1)
+
+    # The average position and color of the vertices in each cell
+    merged_positions = np.column_stack([np.bincount(clusters, positions[:, i]) for i in range(3)]) / counts[:, None]
+    merged_colors = np.column_stack([np.bincount(clusters, colors[:, i]) for i in range(4)]) / counts[:, None]
+
+    # Remove the collapsed triangles, and the duplicates of triangles with the same vertices and orientation
+    merged = clusters[triangles]
+    merged = merged[(merged[:, 0] != merged[:, 1]) & (merged[:, 1] != merged[:, 2]) & (merged[:, 2] != merged[:, 0])]
+    if len(merged):
+        first = np.argmin(merged, axis=1)[:, None]
+        rotated = np.take_along_axis(merged, (first + np.arange(3)) % 3, axis=1)
+        _, unique = np.unique(rotated, axis=0, return_index=True)
+        merged = merged[np.sort(unique)]
+
+    # Only keep the vertices used by the remaining triangles
+    used, merged = np.unique(merged, return_inverse=True)
+    return merged_positions[used], merged_colors[used], merged.reshape(-1, 3)
+
+
+def lod_chain(positions, colors, triangles, levels: int = 4, reduction: float = 0.5, minimum: int = 12) -> list[tuple[np.ndarray, np.ndarray, np.ndarray, int]]:
+    """Compute increasingly simplified versions of a triangle mesh.
+
+    The resolution of the grid of :func:`cluster_vertices` is halved from one level to the next,
+    starting from about the number of vertices along a side of the mesh.
+    Levels that do not remove enough triangles are skipped.
+
+    Parameters
+    ----------
+    positions : array_like
+        The vertex positions, as an array of shape (n, 3).
+    colors : array_like
+        The vertex colors, as an array of shape (n, 4).
+    triangles : array_like
+        The vertex indices of the triangles, as an array of shape (m, 3).
+    levels : int, optional
+        The maximum number of levels, not counting the original mesh.
+    reduction : float, optional
+        The maximum ratio of the number of triangles of a level to the previous one.
+    minimum : int, optional
+        The minimum number of triangles of the original mesh, and of a level to simplify it further.
+
+    Returns
+    -------
+    list[tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, int]]
+        The positions, colors, triangles and grid resolution of each level, from fine to coarse.
+    """
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    chain = []
+    count = len(triangles)
+    if count < minimum:
+        return chain
+
+    resolution = 2 ** int(np.ceil(np.log2(max(np.sqrt(count), 2))))
+    while resolution >= 2 and len(chain) < levels and count >= minimum:
+        level = cluster_vertices(positions, colors, triangles, resolution)
+        if level is None:
+            break
+        if len(level[2]) and len(level[2]) <= count * reduction:
+            chain.append((*level, resolution))
+            count = len(level[2])
+        resolution //= 2
+    return chain
@@ -1,17 +1,21 @@
+from itertools import chain
+from itertools import compress
 from typing import Any
 from typing import Dict
 from typing import Optional
 from typing import Union
 
+import numpy as np
+
 from compas.colors import Color
 from compas.datastructures import Mesh
-from compas.geometry import centroid_points
-from compas.geometry import is_coplanar
-from compas.itertools import pairwise
 from compas.scene import MeshObject as BaseMeshObject
 from compas.scene.descriptors.colordict import ColorDictAttribute
 
+from .arrays import as_color_array
+from .lod import lod_chain
 from .sceneobject import ShaderDataType
+from .sceneobject import VerticesDataType
 from .sceneobject import ViewerSceneObject
 
 ColorDictValueType = Optional[Union[Dict[Any, Color], Color]]
@@ -34,6 +38,10 @@ class MeshObject(ViewerSceneObject, BaseMeshObject):
         True to hide the coplanar edges. Defaults to the value of `hide_coplanaredges` in `viewer.config`.
     use_vertexcolors : bool, optional
         True to use vertex color. Defaults to the value of `use_vertexcolors` in `viewer.config`.
+    lod : bool, optional
+        True to draw simplified versions of the faces when the mesh is small on screen. Defaults to False.
+    indexed : bool, optional
+        True to share the vertices of the points, lines and faces. Defaults to True.
     **kwargs : dict, optional
         Additional options for the :class:`compas_viewer.scene.ViewerSceneObject` and :class:`compas.scene.MeshObject`.
 
@@ -45,6 +53,15 @@ class MeshObject(ViewerSceneObject, BaseMeshObject):
         True to use vertex color. Defaults to False.
     hide_coplanaredges : bool
         True to hide the coplanar edges.
+    lod : bool
+        True to draw simplified versions of the faces when the mesh is small on screen.
+        The levels of detail are computed with the buffers, and are not updated with the data of the mesh.
+    indexed : bool
+        True to store each vertex of the mesh once for all points, lines and faces with the same color,
+        instead of once per corner of each point, line and triangle.
+        Vertices are only split where their points, lines or faces have different colors,
+        unless the points, lines and faces each have a single color, which is stored in the settings of the object.
+        Changes take effect when the object is added to the buffers.
 
     See Also
     --------
@@ -59,6 +76,9 @@ class MeshObject(ViewerSceneObject, BaseMeshObject):
 
     mesh: Mesh
 
+    # The largest sine of the angle between the normals of two faces considered coplanar
+    COPLANAR_TOLERANCE = 1e-5
+
     def __init__(
         self,
         show_points: Optional[bool] = None,
@@ -67,6 +87,8 @@ class MeshObject(ViewerSceneObject, BaseMeshObject):
         linewidth: Optional[int] = None,
         hide_coplanaredges: Optional[bool] = None,
         use_vertexcolors: Optional[bool] = None,
+        lod: Optional[bool] = None,
+        indexed: Optional[bool] = None,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -79,6 +101,9 @@ class MeshObject(ViewerSceneObject, BaseMeshObject):
 
         self.hide_coplanaredges = hide_coplanaredges if hide_coplanaredges is not None else False
         self.use_vertexcolors = use_vertexcolors if use_vertexcolors is not None else False
+        self.lod = lod if lod is not None else False
+        self.indexed = indexed if indexed is not None else True
+        self._coplanar_cache = None
 
     @property
     def pointcolor(self) -> Color:
@@ -128,182 +153,297 @@ class MeshObject(ViewerSceneObject, BaseMeshObject):
     def linewidth(self, size: float):
         self.edgesize = size
 
+    def _read_vertices_data(self) -> Optional[VerticesDataType]:
+        if not self.indexed:
+            return None
+        keys, vertex_positions = self._vertex_positions()
+        index = self._key_index(keys)
+        vertex_colors = as_color_array(self.vertexcolor, keys)
+        edges = self._shown_edges(keys, vertex_positions)
+        edge_vertices = index(np.array(edges, dtype=np.int64).reshape(-1))
+        faces, vertices, starts, sizes = self._faces(keys)
+        triangle_faces, corners, color_vertices = self._triangle_corners(vertices, starts, sizes)
+
+        # The centroids of the polygons follow the vertices
+        centroids = self._centroids(vertex_positions, vertices, starts, sizes, (sizes != 3) & (sizes != 4))
+        positions = np.vstack([vertex_positions, centroids])
+        corner_faces = np.repeat(triangle_faces, 3)
+        corners = np.where(corners < 0, len(keys) + corner_faces, corners)
+        if self.use_vertexcolors:
+            face_colors = vertex_colors, color_vertices
+        else:
+            face_colors = as_color_array(self.facecolor, faces), corner_faces
+        groups = [
+            (np.arange(len(keys)), vertex_colors, np.arange(len(keys))),
+            (edge_vertices, as_color_array(self.edgecolor, edges), np.repeat(np.arange(len(edges)), 2)),
+            (corners, *face_colors),
+        ]
+
+        uniform = self._uniform_colors()
+        if len(uniform) == 3:
+            # The points, lines and faces take their single colors from the settings, so no vertices are split by color
+            table = [uniform["_frontfaces_data"].rgba]
+            groups = [(vertices, table, np.zeros(len(vertices), dtype=np.int64)) for vertices, _, _ in groups]
+
+        positions, colors, elements = self._share_vertices(positions, groups)
+        self._subobject_keys["vertex"] = keys
+        self._subobject_keys["edge"] = edges
+        self._subobject_keys["face"] = [faces[i] for i in triangle_faces]
+        points, lines, frontfaces = elements
+        return positions, colors, {"_points_data": points.reshape(-1, 1), "_lines_data": lines.reshape(-1, 2), "_frontfaces_data": frontfaces.reshape(-1, 3)}
+
     def _read_points_data(self) -> ShaderDataType:
-        positions = []
-        colors = []
-        elements = []
-        i = 0
-
-        for vertex in self.mesh.vertices():
-            positions.append(self.mesh.vertex_coordinates(vertex))
-            colors.append(self.vertexcolor[vertex])
-            elements.append([i])
-            i += 1
+        if self._vertices_data is not None:
+            return self._shared_data("_points_data")
+        keys, positions = self._vertex_positions()
+        colors = self._uniform_colors().get("_points_data")
+        if colors is None:
+            colors = as_color_array(self.vertexcolor, keys)
+        elements = np.arange(len(keys)).reshape(-1, 1)
+        self._subobject_keys["vertex"] = keys
         return positions, colors, elements
 
     def _read_lines_data(self) -> ShaderDataType:
-        positions = []
-        colors = []
-        elements = []
-        i = 0
-
-        for u, v in self.mesh.edges():
-            color = self.edgecolor[(u, v)]
-            if self.hide_coplanaredges:
-                # hide the edge if neighbor faces are coplanar
-                fkeys = self.mesh.edge_faces((u, v))
-                if not self.mesh.is_edge_on_boundary((u, v)):
-                    ps = [
-                        self.mesh.face_center(fkeys[0]),
-                        self.mesh.face_center(fkeys[1]),
-                        *self.mesh.edge_coordinates((u, v)),
-                    ]
-                    if is_coplanar(ps, tol=1e-5):
-                        continue
-            positions.append(self.mesh.vertex_coordinates(u))
-            positions.append(self.mesh.vertex_coordinates(v))
-            colors.append(color)
-            colors.append(color)
-            elements.append([i + 0, i + 1])
-            i += 2
-        return positions, colors, elements
+        if self._vertices_data is not None:
+            return self._shared_data("_lines_data")
+        keys, positions = self._vertex_positions()
+        edges = self._shown_edges(keys, positions)
+        vertices = self._key_index(keys)(np.array(edges, dtype=np.int64).reshape(-1))
+        colors = self._uniform_colors().get("_lines_data")
+        if colors is None:
+            colors = np.repeat(as_color_array(self.edgecolor, edges), 2, axis=0)
+        elements = np.arange(len(vertices)).reshape(-1, 2)
+        self._subobject_keys["edge"] = edges
+        return positions[vertices], colors, elements
 
     def _read_frontfaces_data(self) -> ShaderDataType:
-        positions = []
-        colors = []
-        elements = []
-        i = 0
-
-        for face in self.mesh.faces():
-            vertices = self.mesh.face_vertices(face)
-            color = self.facecolor[face]
-            if len(vertices) == 3:
-                a, b, c = vertices
-                positions.append(self.mesh.vertex_coordinates(a))
-                positions.append(self.mesh.vertex_coordinates(b))
-                positions.append(self.mesh.vertex_coordinates(c))
-                if self.use_vertexcolors:
-                    colors.append(self.vertexcolor[a])
-                    colors.append(self.vertexcolor[b])
-                    colors.append(self.vertexcolor[c])
-                else:
-                    colors.append(color)
-                    colors.append(color)
-                    colors.append(color)
-                elements.append([i + 0, i + 1, i + 2])
-                i += 3
-            elif len(vertices) == 4:
-                a, b, c, d = vertices
-                positions.append(self.mesh.vertex_coordinates(a))
-                positions.append(self.mesh.vertex_coordinates(b))
-                positions.append(self.mesh.vertex_coordinates(c))
-                positions.append(self.mesh.vertex_coordinates(a))
-                positions.append(self.mesh.vertex_coordinates(c))
-                positions.append(self.mesh.vertex_coordinates(d))
-                if self.use_vertexcolors:
-                    colors.append(self.vertexcolor[a])
-                    colors.append(self.vertexcolor[b])
-                    colors.append(self.vertexcolor[c])
-                    colors.append(self.vertexcolor[a])
-                    colors.append(self.vertexcolor[c])
-                    colors.append(self.vertexcolor[d])
-                else:
-                    colors.append(color)
-                    colors.append(color)
-                    colors.append(color)
-                    colors.append(color)
-                    colors.append(color)
-                    colors.append(color)
-                elements.append([i + 0, i + 1, i + 2])
-                elements.append([i + 3, i + 4, i + 5])
-                i += 6
-            else:
-                points = [self.mesh.vertex_coordinates(vertex) for vertex in vertices]
-                c = centroid_points(points)
-                for a, b in pairwise(points + points[:1]):
-                    positions.append(a)
-                    positions.append(b)
-                    positions.append(c)
-                    if self.use_vertexcolors:
-                        colors.append(self.vertexcolor[vertices[0]])
-                        colors.append(self.vertexcolor[vertices[1]])
-                        colors.append(self.vertexcolor[vertices[2]])
-                    else:
-                        colors.append(color)
-                        colors.append(color)
-                        colors.append(color)
-                    elements.append([i + 0, i + 1, i + 2])
-                    i += 3
-
+        if self._vertices_data is not None:
+            return self._shared_data("_frontfaces_data")
+        positions, colors, elements, faces = self._triangulate()
+        self._subobject_keys["face"] = faces
         return positions, colors, elements
 
-    def _read_backfaces_data(self) -> ShaderDataType:
-        positions = []
-        colors = []
-        elements = []
-        i = 0
-
-        for face in self.mesh.faces():
-            vertices = self.mesh.face_vertices(face)[::-1]
-            color = self.facecolor[face]
-            if len(vertices) == 3:
-                a, b, c = vertices
-                positions.append(self.mesh.vertex_coordinates(a))
-                positions.append(self.mesh.vertex_coordinates(b))
-                positions.append(self.mesh.vertex_coordinates(c))
-                if self.use_vertexcolors:
-                    colors.append(self.vertexcolor[a])
-                    colors.append(self.vertexcolor[b])
-                    colors.append(self.vertexcolor[c])
-                else:
-                    colors.append(color)
-                    colors.append(color)
-                    colors.append(color)
-                elements.append([i + 0, i + 1, i + 2])
-                i += 3
-            elif len(vertices) == 4:
-                a, b, c, d = vertices
-                positions.append(self.mesh.vertex_coordinates(a))
-                positions.append(self.mesh.vertex_coordinates(b))
-                positions.append(self.mesh.vertex_coordinates(c))
-                positions.append(self.mesh.vertex_coordinates(a))
-                positions.append(self.mesh.vertex_coordinates(c))
-                positions.append(self.mesh.vertex_coordinates(d))
-                if self.use_vertexcolors:
-                    colors.append(self.vertexcolor[a])
-                    colors.append(self.vertexcolor[b])
-                    colors.append(self.vertexcolor[c])
-                    colors.append(self.vertexcolor[a])
-                    colors.append(self.vertexcolor[c])
-                    colors.append(self.vertexcolor[d])
-                else:
-                    colors.append(color)
-                    colors.append(color)
-                    colors.append(color)
-                    colors.append(color)
-                    colors.append(color)
-                    colors.append(color)
-                elements.append([i + 0, i + 1, i + 2])
-                elements.append([i + 3, i + 4, i + 5])
-                i += 6
-            else:
-                points = [self.mesh.vertex_coordinates(vertex) for vertex in vertices]
-                c = centroid_points(points)
-                for a, b in pairwise(points + points[:1]):
-                    positions.append(a)
-                    positions.append(b)
-                    positions.append(c)
-                    if self.use_vertexcolors:
-                        colors.append(self.vertexcolor[vertices[0]])
-                        colors.append(self.vertexcolor[vertices[1]])
-                        colors.append(self.vertexcolor[vertices[2]])
-                    else:
-                        colors.append(color)
-                        colors.append(color)
-                        colors.append(color)
-                    elements.append([i + 0, i + 1, i + 2])
-                    i += 3
-        return positions, colors, elements
+    def _shared_data(self, data_type: str) -> ShaderDataType:
+        """The points, lines or faces data referencing the shared vertices."""
+        positions, colors, elements = self._vertices_data
+        uniform = self._uniform_colors()
+        if len(uniform) == 3:
+            colors = uniform[data_type]
+        return positions, colors, elements[data_type]
+
+    def _uniform_colors(self) -> dict[str, Color]:
+        colors = {}
+        facecolor = self.vertexcolor if self.use_vertexcolors else self.facecolor
+        for data_type, colordict in [("_points_data", self.vertexcolor), ("_lines_data", self.edgecolor), ("_frontfaces_data", facecolor)]:
+            # Without colors of their own, all vertices, edges or faces have the default color
+            if not len(colordict):
+                colors[data_type] = colordict.default
+        return colors
+
+    def _vertex_positions(self) -> tuple[list, np.ndarray]:
+        """The keys of the vertices, and their coordinates as an array of shape (n, 3)."""
+        vertices = self.mesh.vertex
+        x, y, z = (self.mesh.default_vertex_attributes.get(name) for name in "xyz")
+        positions = np.array([(attr.get("x", x), attr.get("y", y), attr.get("z", z)) for attr in vertices.values()], dtype=np.float64)
+        return list(vertices), positions.reshape(-1, 3)
+
+    @staticmethod
+    def _key_index(keys: list):
+        """A function mapping an array of vertex or face keys to their indices in a list of keys."""
+        keys = np.array(keys, dtype=np.int64)
+        if np.array_equal(keys, np.arange(len(keys))):
+            return lambda vertices: vertices
+        order = np.argsort(keys)
+        return lambda vertices: order[np.searchsorted(keys, vertices, sorter=order)]
+
+    def _edges(self) -> list[tuple[int, int]]:
+        """The edges of the mesh, in the order of :meth:`compas.datastructures.Mesh.edges`."""
+        halfedges = [(u, v) for u, neighbors in self.mesh.halfedge.items() for v in neighbors]
+        if not halfedges:
+            return []
+        pairs = np.sort(np.array(halfedges, dtype=np.int64), axis=1)
+        pairs -= pairs.min()
+        # The first of the two halfedges of each edge
+        _, first = np.unique(pairs[:, 0] * (pairs.max() + 1) + pairs[:, 1], return_index=True)
+        return [halfedges[i] for i in np.sort(first)]
+
+    def _shown_edges(self, keys: list, positions: np.ndarray) -> list[tuple[int, int]]:
+        """The edges drawn as lines, without the coplanar ones if they are hidden."""
+        edges = self._edges()
+        if self.hide_coplanaredges:
+            # hide the edge if neighbor faces are coplanar
+            edges = list(compress(edges, ~self._coplanar_edges(keys, positions, edges)))
+        return edges
+
+    def _coplanar_edges(self, keys: list, positions: np.ndarray, edges: list[tuple[int, int]]) -> np.ndarray:
+        """Whether each edge is between two faces with parallel normals.
+
+        The normals of all faces are computed at once, and compared for the two faces of each edge.
+        The result is cached until the vertex positions, the faces or the edges of the mesh change.
+        """
+        halfedge = self.mesh.halfedge
+        # The faces on both sides of each edge, with NaN for the missing face of a boundary edge
+        edge_faces = np.array([[halfedge[u][v], halfedge[v][u]] for u, v in edges], dtype=np.float64).reshape(-1, 2)
+        faces, vertices, starts, sizes = self._faces(keys)
+        key = (positions, vertices, sizes, edge_faces)
+        cached = self._coplanar_cache
+        if cached is not None and all(np.array_equal(a, b) for a, b in zip(cached[0], key)):
+            return cached[1]
+
+        normals = self._face_normals(positions, vertices, starts, sizes)
+        lengths = np.linalg.norm(normals, axis=1)
+        # Degenerate faces have no normal, and are not coplanar with their neighbours
+        normals = np.divide(normals, lengths[:, None], out=np.zeros_like(normals), where=lengths[:, None] > 0)
+        inner = ~np.isnan(edge_faces).any(axis=1)
+        adjacent = normals[self._key_index(faces)(edge_faces[inner].astype(np.int64))]
+        coplanar = np.zeros(len(edges), dtype=bool)
+        sines = np.linalg.norm(np.cross(adjacent[:, 0], adjacent[:, 1]), axis=1)
+        coplanar[inner] = (sines <= self.COPLANAR_TOLERANCE) & (np.abs(adjacent).sum(axis=(1, 2)) > 0)
+        self._coplanar_cache = (key, coplanar)
+        return coplanar
+
+    @staticmethod
+    def _face_normals(positions: np.ndarray, vertices: np.ndarray, starts: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+        """The area-weighted normals of the faces, from the cross products of their edges relative to their first vertices."""
+        corner_faces = np.repeat(np.arange(len(sizes)), sizes)
+        offsets = np.arange(len(vertices)) - starts[corner_faces]
+        origins = positions[vertices[starts[corner_faces]]]
+        a = positions[vertices] - origins
+        b = positions[vertices[starts[corner_faces] + (offsets + 1) % sizes[corner_faces]]] - origins
+        products = np.cross(a, b).reshape(-1, 3)
+        return np.column_stack([np.bincount(corner_faces, products[:, i], minlength=len(sizes)) for i in range(3)]).reshape(-1, 3)
+
+    def _faces(self, keys: list) -> tuple[list, np.ndarray, np.ndarray, np.ndarray]:
+        """The keys of the faces, the indices of their vertices as a flat array, and the first vertex and number of vertices of each face."""
+        faces = list(self.mesh.face)
+        polygons = [self.mesh.face_vertices(face) for face in faces]
+        sizes = np.fromiter(map(len, polygons), dtype=np.int64, count=len(polygons))
+        vertices = self._key_index(keys)(np.fromiter(chain.from_iterable(polygons), dtype=np.int64, count=int(sizes.sum())))
+        return faces, vertices, np.cumsum(sizes) - sizes, sizes
+
+    @staticmethod
+    def _triangle_corners(vertices: np.ndarray, starts: np.ndarray, sizes: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Triangulate faces with array operations.
+
+        Triangles are kept, quads are split along their first diagonal,
+        and other polygons are split into triangles from each edge to the centroid.
+
+        Parameters
+        ----------
+        vertices : numpy.ndarray
+            The indices of the vertices of the faces, as a flat array.
+        starts : numpy.ndarray
+            The first vertex of each face.
+        sizes : numpy.ndarray
+            The number of vertices of each face.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+            The face of each triangle, the vertex of each corner, or -1 for the centroid of the face,
+            and the vertex whose color each corner takes when using vertex colors.
+        """
+        # The corners of the triangles of each face, as offsets of its vertices, or -1 for the centroid
+        is_triangle, is_quad = sizes == 3, sizes == 4
+        counts = np.where(is_triangle, 1, np.where(is_quad, 2, sizes))
+        triangle_faces = np.repeat(np.arange(len(sizes)), counts)
+        offsets = np.zeros((len(triangle_faces), 3), dtype=np.int64)
+        first = np.cumsum(counts) - counts
+        offsets[first[is_triangle]] = [0, 1, 2]
+        offsets[first[is_quad]] = [0, 1, 2]
+        offsets[first[is_quad] + 1] = [0, 2, 3]
+        is_polygon = ~is_triangle & ~is_quad
+        polygon_triangles = np.flatnonzero(is_polygon[triangle_faces])
+        k = polygon_triangles - first[triangle_faces[polygon_triangles]]
+        offsets[polygon_triangles] = np.column_stack([k, (k + 1) % sizes[triangle_faces[polygon_triangles]], np.full(len(k), -1)])
+
+        corner_faces = np.repeat(triangle_faces, 3)
+        corners = offsets.reshape(-1)
+        corner_vertices = np.where(corners < 0, -1, vertices[starts[corner_faces] + np.maximum(corners, 0)])
+        # The triangles of other polygons take the colors of the first three vertices of the polygon
+        corners = np.where(is_polygon[corner_faces], np.tile([0, 1, 2], len(triangle_faces)), corners)
+        return triangle_faces, corner_vertices, vertices[starts[corner_faces] + corners]
+
+    def _triangulate(self) -> tuple[np.ndarray, Union[np.ndarray, Color], np.ndarray, list]:
+        """Triangulate the faces of the mesh, with separate vertices for the corners of the triangles.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray | :class:`compas.colors.Color`, numpy.ndarray, list]
+            The positions and colors of the corners of the triangles, or a single color for all faces,
+            their indices, and the key of the face of each triangle.
+        """
+        keys, vertex_positions = self._vertex_positions()
+        faces, vertices, starts, sizes = self._faces(keys)
+        triangle_faces, corners, color_vertices = self._triangle_corners(vertices, starts, sizes)
+
+        corner_faces = np.repeat(triangle_faces, 3)
+        is_centroid = corners < 0
+        positions = vertex_positions[corners]
+        if is_centroid.any():
+            positions[is_centroid] = self._centroids(vertex_positions, vertices, starts, sizes, (sizes != 3) & (sizes != 4))[corner_faces[is_centroid]]
+
+        colors = self._uniform_colors().get("_frontfaces_data")
+        if colors is None and self.use_vertexcolors:
+            colors = as_color_array(self.vertexcolor, keys)[color_vertices]
+        elif colors is None:
+            colors = as_color_array(self.facecolor, faces)[corner_faces]
+
+        elements = np.arange(len(corner_faces)).reshape(-1, 3)
+        return positions, colors, elements, [faces[i] for i in triangle_faces]
+
+    @staticmethod
+    def _centroids(positions: np.ndarray, vertices: np.ndarray, starts: np.ndarray, sizes: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """The centroids of the faces in a mask, summing the coordinates in order like :func:`compas.geometry.centroid_points`."""
+        centroids = np.zeros((len(sizes), 3))
+        for size in np.unique(sizes[mask]):
+            selected = np.flatnonzero(mask & (sizes == size))
+            total = np.zeros((len(selected), 3))
+            for i in range(size):
+                total = total + positions[vertices[starts[selected] + i]]
+            centroids[selected] = total / size
+        return centroids
+
+    @staticmethod
+    def _share_vertices(positions: np.ndarray, corners: list[tuple[np.ndarray, np.ndarray, np.ndarray]]) -> tuple[np.ndarray, np.ndarray, list[np.ndarray]]:
+        """Merge the corners of primitives with the same position and color into shared vertices.
+
+        Parameters
+        ----------
+        positions : numpy.ndarray
+            The positions the corners refer to, as an array of shape (n, 3).
+        corners : list[tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]]
+            For each group of primitives, the position of each corner,
+            and a table of colors of shape (k, 4) with the index of the color of each corner in it.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray, list[numpy.ndarray]]
+            The positions and colors of the shared vertices, and the vertex of each corner of each group.
+        """
+        # Number the distinct colors, as the vertex colors are stored in single precision
+        tables = [np.asarray(table, dtype=np.float32).reshape(-1, 4) for _, table, _ in corners]
+        offsets = np.cumsum([0] + [len(table) for table in tables])
+        palette, numbers = np.unique(np.ascontiguousarray(np.concatenate(tables)).view(np.dtype((np.void, 16))).reshape(-1), return_inverse=True)
+        palette = palette.view(np.float32).reshape(-1, 4)
+        numbers = numbers.reshape(-1)
+
+        keys = np.concatenate([vertices * len(palette) + numbers[offset + index] for (vertices, _, index), offset in zip(corners, offsets)])
+        shared, vertices = np.unique(keys, return_inverse=True)
+        groups = np.split(vertices.reshape(-1), np.cumsum([len(group[0]) for group in corners])[:-1])
+        return positions[shared // len(palette)], palette[shared % len(palette)], groups
+
+    def _read_lods_data(self) -> Optional[list[tuple[np.ndarray, np.ndarray, np.ndarray, int]]]:
+        if not self.lod or not self._frontfaces_data:
+            return None
+        positions, colors, elements = self._frontfaces_data
+        if not len(elements):
+            return None
+        if isinstance(colors, Color):
+            colors = np.tile(colors.rgba, (len(positions), 1))
+        # Leave out the shared vertices of the points and lines, which have other colors
+        used, elements = np.unique(elements, return_inverse=True)
+        return lod_chain(np.asarray(positions)[used], np.asarray(colors)[used], elements.reshape(-1, 3)) or None
 
     def draw_vertices(self):
         return None
@@ -1,9 +1,9 @@
 from typing import Optional
 
-from compas.geometry import Line
+import numpy as np
+
 from compas.geometry import NurbsCurve
 from compas.geometry import Point
-from compas.itertools import pairwise
 
 from .geometryobject import GeometryObject
 
@@ -18,9 +18,5 @@ class NurbsCurveObject(GeometryObject):
         return self.geometry.points
 
     @property
-    def lines(self) -> Optional[list[Line]]:
-        lines = []
-        polyline = self.geometry.to_polyline()
-        for pair in pairwise(polyline.points):
-            lines.append(Line(*pair))
-        return lines
+    def lines(self) -> Optional[np.ndarray]:
+        return self._segments(self.geometry.to_polyline().points)
@@ -1,9 +1,8 @@
+import numpy as np
 from compas_occ.brep import OCCBrep
 
-from compas.geometry import Line
 from compas.geometry import NurbsSurface
 from compas.geometry import Point
-from compas.itertools import pairwise
 from compas.tolerance import TOL
 
 from .geometryobject import GeometryObject
@@ -24,13 +23,8 @@ class NurbsSurfaceObject(GeometryObject):
         return self._brep.points
 
     @property
-    def lines(self) -> list[Line]:
-        lines = []
-        for polyline in self._boundaries:
-            for pair in pairwise(polyline.points):
-                lines.append(Line(*pair))
-
-        return lines
+    def lines(self) -> np.ndarray:
+        return np.concatenate([self._segments(polyline.points) for polyline in self._boundaries] or [np.zeros((0, 2, 3))])
 
     @property
     def viewmesh(self) -> tuple[list[Point], list[list[int]]]:
@@ -0,0 +1,432 @@
+"""Point clouds stored out of core, in an octree of files that are loaded on demand.
+
+The octree is built once from a large point cloud with :func:`build_octree`, or from the command line::
+
+    python -m compas_viewer.scene.octree scan.ply scan-octree
+
+Every node stores a subsample of the points in its cube, about evenly spaced,
+and passes the remaining points on to its eight children.
+Drawing a node together with all its ancestors shows the points of its cube at the density of the node,
+so the cloud can be refined by loading more nodes where the camera needs them.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Iterator
+from typing import Optional
+from typing import Union
+
+import numpy as np
+
+from compas.geometry import Geometry
+
+HEADER = "octree.json"
+
+# The points of the nodes, relative to the offset of the octree
+NODE_DTYPE = np.dtype([("position", "<f4", (3,)), ("color", "u1", (4,))])
+
+# The points while the octree is built
+BUILD_DTYPE = np.dtype([("position", "<f8", (3,)), ("color", "u1", (4,))])
+
+
+class OctreePointcloud(Geometry):
+    """A point cloud stored on disk as an octree, built with :func:`build_octree`.
+
+    Only the header of the octree is read when the point cloud is opened.
+    The points of the nodes are read with :meth:`load`.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        The folder of the octree.
+
+    Attributes
+    ----------
+    path : pathlib.Path
+        The folder of the octree.
+    offset : numpy.ndarray
+        The point the positions in the node files are relative to.
+    count : int
+        The total number of points.
+    has_colors : bool
+        Whether the points have colors.
+    names : list[str]
+        The names of the nodes, where ``"r"`` is the root and each next character the octant of a child.
+    counts : numpy.ndarray
+        The number of points of each node.
+    boxes : numpy.ndarray
+        The cube of each node, as an array of shape (m, 2, 3) of min and max corners.
+    spacing : numpy.ndarray
+        The distance between the points of each node.
+    children : numpy.ndarray
+        The indices of the eight children of each node, -1 if missing, as an array of shape (m, 8).
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        with open(self.path / HEADER) as f:
+            header = json.load(f)
+        self.offset = np.array(header["offset"], dtype=np.float64)
+        self.count = int(header["count"])
+        self.has_colors = bool(header["colors"])
+
+        nodes = header["nodes"]
+        self.names = sorted(nodes, key=lambda name: (len(name), name))
+        index = {name: i for i, name in enumerate(self.names)}
+        self.counts = np.array([nodes[name]["count"] for name in self.names], dtype=np.int64)
+        lower = np.array([nodes[name]["lower"] for name in self.names], dtype=np.float64).reshape(-1, 3)
+        edge = np.array([nodes[name]["edge"] for name in self.names], dtype=np.float64)
+        self.boxes = np.stack([lower, lower + edge[:, None]], axis=1)
+        self.spacing = np.array([nodes[name]["spacing"] for name in self.names], dtype=np.float64)
+        self.children = np.full((len(self.names), 8), -1, dtype=np.int64)
+        for i, name in enumerate(self.names):
+            if len(name) > 1:
+                self.children[index[name[:-1]], int(name[-1])] = i
+
+    def __repr__(self):
+        return f"OctreePointcloud({str(self.path)!r})"
+
+    @property
+    def __data__(self):
+        return {"path": str(self.path)}
+
+    def transform(self, transformation):
+        raise NotImplementedError("The points of an octree cannot be transformed, transform its scene object instead.")
+
+    def load(self, node: int) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """Read the points of a node.
+
+        Parameters
+        ----------
+        node : int
+            The index of the node.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray | None]
+            The positions as a float32 array of shape (n, 3),
+            and the colors as a float32 array of shape (n, 4), or None if the points have no colors.
+        """
+        data = np.load(self.path / "nodes" / f"{self.names[node]}.npy")
+        positions = (data["position"] + self.offset).astype(np.float32)
+        colors = (data["color"] / np.float32(255)).astype(np.float32) if self.has_colors else None
+        return positions, colors
+
+
+# =============================================================================
+# Reading point clouds
+# =============================================================================
+
+
+def read_points(path: Union[str, os.PathLike], chunksize: int = 1_000_000) -> Iterator[tuple[np.ndarray, Optional[np.ndarray]]]:
+    """Read a point cloud file in chunks.
+
+    Supported are ``.npy`` arrays of shape (n, 3) with XYZ or (n, 6) with XYZRGB,
+    ``.ply`` files with ``x``, ``y``, ``z`` and optionally ``red``, ``green``, ``blue`` vertex properties,
+    text files with XYZ or XYZRGB columns, and ``.las`` or ``.laz`` files if ``laspy`` is installed.
+    Colors are read as 0 to 1 if they are stored as floats that are all at most 1, and as 0 to 255 otherwise.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        The file.
+    chunksize : int, optional
+        The maximum number of points per chunk.
+
+    Yields
+    ------
+    tuple[numpy.ndarray, numpy.ndarray | None]
+        The positions as a float64 array of shape (n, 3),
+        and the colors as a uint8 array of shape (n, 4), or None if the file has no colors.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".npy":
+        yield from _read_npy(path, chunksize)
+    elif suffix == ".ply":
+        yield from _read_ply(path, chunksize)
+    elif suffix in (".las", ".laz"):
+        yield from _read_las(path, chunksize)
+    else:
+        yield from _read_text(path, chunksize)
+
+
+def _colors(rgb: np.ndarray, integer: bool) -> np.ndarray:
+    """Convert RGB values to RGBA bytes."""
+    rgb = np.asarray(rgb)
+    if not integer and rgb.max(initial=0) <= 1:
+        rgb = rgb * 255 + 0.5
+    rgb = np.clip(rgb, 0, 255)
+    colors = np.full((len(rgb), 4), 255, dtype=np.uint8)
+    colors[:, :3] = rgb
+    return colors
+
+
+def _read_npy(path: Path, chunksize: int):
+    data = np.load(path, mmap_mode="r")
+    integer = np.issubdtype(data.dtype, np.integer)
+    for start in range(0, len(data), chunksize):
+        chunk = np.asarray(data[start : start + chunksize])
+        yield chunk[:, :3].astype(np.float64), _colors(chunk[:, 3:6], integer) if chunk.shape[1] >= 6 else None
+
+
+def _read_text(path: Path, chunksize: int):
+    with open(path) as f:
+        while True:
+            chunk = np.loadtxt(f, max_rows=chunksize, ndmin=2, delimiter="," if path.suffix.lower() == ".csv" else None)
+            if not len(chunk):
+                return
+            yield chunk[:, :3], _colors(chunk[:, 3:6], False) if chunk.shape[1] >= 6 else None
+            if len(chunk) < chunksize:
+                return
+
+
+PLY_TYPES = {
+    "char": "i1",
+    "int8": "i1",
+    "uchar": "u1",
+    "uint8": "u1",
+    "short": "i2",
+    "int16": "i2",
+    "ushort": "u2",
+    "uint16": "u2",
+    "int": "i4",
+    "int32": "i4",
+    "uint": "u4",
+    "uint32": "u4",
+    "float": "f4",
+    "float32": "f4",
+    "double": "f8",
+    "float64": "f8",
+}
+
+
+def _read_ply(path: Path, chunksize: int):
+    with open(path, "rb") as f:
+        if f.readline().strip() != b"ply":
+            raise ValueError(f"{path} is not a PLY file.")
+        fmt = None
+        count = 0
+        properties = []
+        element = None
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError(f"{path} has no end of header.")
+            words = line.decode("ascii").split()
+            if not words:
+                continue
+            if words[0] == "format":
+                fmt = words[1]
+            elif words[0] == "element":
+                element = words[1]
+                if element == "vertex":
+                    count = int(words[2])
+            elif words[0] == "property" and element == "vertex":
+                if words[1] == "list":
+                    raise ValueError("List properties of vertices are not supported.")
+                properties.append((words[2], PLY_TYPES[words[1]]))
+            elif words[0] == "end_header":
+                break
+        offset = f.tell()
+
+    names = [name for name, _ in properties]
+    rgb = ["red", "green", "blue"] if "red" in names else ["r", "g", "b"] if "r" in names else None
+
+    if fmt == "ascii":
+        with open(path) as f:
+            f.seek(offset)
+            columns = [names.index(name) for name in ["x", "y", "z"] + (rgb or [])]
+            for start in range(0, count, chunksize):
+                chunk = np.loadtxt(f, max_rows=min(chunksize, count - start), ndmin=2)[:, columns]
+                yield chunk[:, :3], _colors(chunk[:, 3:], False) if rgb else None
+        return
+
+    endian = "<" if fmt == "binary_little_endian" else ">"
+    dtype = np.dtype([(name, endian + kind) for name, kind in properties])
+    data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+    integer = rgb is not None and np.issubdtype(dtype[rgb[0]], np.integer)
+    for start in range(0, count, chunksize):
+        chunk = data[start : start + chunksize]
+        positions = np.column_stack([chunk["x"], chunk["y"], chunk["z"]]).astype(np.float64)
+        yield positions, _colors(np.column_stack([chunk[name] for name in rgb]), integer) if rgb else None
+
+
+def _read_las(path: Path, chunksize: int):
+    try:
+        import laspy
+    except ImportError:
+        raise ImportError("Reading LAS files requires laspy, e.g. pip install laspy[lazrs].")
+
+    with laspy.open(path) as reader:
+        has_colors = "red" in reader.header.point_format.dimension_names
+        for points in reader.chunk_iterator(chunksize):
+            positions = np.column_stack([points.x, points.y, points.z]).astype(np.float64)
+            # LAS colors are 16 bit
+            yield positions, _colors(np.column_stack([points.red, points.green, points.blue]) >> 8, True) if has_colors else None
+
+
+# =============================================================================
+# Building octrees
+# =============================================================================
+
+
+def build_octree(
+    source: Union[str, os.PathLike],
+    directory: Union[str, os.PathLike],
+    nodesize: int = 100_000,
+    chunksize: int = 1_000_000,
+    maxdepth: int = 16,
+) -> OctreePointcloud:
+    """Build the octree of a point cloud file, without loading the whole point cloud in memory.
+
+    The points are streamed through the octree from the root down, one level at a time.
+    Each node keeps the first point in each cell of a grid over its cube, up to ``nodesize`` points,
+    and writes the other points to temporary files of its children, which are processed next.
+    Nodes with at most ``nodesize`` points are leaves, which keep all their points.
+
+    Parameters
+    ----------
+    source : str | os.PathLike
+        The point cloud file, see :func:`read_points` for the supported formats.
+    directory : str | os.PathLike
+        The folder to write the octree to. Existing nodes in it are replaced.
+    nodesize : int, optional
+        The maximum number of points per node, except at ``maxdepth``.
+    chunksize : int, optional
+        The number of points processed at once, which bounds the memory used.
+    maxdepth : int, optional
+        The maximum depth of the tree, e.g. for many duplicate points.
+
+    Returns
+    -------
+    :class:`OctreePointcloud`
+        The octree.
+    """
+    directory = Path(directory)
+    nodes_directory = directory / "nodes"
+    if nodes_directory.exists():
+        shutil.rmtree(nodes_directory)
+    nodes_directory.mkdir(parents=True)
+
+    # The bounds and number of points, in a first pass
+    lower = np.full(3, np.inf)
+    upper = np.full(3, -np.inf)
+    count = 0
+    has_colors = False
+    for positions, colors in read_points(source, chunksize):
+        lower = np.minimum(lower, positions.min(axis=0, initial=np.inf))
+        upper = np.maximum(upper, positions.max(axis=0, initial=-np.inf))
+        count += len(positions)
+        has_colors = has_colors or colors is not None
+    if not count:
+        raise ValueError(f"{source} has no points.")
+
+    # The octree is a cube around the points, with a little margin so that no point is on its max faces
+    edge = float((upper - lower).max()) * (1 + 1e-6) or 1.0
+    offset = (lower + upper) / 2
+    origin = offset - edge / 2
+
+    def source_chunks():
+        for positions, colors in read_points(source, chunksize):
+            points = np.empty(len(positions), dtype=BUILD_DTYPE)
+            points["position"] = positions
+            points["color"] = colors if colors is not None else 255
+            yield points
+
+    nodes = {}
+    resolution = max(int(np.ceil(np.sqrt(nodesize))), 1)
+    with tempfile.TemporaryDirectory(dir=directory) as temporary:
+        stack = [("r", source_chunks, count, origin, edge)]
+        while stack:
+            name, chunks, node_count, node_lower, node_edge = stack.pop()
+            leaf = node_count <= nodesize or len(name) > maxdepth
+            kept = []
+            kept_count = 0
+            occupied = np.zeros(0, dtype=np.int64)
+            child_counts = np.zeros(8, dtype=np.int64)
+            child_files = [Path(temporary) / f"{name}{octant}.bin" for octant in range(8)]
+
+            for points in chunks():
+                if leaf:
+                    kept.append(points)
+                    continue
+                # Keep the first point in each cell of the grid that is still empty, while the node has room
+                cells = np.minimum(((points["position"] - node_lower) * (resolution / node_edge)).astype(np.int64), resolution - 1)
+                keys = (cells[:, 0] * resolution + cells[:, 1]) * resolution + cells[:, 2]
+                _, first = np.unique(keys, return_index=True)
+                first = np.sort(first[~np.isin(keys[first], occupied)])[: nodesize - kept_count]
+                occupied = np.union1d(occupied, keys[first])
+                mask = np.zeros(len(points), dtype=bool)
+                mask[first] = True
+                kept.append(points[mask])
+                kept_count += len(first)
+
+                # Pass the other points on to the children
+                rest = points[~mask]
+                octants = ((rest["position"] >= node_lower + node_edge / 2) * [1, 2, 4]).sum(axis=1)
+                for octant in np.unique(octants):
+                    selected = rest[octants == octant]
+                    with open(child_files[octant], "ab") as f:
+                        selected.tofile(f)
+                    child_counts[octant] += len(selected)
+
+            points = np.concatenate(kept) if kept else np.zeros(0, dtype=BUILD_DTYPE)
+            data = np.empty(len(points), dtype=NODE_DTYPE)
+            data["position"] = points["position"] - offset
+            data["color"] = points["color"]
+            np.save(nodes_directory / f"{name}.npy", data)
+            nodes[name] = {
+                "count": len(points),
+                "lower": node_lower.tolist(),
+                "edge": node_edge,
+                "spacing": node_edge / resolution if not leaf else node_edge / max(np.sqrt(len(points)), 1.0),
+            }
+
+            for octant in np.flatnonzero(child_counts):
+                child_lower = node_lower + node_edge / 2 * np.array([octant & 1, (octant >> 1) & 1, (octant >> 2) & 1])
+                stack.append((f"{name}{octant}", _file_chunks(child_files[octant], chunksize), int(child_counts[octant]), child_lower, node_edge / 2))
+
+    header = {
+        "format": "compas_viewer-octree",
+        "version": 1,
+        "offset": offset.tolist(),
+        "count": count,
+        "colors": has_colors,
+        "nodesize": nodesize,
+        "nodes": nodes,
+    }
+    with open(directory / HEADER, "w") as f:
+        json.dump(header, f)
+    return OctreePointcloud(directory)
+
+
+def _file_chunks(path: Path, chunksize: int):
+    """Read the temporary file of a node in chunks, and delete it afterwards."""
+
+    def chunks():
+        data = np.memmap(path, dtype=BUILD_DTYPE, mode="r")
+        for start in range(0, len(data), chunksize):
+            yield np.array(data[start : start + chunksize])
+        del data
+        os.remove(path)
+
+    return chunks
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the octree of a point cloud, to view it with compas_viewer.")
+    parser.add_argument("source", help="The point cloud file: .npy, .ply, .las, .laz, or a text file with XYZ or XYZRGB columns.")
+    parser.add_argument("directory", help="The folder to write the octree to.")
+    parser.add_argument("--nodesize", type=int, default=100_000, help="The maximum number of points per node.")
+    parser.add_argument("--chunksize", type=int, default=1_000_000, help="The number of points processed at once.")
+    args = parser.parse_args()
+
+    octree = build_octree(args.source, args.directory, nodesize=args.nodesize, chunksize=args.chunksize)
+    print(f"{octree.count} points in {len(octree.names)} nodes")
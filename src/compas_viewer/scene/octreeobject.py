@@ -0,0 +1,234 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from heapq import heappop
+from heapq import heappush
+from time import perf_counter
+from typing import Optional
+
+import numpy as np
+from OpenGL import GL
+
+from compas_viewer.gl import make_vertex_buffer
+from compas_viewer.renderer.bvh import classify_boxes
+from compas_viewer.renderer.bvh import transform_boxes
+
+from .geometryobject import GeometryObject
+from .octree import OctreePointcloud
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def executor() -> ThreadPoolExecutor:
+    """The threads reading the nodes of octrees from disk, shared by all octree point clouds."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="octree")
+    return _executor
+
+
+class OctreePointcloudObject(GeometryObject):
+    """Viewer scene object for point clouds that are too large for memory, stored on disk as an octree.
+
+    The nodes of the octree are selected by their size on screen, largest first,
+    and refined until the points of a node are closer together on screen than the point size,
+    or until the point budget is used up.
+    Missing nodes are read from disk in background threads and uploaded to the GPU in their own buffers,
+    a few per frame while the camera moves, and as many as possible while it is idle.
+    When the budget is exceeded, the nodes that were drawn least recently are removed from the GPU.
+
+    Parameters
+    ----------
+    pointbudget : int, optional
+        The maximum number of points on the GPU. Defaults to the value of `pointbudget` in `viewer.config.renderer`.
+    **kwargs : dict, optional
+        Additional options for the :class:`compas_viewer.scene.GeometryObject`.
+
+    Attributes
+    ----------
+    geometry : :class:`compas_viewer.scene.octree.OctreePointcloud`
+        The octree.
+    pointbudget : int
+        The maximum number of points on the GPU.
+    nodes : OrderedDict[int, dict]
+        The buffers of the nodes on the GPU, from least to most recently drawn.
+    selected : list[int]
+        The nodes to draw in the current view, largest on screen first.
+    pending : bool
+        Whether selected nodes are still being loaded.
+
+    See Also
+    --------
+    :func:`compas_viewer.scene.octree.build_octree`
+    """
+
+    geometry: OctreePointcloud
+
+    # The maximum number of nodes read from disk at the same time
+    REQUESTS = 4
+
+    # The time spent uploading nodes per frame, in seconds, while the camera moves and while it is idle
+    UPLOAD_TIME = 0.004
+    IDLE_UPLOAD_TIME = 0.05
+
+    def __init__(self, pointbudget: Optional[int] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.show_points = True
+        self.show_lines = False
+        self.show_faces = False
+        self.pointbudget = pointbudget if pointbudget is not None else self.viewer.config.renderer.pointbudget
+        self.nodes: OrderedDict[int, dict] = OrderedDict()
+        self.selected: list[int] = []
+        self.pending = False
+        self._loading: dict[int, Future] = {}
+        self._selection_key = None
+        self._camera_version = None
+
+    def init(self):
+        super().init()
+        self._update_bounding_box(self.geometry.boxes[0])
+
+    @property
+    def resident(self) -> int:
+        """The number of points on the GPU."""
+        return sum(buffers["n"] for buffers in self.nodes.values())
+
+    def select(self, renderer) -> list[int]:
+        """Select the nodes to draw in the current view of a renderer.
+
+        Parameters
+        ----------
+        renderer : :class:`compas_viewer.renderer.Renderer`
+            The renderer.
+
+        Returns
+        -------
+        list[int]
+            The nodes, largest on screen first.
+        """
+        octree = self.geometry
+        width, height = renderer.width(), renderer.height()
+        boxes = transform_boxes(octree.boxes, np.array(self.worldtransformation.matrix, dtype=np.float64))
+        _, outside = classify_boxes(boxes[:, 0], boxes[:, 1], renderer.camera.frustum_planes(width, height))
+        sizes = renderer.camera.projected_size(boxes, width, height)
+        # The distance between the points of each node on screen, in pixels
+        spacing = sizes * octree.spacing / np.linalg.norm(octree.boxes[:, 1] - octree.boxes[:, 0], axis=1)
+
+        selected = []
+        total = 0
+        queue = [(-sizes[0], 0)]
+        while queue:
+            _, node = heappop(queue)
+            if outside[node]:
+                continue
+            if total + octree.counts[node] > self.pointbudget:
+                break
+            selected.append(node)
+            total += octree.counts[node]
+            if spacing[node] > self.pointsize:
+                for child in octree.children[node]:
+                    if child >= 0:
+                        heappush(queue, (-sizes[child], child))
+        return selected
+
+    def refine(self, renderer) -> bool:
+        """Select the nodes for the current view, load the missing ones, and remove unused ones if over budget.
+
+        Parameters
+        ----------
+        renderer : :class:`compas_viewer.renderer.Renderer`
+            The renderer, with its OpenGL context current.
+
+        Returns
+        -------
+        bool
+            True if selected nodes are still being loaded, so that another frame is needed.
+        """
+        camera = renderer.camera
+        key = (camera.version, renderer.buffer_manager.version, renderer.view, renderer.width(), renderer.height(), self.pointsize, self.pointbudget)
+        if key != self._selection_key:
+            self._selection_key = key
+            self.selected = self.select(renderer)
+        moving = camera.version != self._camera_version
+        self._camera_version = camera.version
+        wanted = set(self.selected)
+
+        # Read the missing nodes, largest on screen first
+        for node in self.selected:
+            if len(self._loading) >= self.REQUESTS:
+                break
+            if node not in self.nodes and node not in self._loading:
+                self._loading[node] = executor().submit(self.geometry.load, node)
+
+        # Upload the nodes that were read, within the time budget of the frame
+        deadline = perf_counter() + (self.UPLOAD_TIME if moving else self.IDLE_UPLOAD_TIME)
+        for node, future in list(self._loading.items()):
+            if not future.done():
+                continue
+            del self._loading[node]
+            if node not in wanted:
+                continue
+            positions, colors = future.result()
+            if colors is None:
+                colors = np.tile(np.array(self.pointcolor.rgba, dtype=np.float32), (len(positions), 1))
+            self._evict(wanted, len(positions))
+            self.nodes[node] = {
+                "positions": make_vertex_buffer(positions),
+                "colors": make_vertex_buffer(colors),
+                "n": len(positions),
+            }
+            if perf_counter() > deadline:
+                break
+
+        self.pending = any(node not in self.nodes for node in self.selected)
+        return self.pending
+
+    def _evict(self, wanted: set[int], incoming: int):
+        """Remove the least recently drawn nodes that are not wanted, until the incoming points fit in the budget."""
+        total = self.resident + incoming
+        for node in list(self.nodes):
+            if total <= self.pointbudget:
+                break
+            if node in wanted:
+                continue
+            total -= self.nodes[node]["n"]
+            self._delete(node)
+
+    def _delete(self, node: int):
+        buffers = self.nodes.pop(node)
+        GL.glDeleteBuffers(2, [buffers["positions"], buffers["colors"]])
+
+    def unload(self):
+        """Remove all nodes from the GPU, e.g. when the object is removed from the scene."""
+        for node in list(self.nodes):
+            self._delete(node)
+        self._loading.clear()
+        self.selected = []
+        self._selection_key = None
+
+    def draw(self, shader):
+        """Draw the selected nodes that are on the GPU.
+
+        Parameters
+        ----------
+        shader : :class:`compas_viewer.renderer.shaders.Shader`
+            The bound model or instance shader.
+        """
+        index = self.buffer_manager.objects.get(self)
+        if index is None:
+            return
+        shader.uniform1i("element_type", 0)
+        shader.enable_attribute("position")
+        shader.enable_attribute("color")
+        # All points of the cloud share the transformation and settings of the object
+        shader.constant_attribute("object_index", index)
+        for node in self.selected:
+            buffers = self.nodes.get(node)
+            if buffers is None:
+                continue
+            self.nodes.move_to_end(node)
+            shader.bind_attribute("position", buffers["positions"])
+            shader.bind_attribute("color", buffers["colors"], step=4)
+            shader.draw_points(n=buffers["n"])
+        shader.disable_attribute("position")
+        shader.disable_attribute("color")
@@ -1,6 +1,8 @@
-from compas.geometry import Point
+import numpy as np
+
 from compas.geometry import Pointcloud
 
+from .arrays import as_point_array
 from .geometryobject import GeometryObject
 
 
@@ -14,5 +16,5 @@ class PointcloudObject(GeometryObject):
         self.show_points = True
 
     @property
-    def points(self) -> list[Point]:
-        return self.geometry.points
+    def points(self) -> np.ndarray:
+        return as_point_array(self.geometry.points).reshape(-1, 3)
@@ -1,4 +1,5 @@
-from compas.geometry import Line
+import numpy as np
+
 from compas.geometry import Point
 from compas.geometry import Polygon
 from compas.geometry import earclip_polygon
@@ -16,8 +17,8 @@ class PolygonObject(GeometryObject):
         return self.geometry.points
 
     @property
-    def lines(self) -> list[Line]:
-        return self.geometry.lines
+    def lines(self) -> np.ndarray:
+        return self._segments(self.geometry.points, closed=True)
 
     @property
     def viewmesh(self) -> tuple[list[Point], list[list[int]]]:
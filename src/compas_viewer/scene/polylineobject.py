@@ -1,6 +1,7 @@
 from typing import Optional
 
-from compas.geometry import Line
+import numpy as np
+
 from compas.geometry import Point
 from compas.geometry import Polyline
 
@@ -21,5 +22,5 @@ class PolylineObject(GeometryObject):
         return self.geometry.points
 
     @property
-    def lines(self) -> Optional[list[Line]]:
-        return self.geometry.lines
+    def lines(self) -> Optional[np.ndarray]:
+        return self._segments(self.geometry.points)
@@ -1,51 +1,108 @@
-from random import randint
-from random import seed
 from typing import Any
-from typing import Generator
 from typing import Optional
 from typing import Union
 
+import numpy as np
+
 from compas.colors import Color
 from compas.datastructures import Datastructure
 from compas.geometry import Geometry
 from compas.scene import Scene
 
 from .group import Group
+from .octreeobject import OctreePointcloudObject
 from .sceneobject import ViewerSceneObject
 
 
-def instance_colors_generator(i: int = 0) -> Generator:
-    """
-    Generate a set of non-repetitive random colors for instance colors.
+class InstanceIdAllocator:
+    """Allocator of the integer IDs that identify scene objects in the instance map.
 
-    Parameters
+    IDs of removed objects are put on a free list and handed out again,
+    so the IDs stay dense and the objects can be looked up by array index.
+    ID ``0`` is reserved for the background.
+
+    Attributes
     ----------
-    i : int, optional
-        Seed for the random number generator. Default is ``0``.
+    objects : list[:class:`compas_viewer.scene.ViewerSceneObject` | None]
+        The object of each ID, or None if the ID is free.
+
+    Examples
+    --------
+    >>> instances = InstanceIdAllocator()
+    >>> instances.allocate("a"), instances.allocate("b")
+    (1, 2)
+    >>> instances.free(1)
+    >>> instances.allocate("c")
+    1
+    >>> instances.lookup([0, 1, 1, 2])
+    ['c', 'b']
 
-    Yields
-    ------
-    tuple of int
-        A tuple of three integers representing the RGB color of the instance.
     """
 
-    dim = 255
-    seed(i)
-    existed = []
+    def __init__(self):
+        self.objects: list[Optional[ViewerSceneObject]] = [None]
+        self._free: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.objects) - 1 - len(self._free)
 
-    while True:
-        n = randint(0, dim**3)
+    def __iter__(self):
+        return (obj for obj in self.objects if obj is not None)
 
-        if n in existed:
-            continue
+    def __getitem__(self, instance_id: int) -> Optional[ViewerSceneObject]:
+        if 0 < instance_id < len(self.objects):
+            return self.objects[instance_id]
+        return None
 
-        existed.append(n)
+    def allocate(self, obj: ViewerSceneObject) -> int:
+        """Allocate an ID for an object, reusing a freed one if possible.
 
-        r = n // dim**2
-        g = (n - r * dim**2) // dim
-        b = n - r * dim**2 - g * dim
+        Parameters
+        ----------
+        obj : :class:`compas_viewer.scene.ViewerSceneObject`
+            The object.
+
+        Returns
+        -------
+        int
+        """
+        if self._free:
+            instance_id = self._free.pop()
+            self.objects[instance_id] = obj
+        else:
+            instance_id = len(self.objects)
+            self.objects.append(obj)
+        return instance_id
 
-        yield (r, g, b)
+    def free(self, instance_id: int) -> None:
+        """Release an ID, so that it can be allocated again.
+
+        Parameters
+        ----------
+        instance_id : int
+            The ID.
+        """
+        if self[instance_id] is None:
+            return
+        self.objects[instance_id] = None
+        self._free.append(instance_id)
+
+    def lookup(self, ids: Union[list[int], np.ndarray]) -> list[ViewerSceneObject]:
+        """Find the objects of an array of IDs, e.g. a region of the instance map.
+
+        Parameters
+        ----------
+        ids : list[int] | numpy.ndarray
+            The IDs, in any shape and with any number of duplicates.
+
+        Returns
+        -------
+        list[:class:`compas_viewer.scene.ViewerSceneObject`]
+            The unique objects, ordered by ID.
+        """
+        ids = np.unique(np.asarray(ids, dtype=np.int64))
+        ids = ids[(ids > 0) & (ids < len(self.objects))]
+        return [self.objects[i] for i in ids if self.objects[i] is not None]
 
 
 class ViewerScene(Scene):
@@ -68,8 +125,7 @@ class ViewerScene(Scene):
 
     def __init__(self, name: str = "ViewerScene", context: str = "Viewer"):
         super().__init__(name=name, context=context)
-        self.instance_colors: dict[tuple[int, int, int], ViewerSceneObject] = {}
-        self._instance_colors_generator = instance_colors_generator()
+        self.instances = InstanceIdAllocator()
 
     @property
     def viewer(self):
@@ -219,6 +275,12 @@ class ViewerScene(Scene):
             Whether to rebuild the buffers.
             Default to True.
         """
+        for obj in [sceneobject, *sceneobject.descendants]:
+            if getattr(obj, "instance_id", None) is not None:
+                self.instances.free(obj.instance_id)
+                obj.instance_id = None
+            if isinstance(obj, OctreePointcloudObject) and self.viewer.running:
+                obj.unload()
         super().remove(sceneobject)
 
         if self.viewer.running and rebuild_buffers:
@@ -1,4 +1,5 @@
 from typing import Optional
+from typing import Union
 
 import numpy as np
 from numpy import array
@@ -10,8 +11,12 @@ from compas.geometry import transform_points_numpy
 from compas.scene import SceneObject
 from compas_viewer.base import Base
 
-# Type template of point/line/face data for generating the buffers.
-ShaderDataType = tuple[list[Point], list[Color], list[list[int]]]
+from .arrays import as_point_array
+
+# Type template of point/line/face data for generating the buffers,
+# with a color per vertex or a single color for all vertices.
+ShaderDataType = tuple[list[Point], Union[list[Color], Color], list[list[int]]]
+VerticesDataType = tuple[np.ndarray, np.ndarray, dict[str, np.ndarray]]
 
 
 class ViewerSceneObject(SceneObject, Base):
@@ -46,6 +51,12 @@ class ViewerSceneObject(SceneObject, Base):
     ----------
     is_selected : bool
         Whether the object is selected.
+    is_hovered : bool
+        Whether the object is under the mouse, if hover highlighting is enabled.
+    instance_id : int | None
+        The ID of the object in the instance map, allocated when the object is initialized.
+    selected_subobjects : list
+        The keys of the selected vertices, edges or faces, when picking those instead of whole objects.
     show : bool
         Whether to show object.
     show_points : bool
@@ -97,6 +108,9 @@ class ViewerSceneObject(SceneObject, Base):
 
         #  Selection
         self.is_selected = is_selected
+        self.is_hovered = False
+        self.instance_id: Optional[int] = None
+        self.selected_subobjects: list = []
 
         #  Visual
         self.background: bool = False
@@ -107,10 +121,15 @@ class ViewerSceneObject(SceneObject, Base):
         self._bounding_box_center: Optional[Point] = None
 
         #  Primitive
+        self._vertices_data: Optional[VerticesDataType] = None
         self._points_data: Optional[ShaderDataType] = None
         self._lines_data: Optional[ShaderDataType] = None
         self._frontfaces_data: Optional[ShaderDataType] = None
         self._backfaces_data: Optional[ShaderDataType] = None
+        self._lods_data: Optional[list[tuple[np.ndarray, np.ndarray, np.ndarray, int]]] = None
+
+        # The keys of the vertices, edges and faces of the primitives, recorded while reading the data
+        self._subobject_keys: dict[str, list] = {}
 
         self._inited = False
         self.context = "Viewer"
@@ -127,6 +146,10 @@ class ViewerSceneObject(SceneObject, Base):
     # Reading geometric data, downstream classes should implement these properties.
     # ==========================================================================
 
+    def _read_vertices_data(self) -> Optional[VerticesDataType]:
+        """Read vertices shared by the points, lines and faces data, with the elements of each type of data."""
+        pass
+
     def _read_points_data(self) -> Optional[ShaderDataType]:
         """Read points data from the object."""
         pass
@@ -140,22 +163,60 @@ class ViewerSceneObject(SceneObject, Base):
         pass
 
     def _read_backfaces_data(self) -> Optional[ShaderDataType]:
-        """Read backfaces data from the object."""
+        """Read backfaces data from the object, for back faces with other colors than the front faces.
+
+        By default, the back faces are drawn from the vertices of the frontfaces data, in reverse order.
+        """
+        pass
+
+    def _read_lods_data(self) -> Optional[list[tuple[np.ndarray, np.ndarray, np.ndarray, int]]]:
+        """Compute simplified levels of detail of the frontfaces data, with the resolution of their grids."""
         pass
 
+    def _uniform_colors(self) -> dict[str, Color]:
+        """The current colors of the points, lines and faces data that have a single color for all vertices.
+
+        Such data is drawn with the color in the settings of the object,
+        so that changing these colors only updates the settings, without reading the data again.
+        """
+        return {}
+
+    def subobject_keys(self, mode: str, indices) -> list:
+        """Find the vertices, edges or faces the primitives of the shader data belong to.
+
+        Parameters
+        ----------
+        mode : Literal["vertex", "edge", "face"]
+            The type of primitive: points, lines or triangles.
+        indices : array_like
+            The indices of the primitives in the data of the object.
+
+        Returns
+        -------
+        list
+            The key of the vertex, edge or face of each primitive,
+            or the indices themselves if the object does not record keys.
+        """
+        keys = self._subobject_keys.get(mode)
+        if keys is None:
+            return [int(index) for index in indices]
+        return [keys[index] for index in indices]
+
     # ==========================================================================
     # general
     # ==========================================================================
 
     def init(self):
         """Initialize the object"""
+        self._vertices_data = self._read_vertices_data()
         self._points_data = self._read_points_data()
         self._lines_data = self._read_lines_data()
         self._frontfaces_data = self._read_frontfaces_data()
         self._backfaces_data = self._read_backfaces_data()
+        self._lods_data = self._read_lods_data()
         self._update_bounding_box()
-        self.instance_color = Color.from_rgb255(*next(self.viewer.scene._instance_colors_generator))
-        self.viewer.scene.instance_colors[self.instance_color.rgb255] = self
+        if self.instance_id is None:
+            self.instance_id = self.viewer.scene.instances.allocate(self)
 
     def update(self, update_transform: bool = True, update_data: bool = False):
         """Update the object.
@@ -169,23 +230,19 @@ class ViewerSceneObject(SceneObject, Base):
         """
         if update_transform:
             self.buffer_manager.update_object_transform(self)
-        if update_data:
-            self.buffer_manager.update_object_data(self)
+        if update_data and not self.buffer_manager.update_object_data(self):
+            self.viewer.renderer.rebuild_buffers()
 
     def _update_bounding_box(self, positions: Optional[list[Point]] = None):
         """Update the bounding box of the object"""
         if positions is None:
-            positions = np.array([]).reshape(0, 3)
-            if self._points_data is not None and len(self._points_data[0]) > 0:
-                positions = np.vstack([positions, self._points_data[0]])
-            if self._lines_data is not None and len(self._lines_data[0]) > 0:
-                positions = np.vstack([positions, self._lines_data[0]])
-            if self._frontfaces_data is not None and len(self._frontfaces_data[0]) > 0:
-                positions = np.vstack([positions, self._frontfaces_data[0]])
-            if len(positions) == 0:
+            datas = [self._points_data, self._lines_data, self._frontfaces_data]
+            positions = [as_point_array(data[0], dtype=np.float64).reshape(-1, 3) for data in datas if data is not None and len(data[0]) > 0]
+            if not positions:
                 return
+            positions = np.vstack(positions)
 
-        _positions = array(positions)
+        _positions = as_point_array(positions, dtype=np.float64)
         self._bounding_box = list(transform_points_numpy(array([_positions.min(axis=0), _positions.max(axis=0)]), self.worldtransformation))
         self._bounding_box_center = Point(*list(average(a=array(self.bounding_box), axis=0)))
 
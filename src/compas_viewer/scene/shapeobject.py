@@ -81,27 +81,20 @@ class ShapeObject(GeometryObject):
 
     def _read_points_data(self) -> ShaderDataType:
         positions = self.geometry.vertices
-        colors = [self.pointcolor] * len(positions)
+        colors = self.pointcolor
         elements = [[i] for i in range(len(positions))]
         return positions, colors, elements
 
     def _read_lines_data(self) -> ShaderDataType:
         vertices = self.geometry._vertices
         positions = [vertices[vertex] for edge in self.geometry.edges for vertex in edge]
-        colors = [self.linecolor] * len(positions)
+        colors = self.linecolor
         elements = [[2 * i, 2 * i + 1] for i in range(len(self.geometry.edges))]
         return positions, colors, elements
 
     def _read_frontfaces_data(self) -> ShaderDataType:
         vertices = self.geometry._vertices
         positions = [vertices[vertex] for face in self.geometry.triangles for vertex in face]
-        colors = [self.facecolor] * len(positions)
+        colors = self.facecolor
         elements = [[3 * i, 3 * i + 1, 3 * i + 2] for i in range(len(self.geometry.triangles))]
         return positions, colors, elements
-
-    def _read_backfaces_data(self) -> ShaderDataType:
-        vertices = self.geometry._vertices
-        positions = [vertices[vertex] for face in self.geometry.triangles for vertex in face]
-        colors = [self.facecolor] * len(positions)
-        elements = [[3 * i + 2, 3 * i + 1, 3 * i] for i in range(len(self.geometry.triangles))]
-        return positions, colors, elements
@@ -0,0 +1,13 @@
+import os
+
+import pytest
+
+# The scene objects read their settings from the viewer, which does not need a display for the tests
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def viewer():
+    from compas_viewer import Viewer
+
+    return Viewer()
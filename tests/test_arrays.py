@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from compas.colors import Color
+from compas.colors import ColorDict
+from compas.datastructures import Mesh
+from compas.geometry import Point
+from compas.geometry import Vector
+
+from compas_viewer.scene.arrays import as_color_array
+from compas_viewer.scene.arrays import as_point_array
+
+
+def test_points_and_vectors():
+    points = [Point(1, 2, 3), Vector(4, 5, 6), Point(-1.5, 0, 1e6)]
+    array = as_point_array(points)
+    assert array.dtype == np.float32
+    np.testing.assert_array_equal(array, np.array([[1, 2, 3], [4, 5, 6], [-1.5, 0, 1e6]], dtype=np.float32))
+    np.testing.assert_array_equal(as_point_array(tuple(points), dtype=np.float64), np.asarray(points, dtype=np.float64))
+
+
+@pytest.mark.parametrize("points", [[[1, 2, 3], [4, 5, 6]], [(1.0, 2.0, 3.0)], [[1, 2], [3, 4]], [1, 2, 3], []])
+def test_sequences_keep_their_shape(points):
+    np.testing.assert_array_equal(as_point_array(points), np.asarray(points, dtype=np.float32))
+
+
+def test_mixed_points_and_sequences():
+    points = [Point(1, 2, 3), [4, 5, 6], (7, 8, 9)]
+    np.testing.assert_array_equal(as_point_array(points), [[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+
+
+def test_arrays_are_not_copied():
+    array = np.arange(12, dtype=np.float32).reshape(4, 3)
+    assert as_point_array(array) is array
+    converted = as_point_array(array, dtype=np.float64)
+    assert converted.dtype == np.float64
+    np.testing.assert_array_equal(converted, array)
+
+
+def lookup(colordict: ColorDict, keys: list) -> np.ndarray:
+    return np.array([colordict[key].rgba for key in keys], dtype=np.float32).reshape(-1, 4)
+
+
+def test_colors_of_mesh_keys():
+    mesh = Mesh.from_meshgrid(1.0, 3)
+    colordicts = [ColorDict(Color(0.1, 0.2, 0.3, 0.4)) for _ in range(3)]
+    vertices, edges, faces = list(mesh.vertices()), list(mesh.edges()), list(mesh.faces())
+    for i, vertex in enumerate(vertices[::2]):
+        colordicts[0][vertex] = Color(i / 10, 0, 1)
+    for i, (u, v) in enumerate(edges[::3]):
+        # Edges are found in either direction
+        colordicts[1][(v, u) if i % 2 else (u, v)] = Color(0, i / 10, 1, 0.5)
+    colordicts[2][faces[4]] = Color.red()
+    colordicts[2][100] = Color.blue()
+    for colordict, keys in zip(colordicts, [vertices, edges, faces]):
+        array = as_color_array(colordict, keys)
+        assert array.dtype == np.float32
+        np.testing.assert_array_equal(array, lookup(colordict, keys))
+
+
+def test_default_colors():
+    colordict = ColorDict(Color.grey())
+    np.testing.assert_array_equal(as_color_array(colordict, [0, 1], dtype=np.float64), [Color.grey().rgba] * 2)
+    colordict[0] = Color.red()
+    assert as_color_array(colordict, []).shape == (0, 4)
+    # Keys that are not in the list are ignored, and keys that are in it twice are both colored
+    np.testing.assert_array_equal(as_color_array(colordict, [1, 0, 0]), lookup(colordict, [1, 0, 0]))
+    np.testing.assert_array_equal(as_color_array(colordict, ["a"]), lookup(colordict, ["a"]))
@@ -0,0 +1,158 @@
+from itertools import count
+
+import numpy as np
+import pytest
+from compas.colors import Color
+from compas.datastructures import Graph
+from compas.datastructures import Mesh
+from compas.geometry import Box
+
+from compas_viewer.scene import buffermanager
+from compas_viewer.scene.buffermanager import BufferManager
+
+
+@pytest.fixture
+def uploads(monkeypatch) -> list:
+    """Record the updates of the OpenGL buffers, and create them without an OpenGL context."""
+    calls = []
+    ids = count(1)
+    for name in ["make_index_buffer", "make_texture_buffer", "make_vertex_buffer"]:
+        monkeypatch.setattr(buffermanager, name, lambda *args, **kwargs: next(ids))
+    for name in ["update_texture_buffer", "update_vertex_buffer"]:
+        monkeypatch.setattr(buffermanager, name, lambda data, buffer, offset=0, name=name: calls.append((name, offset)))
+    return calls
+
+
+@pytest.fixture
+def scene(viewer, uploads):
+    """Add items to the scene of the viewer, and the buffers of their objects to a new buffer manager.
+
+    The items can be given with their own options as (item, options) tuples.
+    """
+    objects = []
+
+    def add(*items, **kwargs):
+        manager = BufferManager()
+        for item in items:
+            item, options = item if isinstance(item, tuple) else (item, {})
+            obj = viewer.scene.add(item, **kwargs, **options)
+            obj.init()
+            objects.append(obj)
+            manager.add_object(obj)
+        manager.create_buffers()
+        return manager, objects[-len(items) :]
+
+    yield add
+    for obj in objects:
+        viewer.scene.remove(obj)
+
+
+def cube() -> Mesh:
+    return Mesh.from_shape(Box(1.0))
+
+
+def test_single_colors_are_settings(scene):
+    manager, (obj,) = scene(cube(), facecolor=Color.red(), linecolor=Color.blue())
+    index = manager.objects[obj]
+    assert set(obj._uniform_colors()) == {"_points_data", "_lines_data", "_frontfaces_data"}
+    assert set(manager.uniform_colors[index]) == {"_points_data", "_lines_data", "_frontfaces_data"}
+    # The vertices of the points, lines and faces are shared, as none of them has colors per vertex
+    assert manager.memory_usage(obj)["vertices"] == 8
+    # Rows 4 to 7 of the settings flag and hold the colors of the points, lines and faces
+    settings = manager._settings_array[index]
+    np.testing.assert_array_equal(settings[3, 1:], [1, 1, 1])
+    np.testing.assert_allclose(settings[5], Color.blue().rgba)
+    np.testing.assert_allclose(settings[6], Color.red().rgba)
+
+
+def test_single_colors_of_graph(scene):
+    graph = Graph()
+    graph.add_edge(graph.add_node(x=0, y=0, z=0), graph.add_node(x=1, y=0, z=0))
+    manager, (obj, colored) = scene(graph, (graph.copy(), {"nodecolor": {0: Color.red()}}))
+    assert set(obj._uniform_colors()) == {"_points_data", "_lines_data"}
+    assert set(manager.uniform_colors[manager.objects[obj]]) == {"_points_data", "_lines_data"}
+    np.testing.assert_array_equal(manager._settings_array[manager.objects[obj], 3, 1:3], [1, 1])
+    assert set(manager.uniform_colors[manager.objects[colored]]) == {"_lines_data"}
+    np.testing.assert_array_equal(manager._settings_array[manager.objects[colored], 3, 1:3], [0, 1])
+
+
+def test_colors_per_face(scene):
+    mesh = cube()
+    facecolor = {face: Color.red() if face % 2 else Color.blue() for face in mesh.faces()}
+    manager, (obj,) = scene(mesh, facecolor=facecolor)
+    index = manager.objects[obj]
+    assert "_frontfaces_data" not in obj._uniform_colors()
+    assert "_frontfaces_data" not in manager.uniform_colors[index]
+    assert manager._settings_array[index, 3, 3] == 0
+    # The corners of the faces have their own vertices, for their colors
+    assert manager.memory_usage(obj)["vertices"] > 8
+
+
+def test_update_single_colors(scene, uploads, monkeypatch):
+    manager, (obj,) = scene(cube())
+    index = manager.objects[obj]
+    monkeypatch.setattr(manager, "update_object_data", lambda obj: pytest.fail("The data is read again"))
+    uploads.clear()
+
+    obj.facecolor = Color.green()
+    assert manager.update_object_colors(obj)
+    # Only the row of the object in the settings texture is updated
+    assert uploads == [("update_texture_buffer", index * 4 * 4 * BufferManager.SETTINGS_ROWS)]
+    np.testing.assert_allclose(manager._settings_array[index, 6], Color.green().rgba)
+
+
+def test_update_colors_per_face(scene, uploads):
+    manager, (obj,) = scene(cube())
+    uploads.clear()
+
+    # Colors per face split the shared vertices, which do not fit in the buffers anymore
+    obj.facecolor[0] = Color.red()
+    assert not manager.update_object_colors(obj)
+    assert uploads == []
+
+
+def drawn(manager: BufferManager, element_type: str) -> list:
+    """The indices of the objects whose elements are drawn, checking that nothing else is drawn."""
+    manager.update_settings()
+    manager.update_draw_ranges()
+    ranges = manager.ranges[element_type]
+    if manager.draw_ranges[element_type] is None:
+        return sorted(ranges)
+    elements = {int(first) + i for first, n in zip(*manager.draw_ranges[element_type]) for i in range(n)}
+    indices = sorted(index for index, (first, n) in ranges.items() if first in elements)
+    assert elements == {first + i for index in indices for first, n in [ranges[index]] for i in range(n)}
+    return indices
+
+
+def test_draw_ranges(scene):
+    manager, objects = scene(*[Box(1.0).translated([3 * i, 0, 0]) for i in range(4)], show_points=True)
+    first, second, third, fourth = [manager.objects[obj] for obj in objects]
+    everything = [first, second, third, fourth]
+    for element_type in ["_points_data", "_lines_data", "_frontfaces_data"]:
+        assert drawn(manager, element_type) == everything
+        assert manager.draw_ranges[element_type] is None
+
+    # Hidden objects are left out, and the ranges of the objects before and after them are not merged
+    objects[1].show = False
+    for element_type in ["_points_data", "_lines_data", "_frontfaces_data"]:
+        assert drawn(manager, element_type) == [first, third, fourth]
+        assert len(manager.draw_ranges[element_type][0]) == 2
+
+    # Hidden lines only leave out the lines
+    objects[1].show = True
+    objects[2].show_lines = False
+    assert drawn(manager, "_points_data") == everything
+    assert drawn(manager, "_lines_data") == [first, second, fourth]
+    assert drawn(manager, "_frontfaces_data") == everything
+
+    # Culled objects are left out, also if they are shown
+    manager.cull(np.array([[-1.0, 0.0, 0.0, 4.0]]))
+    assert drawn(manager, "_points_data") == [first, second]
+    assert drawn(manager, "_lines_data") == [first, second]
+    objects[0].show = False
+    assert drawn(manager, "_frontfaces_data") == [second]
+
+    # Without culling, all shown objects are drawn again
+    manager.cull(None)
+    assert drawn(manager, "_frontfaces_data") == [second, third, fourth]
+    assert drawn(manager, "_lines_data") == [second, fourth]
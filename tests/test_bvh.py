@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+from compas.geometry import Box
+from compas.geometry import Point
+from compas.geometry import Rotation
+from compas.geometry import Translation
+
+from compas_viewer.renderer.bvh import BVH
+from compas_viewer.renderer.bvh import classify_boxes
+from compas_viewer.renderer.bvh import closest_ray_points
+from compas_viewer.renderer.bvh import closest_ray_segments
+from compas_viewer.renderer.bvh import intersect_ray_boxes
+from compas_viewer.renderer.bvh import intersect_ray_triangles
+from compas_viewer.renderer.bvh import transform_boxes
+from compas_viewer.renderer.raycaster import RayCaster
+
+
+def random_boxes(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    lower = rng.uniform(-10, 10, (n, 3))
+    return np.stack([lower, lower + rng.uniform(0.1, 2, (n, 3))], axis=1)
+
+
+def test_empty():
+    bvh = BVH(np.zeros((0, 2, 3)))
+    assert len(bvh) == 0
+    items, t = bvh.intersect_ray([0, 0, 0], [1, 0, 0])
+    assert len(items) == 0 and len(t) == 0
+
+
+@pytest.mark.parametrize("leafsize", [1, 4, 16])
+def test_ray_matches_brute_force(leafsize):
+    boxes = random_boxes(500)
+    bvh = BVH(boxes, leafsize=leafsize)
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        origin = rng.uniform(-15, 15, 3)
+        direction = rng.normal(size=3)
+        items, t = bvh.intersect_ray(origin, direction)
+        tnear, hit = intersect_ray_boxes(origin, direction, boxes[:, 0], boxes[:, 1])
+        assert sorted(items.tolist()) == np.flatnonzero(hit).tolist()
+        np.testing.assert_allclose(t, tnear[items])
+        assert (np.diff(t) >= 0).all()
+
+
+def test_ray_margin_grows_boxes():
+    bvh = BVH(np.array([[[0, 0, 0], [1, 1, 1]]], dtype=float))
+    assert len(bvh.intersect_ray([-1, 1.5, 0.5], [1, 0, 0])[0]) == 0
+    assert len(bvh.intersect_ray([-1, 1.5, 0.5], [1, 0, 0], margin=0.6)[0]) == 1
+    # The slope grows the boxes with the distance from the origin
+    assert len(bvh.intersect_ray([-1, 1.5, 0.5], [1, 0, 0], slope=0.1)[0]) == 0
+    assert len(bvh.intersect_ray([-1, 1.5, 0.5], [1, 0, 0], slope=0.3)[0]) == 1
+
+
+def test_node_items_cover_all_boxes():
+    bvh = BVH(random_boxes(100), leafsize=4)
+    leaves = np.flatnonzero(bvh.children[:, 0] < 0)
+    assert sorted(bvh.node_items(leaves).tolist()) == list(range(100))
+    assert sorted(bvh.node_items(np.array([0])).tolist()) == list(range(100))
+
+
+def test_ray_triangles():
+    triangles = np.array([[[0, 0, 0], [1, 0, 0], [0, 1, 0]], [[0, 0, 2], [1, 0, 2], [0, 1, 2]], [[5, 5, 1], [6, 5, 1], [5, 6, 1]]], dtype=float)
+    t = intersect_ray_triangles(np.array([0.2, 0.2, -1.0]), np.array([0.0, 0.0, 1.0]), triangles)
+    np.testing.assert_allclose(t, [1.0, 3.0, np.inf])
+    # Both sides are hit
+    t = intersect_ray_triangles(np.array([0.2, 0.2, 5.0]), np.array([0.0, 0.0, -1.0]), triangles)
+    np.testing.assert_allclose(t, [5.0, 3.0, np.inf])
+
+
+def test_ray_segments_and_points():
+    origin = np.array([0.0, 0.0, 0.0])
+    direction = np.array([1.0, 0.0, 0.0])
+    segments = np.array([[[2, -1, 1], [2, 1, 1]], [[-3, 1, 0], [-2, 1, 0]]], dtype=float)
+    s, points, distances = closest_ray_segments(origin, direction, segments)
+    np.testing.assert_allclose(s, [2.0, 0.0])
+    np.testing.assert_allclose(points, [[2, 0, 1], [-2, 1, 0]])
+    np.testing.assert_allclose(distances, [1.0, np.sqrt(5)])
+    s, distances = closest_ray_points(origin, direction, np.array([[3.0, 4.0, 0.0], [-1.0, 0.0, 0.0]]))
+    np.testing.assert_allclose(s, [3.0, 0.0])
+    np.testing.assert_allclose(distances, [4.0, 1.0])
+
+
+@pytest.fixture
+def objects(viewer):
+    near = viewer.scene.add(Box(1.0), name="near")
+    far = viewer.scene.add(Box(1.0), name="far")
+    far.transformation = Translation.from_vector([3, 0, 0])
+    point = viewer.scene.add(Point(0, 3, 0), name="point")
+    for obj in [near, far, point]:
+        obj.init()
+    yield near, far, point
+    for obj in [near, far, point]:
+        viewer.scene.remove(obj)
+
+
+def test_raycaster_hits(objects):
+    near, far, point = objects
+    caster = RayCaster()
+    caster.build([near, far, point])
+    assert len(caster.bvh) == 3
+
+    # The nearest face along the ray
+    obj, hit = caster.cast([-5, 0, 0], [1, 0, 0], pixelsize=0.01)
+    assert obj is near
+    assert hit == Point(-0.5, 0, 0)
+    obj, hit = caster.cast([10, 0, 0], [-1, 0, 0], pixelsize=0.01)
+    assert obj is far
+    assert hit == Point(3.5, 0, 0)
+
+    # Points are hit within half their size on screen, and within the radius if nothing else is hit
+    assert caster.cast([0, 3.02, 10], [0, 0, -1], pixelsize=0.01)[0] is point
+    assert caster.cast([0, 3.2, 10], [0, 0, -1], pixelsize=0.01)[0] is None
+    assert caster.cast([0, 3.2, 10], [0, 0, -1], pixelsize=0.01, radius=30)[0] is point
+
+    # Hidden objects and faces are skipped
+    near.show = False
+    obj, hit = caster.cast([-5, 0, 0], [1, 0, 0], pixelsize=0.01)
+    assert obj is far
+    assert caster.cast([-5, 0, 0], [1, 0, 0], pixelsize=0.01, faces=False)[0] is None
+    assert caster.cast([0, 10, 0], [0, 0, 1], pixelsize=0.01)[0] is None
+
+
+def test_frustum_matches_brute_force():
+    boxes = random_boxes(1000, seed=2)
+    bvh = BVH(boxes)
+    # A pyramid around the x axis, cut off at x = 1 and x = 8
+    planes = np.array([[1, 1, 0, 0], [1, -1, 0, 0], [1, 0, 1, 0], [1, 0, -1, 0], [1, 0, 0, -1], [-1, 0, 0, 8]], dtype=float)
+    planes /= np.linalg.norm(planes[:, :3], axis=1)[:, None]
+    items = bvh.intersect_frustum(planes)
+    inside, outside = classify_boxes(boxes[:, 0], boxes[:, 1], planes)
+    assert 0 < inside.sum() < len(items) < len(boxes)
+    np.testing.assert_array_equal(items, np.flatnonzero(~outside))
+
+
+def test_frustum_of_camera(viewer):
+    camera = viewer.renderer.camera
+    planes = camera.frustum_planes(800, 600)
+    target, position = np.array(camera.target), np.array(camera.position)
+    boxes = np.array([[target - 0.5, target + 0.5], [position + 1e3, position + 1e3 + 1]])
+    assert BVH(boxes).intersect_frustum(planes).tolist() == [0]
+    assert len(BVH(np.zeros((0, 2, 3))).intersect_frustum(planes)) == 0
+
+
+def test_classify_boxes():
+    planes = np.array([[1, 0, 0, 0], [-1, 0, 0, 1]], dtype=float)
+    lower = np.array([[0.2, 0, 0], [-1, 0, 0], [0.5, 0, 0], [-2, 0, 0]])
+    upper = np.array([[0.8, 1, 1], [-0.5, 1, 1], [1.5, 1, 1], [2, 1, 1]])
+    inside, outside = classify_boxes(lower, upper, planes)
+    assert inside.tolist() == [True, False, False, False]
+    assert outside.tolist() == [False, True, False, False]
+
+
+def test_transform_boxes():
+    boxes = random_boxes(20, seed=3)
+    matrices = np.array([Rotation.from_axis_and_angle([1, 2, 3], i).matrix for i in range(20)])
+    matrices[:, :3, 3] = np.arange(60).reshape(20, 3)
+    transformed = transform_boxes(boxes, matrices)
+    corners = np.array([[[box[i, 0], box[j, 1], box[k, 2]] for i in (0, 1) for j in (0, 1) for k in (0, 1)] for box in boxes])
+    corners = np.einsum("nij,ncj->nci", matrices[:, :3, :3], corners) + matrices[:, None, :3, 3]
+    np.testing.assert_allclose(transformed[:, 0], corners.min(axis=1))
+    np.testing.assert_allclose(transformed[:, 1], corners.max(axis=1))
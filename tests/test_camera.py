@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from compas_viewer.renderer.camera import Camera
+
+WIDTH = 800
+HEIGHT = 600
+
+
+@pytest.fixture(params=["perspective", "top"])
+def camera(request):
+    # The camera only reads the view of its renderer
+    return Camera(SimpleNamespace(view=request.param))
+
+
+def clip_matrix(camera: Camera) -> np.ndarray:
+    return np.array(camera.projection(WIDTH, HEIGHT), dtype=np.float64) @ np.array(camera.viewworld(), dtype=np.float64)
+
+
+def to_ndc(matrix: np.ndarray, points: np.ndarray) -> np.ndarray:
+    clip = np.hstack([points, np.ones((len(points), 1))]) @ matrix.T
+    return clip[:, :3] / clip[:, 3:]
+
+
+def test_pick_matrix_of_viewport_is_identity(camera):
+    np.testing.assert_allclose(camera.pick_matrix(0, 0, WIDTH, HEIGHT, WIDTH, HEIGHT), np.identity(4))
+
+
+def test_pick_matrix_maps_region_to_clip_space(camera):
+    x, y, size = 300, 200, 5
+    pick = np.array(camera.pick_matrix(x, y, size, size, WIDTH, HEIGHT), dtype=np.float64)
+    # The corners and the center of the region, in normalized device coordinates of the viewport
+    pixels = np.array([[x, y], [x + size, y + size], [x + size / 2, y + size / 2]])
+    ndc = np.column_stack([2 * pixels[:, 0] / WIDTH - 1, 2 * pixels[:, 1] / HEIGHT - 1, np.zeros(3), np.ones(3)])
+    for w in [1.0, 3.5]:
+        narrowed = (ndc * w) @ pick.T
+        np.testing.assert_allclose(narrowed[:, :2] / narrowed[:, 3:], [[-1, -1], [1, 1], [0, 0]], atol=1e-5)
+
+
+def test_frustum_planes_match_clip_space(camera):
+    planes = camera.frustum_planes(WIDTH, HEIGHT)
+    assert planes.shape == (6, 4)
+    np.testing.assert_allclose(np.linalg.norm(planes[:, :3], axis=1), 1.0)
+
+    rng = np.random.default_rng(0)
+    points = np.array(camera.target) + rng.uniform(-1, 1, (2000, 3)) * camera.distance * 2
+    ndc = to_ndc(clip_matrix(camera), points)
+    # Points too close to a plane are left out of the comparison
+    margin = np.abs(np.abs(ndc) - 1).min(axis=1)
+    points, ndc = points[margin > 1e-6], ndc[margin > 1e-6]
+    inside = (points @ planes[:, :3].T + planes[:, 3] >= 0).all(axis=1)
+    expected = (np.abs(ndc) <= 1).all(axis=1)
+    if camera.renderer.view == "perspective":
+        # Points behind the camera are mirrored into the clip volume by the division by w
+        w = np.hstack([points, np.ones((len(points), 1))]) @ clip_matrix(camera)[3]
+        expected &= w > 0
+    assert inside.any() and not inside.all()
+    np.testing.assert_array_equal(inside, expected)
+
+
+def corners(boxes: np.ndarray) -> np.ndarray:
+    return np.array([[[box[i, 0], box[j, 1], box[k, 2]] for i in (0, 1) for j in (0, 1) for k in (0, 1)] for box in boxes])
+
+
+def test_projected_size_bounds_projection(camera):
+    rng = np.random.default_rng(0)
+    lower = np.array(camera.target) + rng.uniform(-1, 1, (200, 3)) * camera.distance / 16
+    boxes = np.stack([lower, lower + rng.uniform(0.01, 2, (200, 3))], axis=1)
+    points = to_ndc(clip_matrix(camera), corners(boxes).reshape(-1, 3))
+    pixels = ((points[:, :2] + 1) / 2 * [WIDTH, HEIGHT]).reshape(-1, 8, 2)
+    extent = np.linalg.norm(pixels[:, :, None] - pixels[:, None], axis=3).max(axis=(1, 2))
+    size = camera.projected_size(boxes, WIDTH, HEIGHT)
+    assert (extent <= size * (1 + 1e-5)).all()
+    assert (extent >= size * 0.5).all()
+
+
+def test_projected_size_of_empty_and_close_boxes(camera):
+    position = np.array(camera.position)
+    boxes = np.array([[[np.inf] * 3, [-np.inf] * 3], [position - 1, position + 1]])
+    size = camera.projected_size(boxes, WIDTH, HEIGHT)
+    assert size[0] == 0
+    if camera.renderer.view == "perspective":
+        # The distance to boxes around the camera is clamped to the near plane
+        expected = np.sqrt(12) * HEIGHT / (2 * np.tan(np.radians(camera.fov) / 2) * camera.near * camera.scale)
+        np.testing.assert_allclose(size[1], expected)
+    else:
+        np.testing.assert_allclose(size[1], np.sqrt(12) * WIDTH / (2 * camera.distance))
+
+
+def test_projected_size_is_inverse_to_distance(camera):
+    target = np.array(camera.target)
+    boxes = np.array([[target - 0.5, target + 0.5]])
+
+    def distance():
+        if camera.renderer.view == "perspective":
+            # The distance to the nearest point of the box
+            position = np.array(camera.position)
+            return np.linalg.norm(np.maximum(np.maximum(boxes[0, 0] - position, position - boxes[0, 1]), 0))
+        return camera.distance
+
+    product = camera.projected_size(boxes, WIDTH, HEIGHT)[0] * distance()
+    for factor in [0.5, 2.0, 10.0]:
+        camera.distance *= factor
+        np.testing.assert_allclose(camera.projected_size(boxes, WIDTH, HEIGHT)[0] * distance(), product)
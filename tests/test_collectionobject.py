@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from compas.colors import Color
+from compas.geometry import Box
+from compas.geometry import Frame
+from compas.geometry import Point
+from compas.geometry import Polyline
+
+from compas_viewer.scene import Collection
+from compas_viewer.scene.arrays import as_point_array
+
+DATA_TYPES = ["_points_data", "_lines_data", "_frontfaces_data"]
+
+
+def items() -> list:
+    box = Box(1, 2, 3, Frame([1, 2, 3], [1, 0, 0], [0, 1, 0]))
+    return [
+        box,
+        Point(1, 2, 3),
+        Polyline([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 1]]),
+        # A repeated reference, and an equal copy
+        box,
+        Box(1, 2, 3, Frame([1, 2, 3], [1, 0, 0], [0, 1, 0])),
+        Point(4, 5, 6),
+    ]
+
+
+@pytest.fixture(params=[False, True], ids=["separate", "shared"])
+def collection(viewer, request):
+    obj = viewer.scene.add(Collection(items()), share_data=request.param)
+    obj.init()
+    yield obj
+    viewer.scene.remove(obj)
+
+
+def expand(positions, colors, elements) -> tuple[np.ndarray, np.ndarray]:
+    """The positions and colors of the corners of the elements."""
+    positions = as_point_array(positions, dtype=np.float64).reshape(-1, 3)
+    if isinstance(colors, Color):
+        colors = [colors.rgba] * len(positions)
+    colors = np.array([color.rgba if isinstance(color, Color) else color for color in colors], dtype=np.float64).reshape(-1, 4)
+    elements = np.asarray(elements, dtype=np.int64).reshape(-1)
+    return positions[elements], colors[elements]
+
+
+@pytest.mark.parametrize("data_type", DATA_TYPES)
+def test_merged_data_matches_objects(collection, data_type):
+    positions, colors, elements = collection._merge_data(data_type)
+    size = collection.ELEMENT_SIZES[data_type]
+    assert elements.shape[1] == size
+    assert elements.min() >= 0 and elements.max() < len(positions)
+
+    # The elements of each object point to its own vertices
+    expected = []
+    for obj in collection.objects:
+        # Shapes compute their vertices when their points are read, which shared copies skip
+        obj._read_points_data()
+        expected.append(expand(*getattr(obj, f"_read{data_type}")()))
+    merged_positions, merged_colors = expand(positions, colors, elements)
+    np.testing.assert_allclose(merged_positions, np.vstack([p for p, _ in expected]), atol=1e-6)
+    np.testing.assert_allclose(merged_colors, np.vstack([c for _, c in expected]), atol=1e-6)
+
+
+def test_single_and_mixed_colors(viewer):
+    obj = viewer.scene.add(Collection(items()), linecolor=Color.red())
+    try:
+        obj.init()
+        _, colors, _ = obj._merge_data("_lines_data")
+        assert isinstance(colors, Color) and colors.rgba == Color.red().rgba
+        obj.objects[2].linecolor = Color.blue()
+        positions, colors, elements = obj._merge_data("_lines_data")
+        assert isinstance(colors, np.ndarray) and colors.shape == (len(positions), 4)
+        rows = np.unique(elements[12:15])
+        np.testing.assert_allclose(colors[rows], [Color.blue().rgba] * len(rows))
+        np.testing.assert_allclose(np.delete(colors, rows, axis=0), [Color.red().rgba] * (len(positions) - len(rows)))
+    finally:
+        viewer.scene.remove(obj)
+
+
+def test_share_data(collection):
+    datas = collection._objects_data("_frontfaces_data")
+    # Repeated references are read once, and equal geometries only if their data is shared
+    assert datas[3] is datas[0]
+    assert (datas[4] is datas[0]) == collection.share_data
+    assert datas[5] is not datas[1]
@@ -0,0 +1,88 @@
+import numpy as np
+from compas.datastructures import Mesh
+from compas.geometry import Sphere
+
+from compas_viewer.scene.lod import cluster_vertices
+from compas_viewer.scene.lod import lod_chain
+
+
+def grid(n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """A grid of n by n unit quads in the XY plane, as a soup of triangles that do not share their vertices."""
+    x, y = np.meshgrid(np.arange(n), np.arange(n), indexing="ij")
+    a = np.column_stack([x.ravel(), y.ravel(), np.zeros(n * n)])
+    b, c, d = a + [1, 0, 0], a + [1, 1, 0], a + [0, 1, 0]
+    positions = np.stack([a, b, c, a, c, d], axis=1).reshape(-1, 3)
+    colors = np.column_stack([positions[:, 0] / n, positions[:, 1] / n, np.zeros(len(positions)), np.ones(len(positions))])
+    return positions, colors, np.arange(len(positions)).reshape(-1, 3)
+
+
+def sphere() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    mesh = Mesh.from_shape(Sphere(1.0), u=32, v=32)
+    mesh.quads_to_triangles()
+    vertices, faces = mesh.to_vertices_and_faces()
+    positions = np.array(vertices, dtype=float)
+    return positions, np.ones((len(positions), 4)), np.array(faces)
+
+
+def normals(positions: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    corners = positions[triangles]
+    return np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+
+
+def test_coincident_vertices_are_merged():
+    positions, colors, triangles = grid(4)
+    merged_positions, merged_colors, merged = cluster_vertices(positions, colors, triangles, 64)
+    # Each vertex of the grid is in its own cell
+    assert len(merged_positions) == 25
+    assert len(merged) == len(triangles)
+    np.testing.assert_allclose(merged_positions[merged], positions[triangles])
+    np.testing.assert_allclose(merged_colors[merged], colors[triangles])
+
+
+def test_vertices_are_averaged_in_cells():
+    positions, colors, triangles = grid(4)
+    merged_positions, merged_colors, merged = cluster_vertices(positions, colors, triangles, 2)
+    # The cells are 2 wide, and the vertices at 0 and 1 fall in the first cell, at 2, 3 and 4 in the second
+    cells = np.minimum(positions[:, :2] // 2, 1) @ [2, 1]
+    expected = np.array([positions[cells == cell].mean(axis=0) for cell in range(4)])
+    np.testing.assert_allclose(merged_positions[np.lexsort(merged_positions[:, 1::-1].T)], expected)
+    np.testing.assert_allclose(merged_colors[:, :2], merged_positions[:, :2] / 4)
+    # The remaining triangles keep their orientation, and are neither degenerate nor duplicated
+    assert 0 < len(merged) < len(triangles)
+    assert (normals(merged_positions, merged)[:, 2] > 0).all()
+    assert len({tuple(np.roll(t, -np.argmin(t))) for t in merged.tolist()}) == len(merged)
+
+
+def test_deviation_is_bounded_by_cells():
+    positions, colors, triangles = sphere()
+    for resolution in [4, 8, 16]:
+        merged_positions, _, merged = cluster_vertices(positions, colors, triangles, resolution)
+        assert len(merged) < len(triangles)
+        assert set(np.unique(merged)) == set(range(len(merged_positions)))
+        # Every merged vertex is an average of vertices in its cell, and every vertex has a merged vertex in its cell
+        diagonal = 2.0 / resolution * np.sqrt(3)
+        distances = np.linalg.norm(positions[:, None] - merged_positions[None], axis=2)
+        assert (distances.min(axis=0) <= diagonal).all()
+        assert (distances.min(axis=1) <= diagonal).all()
+
+
+def test_no_extent():
+    assert cluster_vertices(np.ones((3, 3)), np.ones((3, 4)), [[0, 1, 2]], 8) is None
+
+
+def test_lod_chain():
+    positions, colors, triangles = sphere()
+    chain = lod_chain(positions, colors, triangles, reduction=0.5)
+    assert 1 < len(chain) <= 4
+    counts = [len(triangles)] + [len(level[2]) for level in chain]
+    resolutions = [level[3] for level in chain]
+    assert all(count <= previous * 0.5 for previous, count in zip(counts, counts[1:]))
+    assert resolutions == sorted(resolutions, reverse=True)
+    for level_positions, level_colors, level_triangles, _ in chain:
+        assert len(level_positions) == len(level_colors)
+        assert level_triangles.max() < len(level_positions)
+
+
+def test_lod_chain_of_small_mesh_is_empty():
+    positions, colors, triangles = grid(2)
+    assert lod_chain(positions, colors, triangles) == []
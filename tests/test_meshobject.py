@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pytest
+from compas.colors import Color
+from compas.datastructures import Mesh
+from compas.geometry import Box
+from compas.geometry import Sphere
+
+from compas_viewer.scene.buffermanager import BufferManager
+
+# The buffers of the cases below, as read by MeshObject before its extraction was vectorized,
+# with the positions and colors of the corners of the points, lines and triangles in the order they are drawn
+REFERENCE = os.path.join(os.path.dirname(__file__), "data", "meshobject.npz")
+
+DATA_TYPES = ["points", "lines", "frontfaces"]
+
+
+def meshes() -> dict[str, Mesh]:
+    box = Mesh.from_shape(Box(1.0))
+    sphere = Mesh.from_shape(Sphere(1.0), u=8, v=6)
+    grid = Mesh.from_meshgrid(2.0, 4)
+    grid.delete_vertex(6)
+    triangles = Mesh.from_meshgrid(2.0, 3)
+    triangles.quads_to_triangles()
+    return {"box": box, "sphere": sphere, "grid": grid, "triangles": triangles}
+
+
+def colors(mesh: Mesh, name: str) -> dict:
+    if name == "face":
+        return {"facecolor": {face: Color(i % 3 / 2, i % 5 / 4, i % 7 / 6) for i, face in enumerate(mesh.faces())}}
+    if name == "vertex":
+        return {"use_vertexcolors": True, "vertexcolor": {vertex: Color(i % 5 / 4, i % 3 / 2, i % 7 / 6) for i, vertex in enumerate(mesh.vertices())}}
+    return {}
+
+
+CASES = [f"{mesh}-{color}-{hide}" for mesh in meshes() for color in ["default", "face", "vertex"] for hide in ["all", "hide_coplanaredges"]]
+
+
+def add(viewer, case: str, **kwargs):
+    name, color, hide = case.split("-")
+    mesh = meshes()[name]
+    return viewer.scene.add(mesh, hide_coplanaredges=hide == "hide_coplanaredges", **colors(mesh, color), **kwargs)
+
+
+def expand(obj) -> dict[str, np.ndarray]:
+    """The positions and colors of the buffers of an object, repeated for each corner of its elements."""
+    obj._vertices_data = obj._read_vertices_data()
+    data = {}
+    for name in DATA_TYPES:
+        positions, colors, elements = getattr(obj, f"_read_{name}_data")()
+        positions, colors = BufferManager._vertex_arrays(obj, name, positions, colors)
+        elements = np.asarray(elements, dtype=np.int64).reshape(-1)
+        data[f"{name}-positions"] = positions.reshape(-1, 3)[elements]
+        data[f"{name}-colors"] = colors.reshape(-1, 4)[elements]
+    return data
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+@pytest.mark.parametrize("case", CASES)
+def test_buffers_match_reference(viewer, case, indexed):
+    obj = add(viewer, case, indexed=indexed)
+    try:
+        data = expand(obj)
+    finally:
+        viewer.scene.remove(obj)
+    with np.load(REFERENCE) as reference:
+        for key, value in data.items():
+            np.testing.assert_array_equal(value, reference[f"{case}-{key}"], err_msg=f"{case} {key}")
@@ -0,0 +1,134 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from compas_viewer.renderer.camera import Camera
+from compas_viewer.scene.octree import OctreePointcloud
+from compas_viewer.scene.octree import build_octree
+
+NODESIZE = 400
+
+
+@pytest.fixture(scope="module")
+def points() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    positions = rng.normal(size=(10_000, 3)) * [10, 5, 1] + [100, 200, 0]
+    colors = rng.integers(0, 256, (10_000, 3))
+    return np.hstack([positions, colors])
+
+
+@pytest.fixture(scope="module")
+def octree(points, tmp_path_factory) -> OctreePointcloud:
+    directory = tmp_path_factory.mktemp("octree")
+    np.save(directory / "points.npy", points)
+    return build_octree(directory / "points.npy", directory / "octree", nodesize=NODESIZE, chunksize=3000)
+
+
+def load_all(octree: OctreePointcloud) -> tuple[np.ndarray, np.ndarray]:
+    nodes = [octree.load(node) for node in range(len(octree.names))]
+    return np.vstack([positions for positions, _ in nodes]), np.vstack([colors for _, colors in nodes])
+
+
+def test_every_point_is_in_one_node(octree, points):
+    assert octree.count == len(points)
+    assert octree.counts.sum() == len(points)
+    assert octree.has_colors
+    positions, colors = load_all(octree)
+    # The positions are stored in single precision relative to the offset of the octree
+    expected = ((points[:, :3] - octree.offset).astype(np.float32) + octree.offset).astype(np.float32)
+    order = np.lexsort(expected[:, ::-1].T)
+    loaded = np.lexsort(positions[:, ::-1].T)
+    np.testing.assert_array_equal(positions[loaded], expected[order])
+    np.testing.assert_allclose(colors[loaded, :3], points[order, 3:] / 255, atol=1e-6)
+    np.testing.assert_allclose(colors[:, 3], 1.0)
+
+
+def test_nodes(octree):
+    assert octree.names[0] == "r"
+    assert (octree.counts <= NODESIZE).all()
+    assert len(octree.names) > 1 + 8
+    for node, name in enumerate(octree.names):
+        positions, _ = octree.load(node)
+        lower, upper = octree.boxes[node]
+        assert (positions >= lower - 1e-4).all() and (positions <= upper + 1e-4).all()
+        if len(name) > 1:
+            parent = octree.names.index(name[:-1])
+            assert octree.children[parent, int(name[-1])] == node
+            np.testing.assert_allclose(upper - lower, (octree.boxes[parent, 1] - octree.boxes[parent, 0]) / 2)
+
+
+def test_subsample_is_spread_out(octree):
+    # The nodes that are not leaves keep one point per occupied cell of their grid, up to the node size
+    for node in np.flatnonzero((octree.children >= 0).any(axis=1)):
+        positions, _ = octree.load(node)
+        cells = np.floor((positions - octree.boxes[node, 0]) / octree.spacing[node]).astype(np.int64)
+        assert len(np.unique(cells, axis=0)) == len(positions)
+
+
+def test_reopen(octree):
+    reopened = OctreePointcloud(octree.path)
+    assert reopened.names == octree.names
+    np.testing.assert_array_equal(reopened.children, octree.children)
+    np.testing.assert_array_equal(reopened.boxes, octree.boxes)
+
+
+def test_text_and_empty_sources(tmp_path):
+    np.savetxt(tmp_path / "points.xyz", [[0, 0, 0, 0.5, 1, 0], [1, 2, 3, 0, 0, 1]])
+    octree = build_octree(tmp_path / "points.xyz", tmp_path / "small")
+    assert octree.names == ["r"]
+    positions, colors = octree.load(0)
+    np.testing.assert_allclose(positions, [[0, 0, 0], [1, 2, 3]], atol=1e-6)
+    np.testing.assert_allclose(colors, [[128 / 255, 1, 0, 1], [0, 0, 1, 1]])
+
+    np.save(tmp_path / "empty.npy", np.zeros((0, 3)))
+    with pytest.raises(ValueError):
+        build_octree(tmp_path / "empty.npy", tmp_path / "empty")
+
+
+@pytest.fixture
+def renderer(octree):
+    camera = Camera(SimpleNamespace(view="perspective"))
+    camera.target = octree.boxes[0].mean(axis=0).tolist()
+    camera.position = (octree.boxes[0].mean(axis=0) + [0, -60, 30]).tolist()
+    return SimpleNamespace(camera=camera, view="perspective", width=lambda: 800, height=lambda: 600)
+
+
+def test_select_within_point_budget(viewer, octree, renderer):
+    obj = viewer.scene.add(octree, pointbudget=octree.count)
+    try:
+        obj.pointsize = 0.01
+        # Without a limit on the spacing of the points on screen, all nodes in view are selected
+        selected = obj.select(renderer)
+        assert selected[0] == 0
+        assert len(selected) == len(octree.names)
+
+        for budget in [octree.counts[0], 2000, 5000]:
+            obj.pointbudget = budget
+            selected = obj.select(renderer)
+            assert 0 < octree.counts[selected].sum() <= budget
+            # The nodes are refined from the root down
+            assert all(octree.names[node][:-1] in [octree.names[other] for other in selected] for node in selected[1:])
+
+        obj.pointbudget = octree.counts[0] - 1
+        assert obj.select(renderer) == []
+
+        # Points far enough apart on screen are not refined
+        obj.pointbudget = octree.count
+        obj.pointsize = 1e6
+        assert obj.select(renderer) == [0]
+    finally:
+        viewer.scene.remove(obj)
+
+
+def test_select_skips_nodes_out_of_view(viewer, octree, renderer):
+    obj = viewer.scene.add(octree, pointbudget=octree.count)
+    try:
+        obj.pointsize = 0.01
+        # Look at one end of the cloud from close by
+        renderer.camera.target = (octree.boxes[0, 0] + [0, 5, 0]).tolist()
+        renderer.camera.position = (octree.boxes[0, 0] + [0, -5, 0]).tolist()
+        selected = obj.select(renderer)
+        assert 0 < len(selected) < len(octree.names)
+    finally:
+        viewer.scene.remove(obj)
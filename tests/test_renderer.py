@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+import pytest
+
+from compas_viewer.renderer import Renderer
+
+WIDTH = 800
+HEIGHT = 600
+
+
+def selection_area(box, ratio=1.0):
+    # The area only depends on the size of the pick buffer and the pixel ratio of the renderer
+    renderer = SimpleNamespace(
+        devicePixelRatio=lambda: ratio,
+        pick_buffer=SimpleNamespace(width=int(WIDTH * ratio), height=int(HEIGHT * ratio)),
+        PIXEL_SELECTION_INCREMENTAL=Renderer.PIXEL_SELECTION_INCREMENTAL,
+    )
+    return Renderer._selection_area(renderer, box)
+
+
+def test_selection_area_inside_view():
+    # The y axis of the screen points down, and the one of the pick buffer up
+    assert selection_area((10, 20, 110, 70)) == (10, HEIGHT - 70, 100, 50)
+    assert selection_area((110, 70, 10, 20)) == (10, HEIGHT - 70, 100, 50)
+    assert selection_area((10, 20, 110, 70), ratio=2) == (20, 2 * HEIGHT - 140, 200, 100)
+
+
+def test_selection_area_of_click():
+    size = Renderer.PIXEL_SELECTION_INCREMENTAL
+    assert selection_area((50, 60, 50, 60)) == (50, HEIGHT - 60, size, size)
+
+
+@pytest.mark.parametrize(
+    "box, area",
+    [
+        # Past the left edge, only the pixels from 0 to 50 are read
+        ((-100, 10, 50, 60), (0, HEIGHT - 60, 50, 50)),
+        # Past the bottom edge
+        ((10, 550, 60, 700), (10, 0, 50, 50)),
+        # Past the right and top edges
+        ((700, -50, 900, 50), (700, HEIGHT - 50, 100, 50)),
+        # Around the whole view
+        ((-10, -10, WIDTH + 10, HEIGHT + 10), (0, 0, WIDTH, HEIGHT)),
+        # Completely outside of the view
+        ((-100, 10, -50, 60), (0, HEIGHT - 60, 0, 50)),
+        ((WIDTH + 10, HEIGHT + 10, WIDTH + 50, HEIGHT + 50), (WIDTH, 0, 0, 0)),
+    ],
+)
+def test_selection_area_past_edges(box, area):
+    assert selection_area(box) == area
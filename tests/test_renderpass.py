@@ -0,0 +1,79 @@
+import pytest
+
+from compas_viewer.renderer.renderpass import RenderPass
+from compas_viewer.renderer.renderpass import RenderState
+from compas_viewer.renderer.renderpass import default_passes
+
+DEFAULT_ORDER = ["grid", "faces", "occlusion", "points", "pointclouds", "lines", "transparent", "tags", "selectionbox"]
+
+
+class RecordingPass(RenderPass):
+    name = "recording"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+
+    def draw(self, renderer, is_instance=False):
+        self.calls.append(is_instance)
+
+
+@pytest.fixture
+def renderer(viewer):
+    renderer = viewer.renderer
+    passes, renderstate = renderer.passes, renderer.renderstate
+    renderer.passes = default_passes()
+    # The state is already the default one, so that applying it needs no OpenGL calls
+    renderer.renderstate = RenderState()
+    renderer.renderstate.current = dict(renderer.renderstate.defaults)
+    yield renderer
+    renderer.passes, renderer.renderstate = passes, renderstate
+
+
+def names(renderer) -> list[str]:
+    return [renderpass.name for renderpass in renderer.passes]
+
+
+def test_default_order(renderer):
+    assert names(renderer) == DEFAULT_ORDER
+    # Every renderer gets its own passes
+    assert not set(map(id, default_passes())) & set(map(id, renderer.passes))
+
+
+def test_nothing_to_draw_in_empty_scene(renderer):
+    for renderpass in renderer.passes:
+        assert not renderpass.has_work(renderer), renderpass.name
+        assert not renderpass.execute(renderer), renderpass.name
+
+
+def test_add_and_remove_passes(renderer):
+    renderer.add_pass(RecordingPass("first"), before="grid")
+    renderer.add_pass(RecordingPass("prepass"), before="faces")
+    renderer.add_pass(RecordingPass("outline"), after="lines")
+    renderer.add_pass(RecordingPass("overlay"))
+    assert names(renderer) == ["first", "grid", "prepass", "faces", "occlusion", "points", "pointclouds", "lines", "outline", "transparent", "tags", "selectionbox", "overlay"]
+    assert renderer.get_pass("prepass") is renderer.passes[2]
+
+    with pytest.raises(ValueError):
+        renderer.add_pass(RecordingPass(), before="missing")
+
+    renderer.remove_pass("prepass")
+    renderer.remove_pass("occlusion")
+    renderer.remove_pass("missing")
+    assert renderer.get_pass("prepass") is None
+    assert names(renderer) == ["first", "grid", "faces", "points", "pointclouds", "lines", "outline", "transparent", "tags", "selectionbox", "overlay"]
+
+
+def test_execute(renderer):
+    renderpass = RecordingPass()
+    assert renderpass.execute(renderer)
+    assert renderpass.execute(renderer, is_instance=True)
+    assert renderpass.calls == [False, True]
+
+    # Disabled passes and passes that are not part of the instance map are skipped
+    renderpass.instance = False
+    assert not renderpass.execute(renderer, is_instance=True)
+    renderpass.enabled = False
+    assert not renderpass.execute(renderer)
+    assert renderpass.calls == [False, True]
+    assert renderpass.time == 0.0
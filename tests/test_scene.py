@@ -0,0 +1,67 @@
+import numpy as np
+from compas.geometry import Box
+from compas.geometry import Point
+
+from compas_viewer.scene import InstanceIdAllocator
+
+
+def test_allocate_starts_after_background():
+    instances = InstanceIdAllocator()
+    assert [instances.allocate(name) for name in "abc"] == [1, 2, 3]
+    assert len(instances) == 3
+    assert instances[0] is None
+    assert instances[2] == "b"
+
+
+def test_free_and_reuse():
+    instances = InstanceIdAllocator()
+    for name in "abcd":
+        instances.allocate(name)
+    instances.free(2)
+    instances.free(3)
+    assert len(instances) == 2
+    assert instances[2] is None
+    # The most recently freed ID is reused first, and new IDs follow the highest one
+    assert instances.allocate("e") == 3
+    assert instances.allocate("f") == 2
+    assert instances.allocate("g") == 5
+    assert list(instances) == ["a", "f", "e", "d", "g"]
+
+
+def test_free_twice_or_out_of_range():
+    instances = InstanceIdAllocator()
+    instances.allocate("a")
+    instances.free(1)
+    instances.free(1)
+    instances.free(0)
+    instances.free(10)
+    assert len(instances) == 0
+    assert instances.allocate("b") == 1
+    assert instances.allocate("c") == 2
+
+
+def test_lookup():
+    instances = InstanceIdAllocator()
+    for name in "abc":
+        instances.allocate(name)
+    instances.free(2)
+    ids = np.array([[0, 3, 3], [1, 2, 99], [-1, 1, 0]])
+    assert instances.lookup(ids) == ["a", "c"]
+    assert instances.lookup([]) == []
+
+
+def test_scene_objects_get_ids(viewer):
+    box = viewer.scene.add(Box(1.0))
+    point = viewer.scene.add(Point(0, 0, 0))
+    box.init()
+    point.init()
+    try:
+        assert box.instance_id != point.instance_id
+        assert viewer.scene.instances[box.instance_id] is box
+        assert viewer.scene.instances[point.instance_id] is point
+    finally:
+        instance_id = box.instance_id
+        viewer.scene.remove(box)
+        viewer.scene.remove(point)
+    assert box.instance_id is None
+    assert viewer.scene.instances[instance_id] is None